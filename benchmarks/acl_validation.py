@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+import random
+import sys
+import time
+
+from pyincus.models.acls import NetworkACL
+
+
+def generateRules(count: int) -> list[dict]:
+    rules = []
+    for i in range(count):
+        rules.append(
+            {
+                "action": random.choice(NetworkACL.possibleActions),
+                "state": "enabled",
+                "description": f"rule {i}",
+                "source": f"10.{i % 256}.0.0/16,@internal",
+                "destination": f"192.168.{i % 256}.{i % 200 + 1}",
+                "protocol": "tcp",
+                "destination_port": f"{1 + i % 1000},8000-8100",
+                "icmp_type": None,
+            }
+        )
+    return rules
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rules = generateRules(count)
+
+    start = time.perf_counter()
+    NetworkACL.validateGress(gress=rules)
+    print(f"validateGress: {count} rules in {time.perf_counter() - start:.4f}s")
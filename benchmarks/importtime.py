@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import os
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import pyincus",
+    "from pyincus import Remote",
+    "from pyincus import Instance",
+    "from pyincus import Project",
+]
+
+
+def importTime(statement: str) -> tuple[int, set[str]]:
+    # Bytecode must be written so later runs measure imports, not compilation.
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    r = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    total = 0
+    modules = set()
+    for line in r.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+
+        modules.add(name.strip())
+
+        # Lazily loaded models show up as their own top-level entries, after
+        # the package itself, so every top-level pyincus entry is counted.
+        if name.startswith(" pyincus"):
+            total += int(cumulative)
+
+    return total, modules
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    exitCode = 0
+
+    importTime("import pyincus")
+
+    for statement in STATEMENTS:
+        timings = [importTime(statement)[0] / 1000 for _ in range(runs)]
+        median = statistics.median(timings)
+        print(
+            f"{statement:<32} median {median:7.2f}ms  min {min(timings):7.2f}ms  max {max(timings):7.2f}ms"
+        )
+
+        if statement == "import pyincus" and budget is not None and median > budget:
+            print(f"  over budget: {median:.2f}ms > {budget:.2f}ms")
+            exitCode = 1
+
+    _, modules = importTime("import pyincus")
+    heavy = sorted(
+        [
+            m
+            for m in ("yaml", "subprocess", "concurrent.futures", "typing")
+            if m in modules
+        ]
+    )
+    print(f"heavy modules loaded by 'import pyincus': {heavy or 'none'}")
+
+    sys.exit(exitCode)
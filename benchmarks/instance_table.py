@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import copy
+import gc
+import sys
+import time
+import tracemalloc
+
+from pyincus.models.instances import Instance
+from pyincus.table import InstanceTable
+
+
+class FakeProject:
+    name = "default"
+
+
+def generateRecords(count: int) -> list[dict]:
+    records = []
+    for i in range(count):
+        records.append(
+            {
+                "name": f"instance-{i}",
+                "status": "Running" if i % 3 else "Stopped",
+                "status_code": 103 if i % 3 else 102,
+                "type": "container" if i % 5 else "virtual-machine",
+                "location": f"node-{i % 8}",
+                "architecture": "x86_64",
+                "created_at": f"2024-01-{1 + i % 28:02d}T00:00:00.000000000Z",
+                "profiles": ["default"],
+                "config": {f"user.key-{k}": f"value-{i}-{k}" for k in range(10)},
+                "devices": {"eth0": {"type": "nic", "network": "br0"}},
+                "expanded_config": {f"limits.{k}": "1" for k in range(10)},
+                "expanded_devices": {
+                    "eth0": {"type": "nic", "network": "br0"},
+                    "root": {"type": "disk", "path": "/", "pool": "default"},
+                },
+                "state": {
+                    "status": "Running",
+                    "network": {
+                        "eth0": {
+                            "addresses": [
+                                {
+                                    "family": "inet",
+                                    "address": f"10.{i // 65536}.{i // 256 % 256}.{i % 256}",
+                                    "scope": "global",
+                                }
+                            ]
+                        }
+                    },
+                },
+            }
+        )
+    return records
+
+
+def measure(build) -> tuple[object, float, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, size / 1024 / 1024
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    project = FakeProject()
+
+    instances, elapsed, size = measure(
+        lambda: [
+            Instance(project=project, **r)
+            for r in copy.deepcopy(generateRecords(count))
+        ]
+    )
+    print(f"list[Instance]  {count} rows: {size:8.2f}MB retained, {elapsed:.3f}s")
+    del instances
+
+    table, elapsed, size = measure(
+        lambda: InstanceTable.fromRecords(project, generateRecords(count))
+    )
+    print(f"InstanceTable   {count} rows: {size:8.2f}MB retained, {elapsed:.3f}s")
+
+    start = time.perf_counter()
+    running = table.where(status="Running", type="container").sortBy("location", "name")
+    print(
+        f"where + sortBy -> {len(running)} rows in {time.perf_counter() - start:.3f}s"
+    )
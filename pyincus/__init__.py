@@ -1,18 +1,65 @@
 #!/usr/bin/env python3
-from pyincus.incus import Incus
-from pyincus.models.acls import NetworkACL
-from pyincus.models.forwards import NetworkForward
-from pyincus.models.instances import Instance
-from pyincus.models.networks import Network
-from pyincus.models.projects import Project
-from pyincus.models.remotes import Remote
+from __future__ import annotations
+
+import importlib
+
+# Not imported from typing, which alone costs more than the rest of this module.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pyincus.incus import Incus
+    from pyincus.models.acls import NetworkACL
+    from pyincus.models.forwards import NetworkForward
+    from pyincus.models.images import Image
+    from pyincus.models.instances import Instance
+    from pyincus.models.networks import Network
+    from pyincus.models.operations import Operation
+    from pyincus.models.profiles import Profile
+    from pyincus.models.projects import Project
+    from pyincus.models.remotes import Remote
+    from pyincus.models.storage import StoragePool, StorageVolume
+
+# Public names and the module defining them, imported on first access only so
+# that `import pyincus` stays cheap for short-lived processes.
+_LAZY = {
+    "Image": "pyincus.models.images",
+    "Incus": "pyincus.incus",
+    "Instance": "pyincus.models.instances",
+    "Network": "pyincus.models.networks",
+    "NetworkACL": "pyincus.models.acls",
+    "NetworkForward": "pyincus.models.forwards",
+    "Operation": "pyincus.models.operations",
+    "Profile": "pyincus.models.profiles",
+    "Project": "pyincus.models.projects",
+    "Remote": "pyincus.models.remotes",
+    "StoragePool": "pyincus.models.storage",
+    "StorageVolume": "pyincus.models.storage",
+}
 
 __all__ = [
+    "Image",
     "Incus",
     "Instance",
     "Network",
     "NetworkACL",
     "NetworkForward",
+    "Operation",
+    "Profile",
     "Project",
     "Remote",
+    "StoragePool",
+    "StorageVolume",
 ]
+
+
+def __getattr__(name: str) -> object:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
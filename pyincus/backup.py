@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from pyincus.batch import BatchResult
+from pyincus.exceptions import InstanceException
+from pyincus.profiler import carry
+from pyincus.utils import validateObjectFormat
+
+if TYPE_CHECKING:
+    from pyincus.models.projects import Project
+
+COMPRESSIONS = {"none": ".tar", "gzip": ".tar.gz", "zstd": ".tar.zst"}
+
+
+class Throttle:
+    def __init__(self, bytesPerSecond: float) -> None:
+        if bytesPerSecond <= 0:
+            raise InstanceException("A throttle needs a positive rate.")
+
+        self.bytesPerSecond = bytesPerSecond
+        self.__lock = threading.Lock()
+        self.__next = time.monotonic()
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (bytesPerSecond={self.bytesPerSecond})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def consume(self, size: int) -> None:
+        # Each chunk books the next free slot of the shared rate, so many
+        # streams together never go faster than the cap.
+        with self.__lock:
+            now = time.monotonic()
+            self.__next = max(self.__next, now)
+            wait = self.__next - now
+            self.__next += size / self.bytesPerSecond
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+def validateCompression(compression: str) -> None:
+    if compression not in COMPRESSIONS:
+        raise InstanceException(
+            f'Unknown compression "{compression}", expected one of {", ".join(COMPRESSIONS)}.'
+        )
+
+
+def exportMany(
+    project: Project,
+    names: list[str],
+    directory: str,
+    *,
+    compression: str = "zstd",
+    optimizedStorage: bool = False,
+    instanceOnly: bool = False,
+    maxWorkers: int = 4,
+    bytesPerSecond: float | None = None,
+) -> BatchResult:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pyincus.models.instances import Instance
+
+    names = list(names)
+    validateObjectFormat(*names)
+    validateCompression(compression)
+
+    if len(set(names)) != len(names):
+        raise InstanceException("Instance names of a batch must be unique.")
+
+    os.makedirs(directory, exist_ok=True)
+    throttle = Throttle(bytesPerSecond) if bytesPerSecond else None
+
+    start = time.perf_counter()
+    results: dict[str, str] = {}
+    errors: dict[str, BaseException] = {}
+    durations: dict[str, float] = {}
+
+    def export(name: str) -> None:
+        began = time.perf_counter()
+        path = os.path.join(directory, f"{name}{COMPRESSIONS[compression]}")
+        try:
+            Instance(project=project, name=name).export(
+                path,
+                compression=compression,
+                optimizedStorage=optimizedStorage,
+                instanceOnly=instanceOnly,
+                throttle=throttle,
+            )
+            results[name] = path
+        except Exception as error:
+            errors[name] = error
+        finally:
+            durations[name] = time.perf_counter() - began
+
+    workers = max(1, min(maxWorkers, len(names) or 1))
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="pyincus-export"
+    ) as executor:
+        list(executor.map(carry(export), names))
+
+    return BatchResult(
+        names=names,
+        results=results,
+        errors=errors,
+        durations=durations,
+        concurrency=workers,
+        elapsed=time.perf_counter() - start,
+    )
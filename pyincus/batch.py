@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from pyincus.exceptions import IncusException, InstanceException
+from pyincus.profiler import carry
+from pyincus.utils import loadYaml, validateObjectFormat
+
+if TYPE_CHECKING:
+    from pyincus.models.instances import Instance
+    from pyincus.models.projects import Project
+    from pyincus.models.storage import StorageVolume
+
+# Parallel launches per storage driver. Copy-on-write drivers clone the cached
+# image almost for free, "dir" unpacks it in full for every instance and is
+# quickly bound by the disk.
+CONCURRENCY = {
+    "zfs": 16,
+    "btrfs": 12,
+    "ceph": 8,
+    "lvm": 6,
+    "lvmcluster": 6,
+    "cephfs": 4,
+    "dir": 2,
+}
+DEFAULT_CONCURRENCY = 4
+
+_slotsLock = threading.Lock()
+_countersLock = threading.Lock()
+
+
+class BatchResult:
+    def __init__(
+        self,
+        names: list[str],
+        results: dict[str, Any],
+        errors: dict[str, BaseException],
+        durations: dict[str, float],
+        *,
+        concurrency: int,
+        setup: float = 0.0,
+        elapsed: float = 0.0,
+    ) -> None:
+        self.names = names
+        self.results = results
+        self.errors = errors
+        self.durations = durations
+        self.concurrency = concurrency
+        self.setup = setup
+        self.elapsed = elapsed
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (ok={len(self.results)}, errors={len(self.errors)}, elapsed={self.elapsed:.2f}s)"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def instances(self) -> list[Instance]:
+        return [self.results[n] for n in self.names if n in self.results]
+
+    def raiseErrors(self) -> None:
+        for name in self.names:
+            if name in self.errors:
+                raise self.errors[name]
+
+
+def storagePool(
+    project: Project,
+    *,
+    storage: str | None = None,
+    profile: str | None = None,
+    noProfile: bool = False,
+) -> str | None:
+    from pyincus.models.profiles import Profile
+
+    if storage is not None or noProfile:
+        return storage
+
+    # The pool an instance lands in is the one of its root disk.
+    try:
+        devices = Profile.get(project=project, name=profile or "default").devices
+    except IncusException:
+        return None
+
+    return rootPool(devices)
+
+
+def rootPool(devices: dict[str, dict]) -> str | None:
+    for device in devices.values():
+        if device.get("type") == "disk" and device.get("path") == "/":
+            return device.get("pool")
+
+    return None
+
+
+def poolDriver(project: Project, pool: str | None) -> str | None:
+    client = project.remote.client
+
+    if pool is None:
+        return None
+
+    result = client.shared(
+        ("storage", project.remote.name, "show", pool),
+        client.run,
+        cmd=f"{client.binaryPath} storage show '{project.remote.name}':'{pool}'",
+    )
+    if result["error"]:
+        return None
+
+    return (loadYaml(result["data"]) or {}).get("driver")
+
+
+def storageDriver(
+    project: Project,
+    *,
+    storage: str | None = None,
+    profile: str | None = None,
+    noProfile: bool = False,
+) -> str | None:
+    return poolDriver(
+        project=project,
+        pool=storagePool(
+            project=project, storage=storage, profile=profile, noProfile=noProfile
+        ),
+    )
+
+
+def concurrencyFor(driver: str | None) -> int:
+    return CONCURRENCY.get(driver or "", DEFAULT_CONCURRENCY)
+
+
+def poolSlots(
+    project: Project, pool: str | None
+) -> tuple[threading.BoundedSemaphore, int]:
+    client = project.remote.client
+
+    # Shared by every batch of the client, so two batches landing in the same
+    # pool don't add up to twice what it can take.
+    with _slotsLock:
+        slots = client.cache.setdefault("poolSlots", {})
+        key = (project.remote.name, pool)
+
+        if key not in slots:
+            limit = concurrencyFor(poolDriver(project=project, pool=pool))
+            slots[key] = (threading.BoundedSemaphore(limit), limit)
+
+        return slots[key]
+
+
+def cloneSnapshotName(template: Instance) -> str:
+    client = template.project.remote.client
+    taken = {s.get("name") for s in template.attributes.get("snapshots") or []}
+
+    # Counted per client rather than random, so a recorded batch replays with
+    # the same commands.
+    with _countersLock:
+        counters = client.cache.setdefault("cloneSnapshots", {})
+        key = (template.project.remote.name, template.project.name, template.name)
+
+        while True:
+            counters[key] = counters.get(key, 0) + 1
+            name = f"clone-{template.name}-{counters[key]}"
+            if name not in taken:
+                return name
+
+
+def launchMany(
+    project: Project,
+    image: str,
+    names: list[str],
+    *,
+    projectSource: Project | None = None,
+    config: dict | None = None,
+    device: dict[str, dict] | None = None,
+    profile: str | None = None,
+    network: str | None = None,
+    storage: str | None = None,
+    noProfile: bool = False,
+    vm: bool = False,
+    maxWorkers: int | None = None,
+    prewarm: bool = True,
+) -> BatchResult:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pyincus.models.images import Image
+    from pyincus.models.instances import Instance
+
+    names = list(names)
+    validateObjectFormat(*names)
+    Instance.validateImageName(image)
+
+    if len(set(names)) != len(names):
+        raise InstanceException("Instance names of a batch must be unique.")
+
+    start = time.perf_counter()
+
+    cached = None
+    if prewarm:
+        # Copied to the target once, then every launch uses the local copy by
+        # fingerprint: no race to download it and no alias lookup per launch.
+        cached = Image.ensureCached(
+            project=project, image=image, projectSource=projectSource
+        )
+    setup = time.perf_counter() - start
+
+    pool = storagePool(
+        project=project, storage=storage, profile=profile, noProfile=noProfile
+    )
+    slots, limit = poolSlots(project=project, pool=pool)
+    maxWorkers = max(1, min(maxWorkers or limit, len(names) or 1))
+
+    results: dict[str, Instance] = {}
+    errors: dict[str, BaseException] = {}
+    durations: dict[str, float] = {}
+
+    def launch(name: str) -> None:
+        with slots:
+            began = time.perf_counter()
+            try:
+                results[name] = Instance.launch(
+                    project=project,
+                    image=image if cached is None else cached.fingerprint,
+                    name=name,
+                    # The cached copy lives in the target, keep its remote in the
+                    # image reference or the CLI looks it up on the default one.
+                    projectSource=projectSource if cached is None else project,
+                    config=config,
+                    device=device,
+                    profile=profile,
+                    network=network,
+                    storage=storage,
+                    noProfile=noProfile,
+                    vm=vm,
+                )
+            except Exception as error:
+                errors[name] = error
+            finally:
+                durations[name] = time.perf_counter() - began
+
+    with ThreadPoolExecutor(
+        max_workers=maxWorkers, thread_name_prefix="pyincus-launch"
+    ) as executor:
+        list(executor.map(carry(launch), names))
+
+    if cached is not None and results:
+        cached.recordUse(count=len(results))
+
+    return BatchResult(
+        names=names,
+        results=results,
+        errors=errors,
+        durations=durations,
+        concurrency=min(maxWorkers, limit),
+        setup=setup,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def cloneMany(
+    project: Project,
+    source: str,
+    names: list[str],
+    *,
+    snapshotName: str | None = None,
+    projectTarget: Project | None = None,
+    config: dict | None = None,
+    device: dict[str, dict] | None = None,
+    profile: str | None = None,
+    storage: str | None = None,
+    refresh: bool = False,
+    maxWorkers: int | None = None,
+) -> BatchResult:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pyincus.models.instances import Instance
+
+    names = list(names)
+    validateObjectFormat(source, snapshotName, *names)
+
+    if len(set(names)) != len(names):
+        raise InstanceException("Instance names of a batch must be unique.")
+
+    if projectTarget is None:
+        projectTarget = project
+
+    start = time.perf_counter()
+    template = Instance.get(project=project, name=source)
+
+    # Clones land in the pool of the template unless told otherwise.
+    pool = storage or rootPool(template.attributes.get("expanded_devices") or {})
+    slots, limit = poolSlots(project=projectTarget, pool=pool)
+
+    # The CLI only refreshes from an instance, clones then copy the template
+    # itself instead of a snapshot of it.
+    if refresh and snapshotName is not None:
+        raise InstanceException("A refresh can only copy from an instance.")
+
+    # Every clone is made from the same point in time, and copy-on-write pools
+    # clone a snapshot without copying any data.
+    temporary = snapshotName is None and not refresh
+    if temporary:
+        snapshotName = cloneSnapshotName(template)
+        template.snapshot(name=snapshotName)
+    setup = time.perf_counter() - start
+
+    results: dict[str, Instance] = {}
+    errors: dict[str, BaseException] = {}
+    durations: dict[str, float] = {}
+
+    def clone(name: str) -> None:
+        with slots:
+            began = time.perf_counter()
+            try:
+                results[name] = Instance.copy(
+                    project=project,
+                    source=source,
+                    name=name,
+                    snapshotName=snapshotName,
+                    projectTarget=projectTarget,
+                    config=config,
+                    device=device,
+                    profile=profile,
+                    storage=storage,
+                    refresh=refresh,
+                )
+            except Exception as error:
+                errors[name] = error
+            finally:
+                durations[name] = time.perf_counter() - began
+
+    workers = max(1, min(maxWorkers or limit, len(names) or 1))
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="pyincus-clone"
+        ) as executor:
+            list(executor.map(carry(clone), names))
+    finally:
+        if temporary:
+            template.deleteSnapshot(name=snapshotName)
+
+    return BatchResult(
+        names=names,
+        results=results,
+        errors=errors,
+        durations=durations,
+        concurrency=min(workers, limit),
+        setup=setup,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def attachMany(
+    volume: StorageVolume,
+    instances: list[str],
+    *,
+    path: str | None = None,
+    device: str | None = None,
+    maxWorkers: int = 8,
+) -> BatchResult:
+    from concurrent.futures import ThreadPoolExecutor
+
+    instances = list(instances)
+    validateObjectFormat(*instances)
+
+    if len(set(instances)) != len(instances):
+        raise InstanceException("Instance names of a batch must be unique.")
+
+    start = time.perf_counter()
+    results: dict[str, str] = {}
+    errors: dict[str, BaseException] = {}
+    durations: dict[str, float] = {}
+
+    def attach(name: str) -> None:
+        began = time.perf_counter()
+        try:
+            volume.attach(name, path=path, device=device)
+            results[name] = device or volume.name
+        except Exception as error:
+            errors[name] = error
+        finally:
+            durations[name] = time.perf_counter() - began
+
+    # Each attach edits its own instance, the server doesn't serialize them.
+    workers = max(1, min(maxWorkers, len(instances) or 1))
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="pyincus-attach"
+    ) as executor:
+        list(executor.map(carry(attach), instances))
+
+    return BatchResult(
+        names=instances,
+        results=results,
+        errors=errors,
+        durations=durations,
+        concurrency=workers,
+        elapsed=time.perf_counter() - start,
+    )
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, BinaryIO, Callable
+
+from pyincus.exceptions import IncusException, IncusVersionException
+from pyincus.profiler import phase
+from pyincus.singleflight import SingleFlight, shared
+from pyincus.utils import REGEX_EMPTY_BODY
+
+
+def _pump(reader: BinaryIO, writer: BinaryIO, throttle: Any, chunkSize: int) -> None:
+    while chunk := reader.read(chunkSize):
+        if throttle is not None:
+            throttle.consume(len(chunk))
+        writer.write(chunk)
+
+
+def toResult(returncode: int, stdout: str, stderr: str) -> dict:
+    if returncode != 0:
+        return {"data": stderr.strip(), "error": True}
+
+    return {"data": stdout.strip(), "error": False}
+
+
+class SubprocessTransport:
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def execute(self, cmd: str, **kwargs) -> tuple[int, str, str]:
+        import subprocess
+
+        input = kwargs.pop("input", None)
+        timeout = kwargs.pop("timeout", None)
+
+        # Same as subprocess.run, in two steps the profiler can tell apart.
+        with phase("spawn"):
+            process = subprocess.Popen(
+                cmd,
+                shell=True,
+                stdin=subprocess.PIPE if input is not None else None,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                **kwargs,
+            )
+
+        with process, phase("server"):
+            try:
+                stdout, stderr = process.communicate(input, timeout=timeout)
+            except BaseException:
+                process.kill()
+                raise
+
+        return process.returncode, stdout, stderr
+
+    def run(self, cmd: str, **kwargs) -> dict:
+        returncode, stdout, stderr = self.execute(cmd, **kwargs)
+
+        return toResult(returncode, stdout, stderr)
+
+
+class IncusClient:
+    def __init__(
+        self,
+        binaryPath: str = "/usr/bin/incus",
+        *,
+        cwd: str | None = None,
+        configDir: str | None = None,
+        env: dict[str, str] | None = None,
+        transport: Any = None,
+        retries: int = 0,
+        retryDelay: float = 0.5,
+    ) -> None:
+        self.binaryPath = binaryPath
+        self.cwd = cwd
+        self.configDir = configDir
+        self.env = env
+        self.transport = SubprocessTransport() if transport is None else transport
+        self.retries = retries
+        self.retryDelay = retryDelay
+        self.flights = SingleFlight()
+        self.cache: dict[Any, Any] = {}
+        self.__lock = threading.Lock()
+        self.__metrics: dict[str, dict[str, float]] = {}
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (binaryPath={self.binaryPath}, configDir={self.configDir})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _environment(self) -> dict[str, str] | None:
+        if self.configDir is None and self.env is None:
+            return None
+
+        env = dict(os.environ)
+        env.update(self.env or {})
+        if self.configDir is not None:
+            env["INCUS_CONF"] = self.configDir
+
+        return env
+
+    def _command(self, cmd: str) -> str:
+        # The subcommand, without remotes, names or flags, e.g. "network acl show".
+        if cmd.startswith(self.binaryPath):
+            cmd = cmd[len(self.binaryPath) :]
+
+        words = [
+            w
+            for w in cmd.split()
+            if not w.startswith("-") and "'" not in w and ":" not in w
+        ]
+
+        return " ".join(words[:3]) or "?"
+
+    def _record(self, cmd: str, duration: float, error: bool) -> None:
+        command = self._command(cmd)
+
+        with self.__lock:
+            metrics = self.__metrics.setdefault(
+                command, {"calls": 0, "errors": 0, "retries": 0, "seconds": 0.0}
+            )
+            metrics["calls"] += 1
+            metrics["errors"] += int(error)
+            metrics["seconds"] += duration
+
+    def run(self, cmd: str, **kwargs) -> dict:
+        if self.cwd and "cwd" not in kwargs:
+            kwargs["cwd"] = self.cwd
+
+        if "env" not in kwargs and (env := self._environment()) is not None:
+            kwargs["env"] = env
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            result = self.transport.run(cmd, **kwargs)
+            self._record(cmd, time.perf_counter() - start, result["error"])
+
+            if (
+                not result["error"]
+                or attempt >= self.retries
+                or not REGEX_EMPTY_BODY.search(result["data"])
+            ):
+                return result
+
+            attempt += 1
+            with self.__lock:
+                self.__metrics[self._command(cmd)]["retries"] += 1
+            time.sleep(self.retryDelay * attempt)
+
+    def stream(
+        self,
+        cmd: str,
+        *,
+        source: BinaryIO | None = None,
+        sink: BinaryIO | None = None,
+        throttle: Any = None,
+        chunkSize: int = 1 << 20,
+    ) -> dict:
+        import subprocess
+
+        # Tarballs and volumes go through a pipe one chunk at a time instead of
+        # being captured in memory like the output of run().
+        kwargs: dict[str, Any] = {}
+        if self.cwd:
+            kwargs["cwd"] = self.cwd
+        if (env := self._environment()) is not None:
+            kwargs["env"] = env
+
+        start = time.perf_counter()
+        with phase("spawn"):
+            process = subprocess.Popen(
+                cmd,
+                shell=True,
+                stdin=subprocess.PIPE if source is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE if sink is not None else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                **kwargs,
+            )
+
+        stderr: list[bytes] = []
+        reader = threading.Thread(
+            target=lambda: stderr.append(process.stderr.read()), daemon=True
+        )
+        reader.start()
+
+        with phase("server"):
+            try:
+                if sink is not None:
+                    _pump(process.stdout, sink, throttle, chunkSize)
+                if source is not None:
+                    try:
+                        _pump(source, process.stdin, throttle, chunkSize)
+                    finally:
+                        process.stdin.close()
+            except BaseException:
+                process.kill()
+                raise
+            finally:
+                returncode = process.wait()
+                reader.join()
+
+        error = returncode != 0
+        self._record(cmd, time.perf_counter() - start, error)
+
+        return {
+            "data": b"".join(stderr).decode(errors="replace").strip(),
+            "error": error,
+        }
+
+    def query(
+        self,
+        path: str,
+        *,
+        remote: str = "local",
+        method: str = "GET",
+        data: dict | None = None,
+        **kwargs,
+    ) -> dict:
+        import json
+        import shlex
+
+        cmd = f"{self.binaryPath} query -X {method} '{remote}:{path}'"
+        if data is not None:
+            cmd += f" --data {shlex.quote(json.dumps(data))}"
+
+        result = self.run(cmd=cmd, **kwargs)
+
+        # The raw API answers in JSON, much cheaper to parse than the YAML listings.
+        if not result["error"] and result["data"]:
+            with phase("parse"):
+                result["data"] = json.loads(result["data"])
+
+        return result
+
+    def shared(
+        self, key: tuple, fn: Callable[..., dict], *, fresh: bool = False, **kwargs
+    ) -> dict:
+        return shared(key, fn, group=self.flights, fresh=fresh, **kwargs)
+
+    def check(self) -> None:
+        from pyincus.incus import INCUS_VERSION
+
+        result = self.run(cmd=f"{self.binaryPath} --version")
+        if result["error"]:
+            raise IncusException(f"Unexpected error: {result['data']}")
+        if INCUS_VERSION != result["data"]:
+            raise IncusVersionException(
+                libVersion=INCUS_VERSION, clientVersion=result["data"]
+            )
+
+    def metrics(self) -> dict[str, dict[str, float]]:
+        with self.__lock:
+            return {command: dict(m) for command, m in self.__metrics.items()}
+
+    def resetMetrics(self) -> None:
+        with self.__lock:
+            self.__metrics = {}
+
+    @staticmethod
+    def default() -> IncusClient:
+        from pyincus.incus import Incus
+
+        return Incus.client
+
+
+class DefaultClient(IncusClient):
+    # Backs the process-wide `Incus` API: binaryPath and cwd stay settable on the
+    # `Incus` class, as they always were, and are read at every call.
+    def __init__(self, **kwargs) -> None:
+        from pyincus.incus import Incus
+        from pyincus.singleflight import flights
+
+        super().__init__(binaryPath=Incus.binaryPath, cwd=Incus.cwd, **kwargs)
+        self.flights = flights
+
+    @property
+    def binaryPath(self) -> str:
+        from pyincus.incus import Incus
+
+        return Incus.binaryPath
+
+    @binaryPath.setter
+    def binaryPath(self, value: str) -> None:
+        from pyincus.incus import Incus
+
+        Incus.binaryPath = value
+
+    @property
+    def cwd(self) -> str | None:
+        from pyincus.incus import Incus
+
+        return Incus.cwd
+
+    @cwd.setter
+    def cwd(self, value: str | None) -> None:
+        from pyincus.incus import Incus
+
+        Incus.cwd = value
@@ -65,6 +65,13 @@ class DeviceNotFoundException(ObjectNotFoundException):
         )
 
 
+class MissingDependencyException(IncusException):
+    def __init__(self, package: str, extra: str):
+        super().__init__(
+            msg=f'Package "{package}" is required for this feature. Install it with "pip install pyincus[{extra}]".'
+        )
+
+
 #####################
 # Remote Exceptions #
 #####################
@@ -94,6 +101,11 @@ class RemoteLocalCannotBeModifiedException(RemoteException):
         super().__init__(msg='Remote "local" is static and cannot be modified.')
 
 
+class RemoteTimeoutException(RemoteException):
+    def __init__(self, name: str, timeout: float):
+        super().__init__(msg=f'Remote "{name}" did not answer within {timeout}s.')
+
+
 ######################
 # Project Exceptions #
 ######################
@@ -182,6 +194,115 @@ class InstanceExecFailedException(InstanceException):
         super().__init__(msg="Instance exec failed.")
 
 
+####################
+# Image Exceptions #
+####################
+
+
+class ImageException(IncusException):
+    def __init__(self, msg: str):
+        super().__init__(msg=msg)
+
+
+class ImageNotFoundException(ImageException, ObjectNotFoundException):
+    def __init__(self, name: str | None = None):
+        super().__init__(
+            msg=f"Image {f'{chr(34)}{name}{chr(34)} ' if name else ''}not found."
+        )
+
+
+class ImageAliasAlreadyExistsException(ImageException, ObjectAlreadyExistsException):
+    def __init__(self, name: str | None = None):
+        super().__init__(
+            msg=f"Image alias {f'{chr(34)}{name}{chr(34)} ' if name else ''}already exists."
+        )
+
+
+######################
+# Profile Exceptions #
+######################
+
+
+class ProfileException(IncusException):
+    def __init__(self, msg: str):
+        super().__init__(msg=msg)
+
+
+class ProfileNotFoundException(ProfileException, ObjectNotFoundException):
+    def __init__(self, name: str | None = None):
+        super().__init__(
+            msg=f"Profile {f'{chr(34)}{name}{chr(34)} ' if name else ''}not found."
+        )
+
+
+class ProfileAlreadyExistsException(ProfileException, ObjectAlreadyExistsException):
+    def __init__(self, name: str | None = None):
+        super().__init__(
+            msg=f"Profile {f'{chr(34)}{name}{chr(34)} ' if name else ''}already exists."
+        )
+
+
+class ProfileInUseException(ProfileException):
+    def __init__(self, name: str | None = None):
+        super().__init__(
+            msg=f"Profile {f'{chr(34)}{name}{chr(34)} ' if name else ''}is in use."
+        )
+
+
+######################
+# Storage Exceptions #
+######################
+
+
+class StorageException(IncusException):
+    def __init__(self, msg: str):
+        super().__init__(msg=msg)
+
+
+class StoragePoolNotFoundException(StorageException, ObjectNotFoundException):
+    def __init__(self, name: str | None = None):
+        super().__init__(
+            msg=f"Storage pool {f'{chr(34)}{name}{chr(34)} ' if name else ''}not found."
+        )
+
+
+class StoragePoolAlreadyExistsException(StorageException, ObjectAlreadyExistsException):
+    def __init__(self, name: str | None = None):
+        super().__init__(
+            msg=f"Storage pool {f'{chr(34)}{name}{chr(34)} ' if name else ''}already exists."
+        )
+
+
+class StoragePoolInUseException(StorageException):
+    def __init__(self, name: str | None = None):
+        super().__init__(
+            msg=f"Storage pool {f'{chr(34)}{name}{chr(34)} ' if name else ''}is in use."
+        )
+
+
+class StorageVolumeNotFoundException(StorageException, ObjectNotFoundException):
+    def __init__(self, name: str | None = None):
+        super().__init__(
+            msg=f"Storage volume {f'{chr(34)}{name}{chr(34)} ' if name else ''}not found."
+        )
+
+
+class StorageVolumeAlreadyExistsException(
+    StorageException, ObjectAlreadyExistsException
+):
+    def __init__(self, name: str | None = None):
+        super().__init__(
+            msg=f"Storage volume {f'{chr(34)}{name}{chr(34)} ' if name else ''}already exists."
+        )
+
+
+class StorageVolumeInUseException(StorageException):
+    def __init__(self, name: str | None = None):
+        super().__init__(
+            msg=f"Storage volume {f'{chr(34)}{name}{chr(34)} ' if name else ''}is in use."
+        )
+
+
 ######################
 # Network Exceptions #
 ######################
@@ -295,6 +416,36 @@ class InvalidACLRuleKeyException(NetworkACLException):
         )
 
 
+class InvalidACLRuleSubjectException(NetworkACLException):
+    def __init__(self, subject=None):
+        super().__init__(
+            msg=f"Subject {f'{chr(34)}{subject}{chr(34)} ' if subject else ''}must be a CIDR, an IP range, an ACL name, an address set or one of @internal and @external."
+        )
+
+
+class InvalidACLRulePortException(NetworkACLException):
+    def __init__(self, ports=None):
+        super().__init__(
+            msg=f"Port {f'{chr(34)}{ports}{chr(34)} ' if ports else ''}must be a comma separated list of ports or port ranges between 0 and 65535, used with protocol tcp or udp."
+        )
+
+
+class InvalidACLRuleICMPException(NetworkACLException):
+    def __init__(self, key, value=None):
+        super().__init__(
+            msg=f"{key} {f'{chr(34)}{value}{chr(34)} ' if value is not None else ''}must be a number between 0 and 255, used with protocol icmp4 or icmp6."
+        )
+
+
+class InvalidACLRulesException(NetworkACLException):
+    def __init__(self, errors: list[tuple[int, NetworkACLException]]):
+        self.errors = errors
+        super().__init__(
+            msg=f"{len(errors)} invalid rule(s): "
+            + "; ".join([f"[{index}] {error}" for index, error in errors])
+        )
+
+
 class MissingProtocolException(NetworkACLException):
     def __init__(self):
         super().__init__(
@@ -373,3 +524,58 @@ class InvalidTargetPortsException(NetworkForwardException):
         super().__init__(
             msg=f'Target ports "{targetPorts}" must either be empty or the same amount of listen ports "{listenPorts}".'
         )
+
+
+########################
+# Operation Exceptions #
+########################
+
+
+class OperationException(IncusException):
+    def __init__(self, msg: str):
+        super().__init__(msg=msg)
+
+
+class OperationNotFoundException(OperationException, ObjectNotFoundException):
+    def __init__(self, id: str | None = None):
+        super().__init__(
+            msg=f"Operation {f'{chr(34)}{id}{chr(34)} ' if id else ''}not found."
+        )
+
+
+class OperationFailedException(OperationException):
+    def __init__(self, id: str | None, err: str):
+        super().__init__(
+            msg=f"Operation {f'{chr(34)}{id}{chr(34)} ' if id else ''}failed: {err}"
+        )
+        self.err = err
+
+
+class OperationCancelledException(OperationException):
+    def __init__(self, id: str | None = None):
+        super().__init__(
+            msg=f"Operation {f'{chr(34)}{id}{chr(34)} ' if id else ''}was cancelled."
+        )
+
+
+class OperationTimeoutException(OperationException):
+    def __init__(self, id: str | None, timeout: float):
+        super().__init__(
+            msg=f"Operation {f'{chr(34)}{id}{chr(34)} ' if id else ''}did not finish within {timeout}s."
+        )
+
+
+#####################
+# Replay Exceptions #
+#####################
+
+
+class ReplayException(IncusException):
+    def __init__(self, msg: str):
+        super().__init__(msg=msg)
+
+
+class ReplayMissException(ReplayException):
+    def __init__(self, cmd: str):
+        super().__init__(msg=f"No recorded response for command: {cmd}")
+        self.cmd = cmd
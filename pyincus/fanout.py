@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+from pyincus.exceptions import RemoteTimeoutException
+from pyincus.models.instances import Instance
+from pyincus.models.remotes import Remote
+from pyincus.profiler import carry
+from pyincus.utils import validateObjectFormat
+
+
+class FanOutResult:
+    def __init__(
+        self,
+        results: dict[str, Any],
+        errors: dict[str, BaseException],
+        durations: dict[str, float],
+    ) -> None:
+        self.results = results
+        self.errors = errors
+        self.durations = durations
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (results={sorted(self.results)}, errors={sorted(self.errors)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def merged(self) -> list:
+        merged = []
+
+        for name in sorted(self.results):
+            value = self.results[name]
+            if isinstance(value, dict):
+                for v in value.values():
+                    merged.extend(v if isinstance(v, list) else [v])
+            elif isinstance(value, list):
+                merged.extend(value)
+            elif value is not None:
+                merged.append(value)
+
+        return merged
+
+    @property
+    def total(self) -> int | float:
+        return sum([v for v in self.results.values() if isinstance(v, (int, float))])
+
+
+def defaultRemotes() -> list[Remote]:
+    return [
+        r for r in Remote.list() if r.attributes.get("protocol", "incus") == "incus"
+    ]
+
+
+def fanOut(
+    fn: Callable[[Remote], Any],
+    remotes: list[Remote] | None = None,
+    *,
+    timeout: float | None = None,
+    maxWorkers: int | None = None,
+) -> FanOutResult:
+    if remotes is None:
+        remotes = defaultRemotes()
+
+    results = {}
+    errors = {}
+    durations = {}
+    started: dict[str, float] = {}
+
+    if not remotes:
+        return FanOutResult(results=results, errors=errors, durations=durations)
+
+    def call(remote: Remote) -> Any:
+        started[remote.name] = time.monotonic()
+        return fn(remote)
+
+    executor = ThreadPoolExecutor(max_workers=maxWorkers or len(remotes))
+    pending: dict[Future, Remote] = {
+        executor.submit(carry(call), r): r for r in remotes
+    }
+
+    try:
+        while pending:
+            # The timeout is per remote and starts once its call actually runs,
+            # so remotes queued behind a small pool are not penalized.
+            deadlines = [
+                started[r.name] + timeout
+                for r in pending.values()
+                if timeout is not None and r.name in started
+            ]
+            done, _ = wait(
+                pending,
+                timeout=max(0, min(deadlines) - time.monotonic())
+                if deadlines
+                else (0.05 if timeout is not None else None),
+                return_when=FIRST_COMPLETED,
+            )
+
+            for future in done:
+                remote = pending.pop(future)
+                durations[remote.name] = time.monotonic() - started[remote.name]
+                try:
+                    results[remote.name] = future.result()
+                except Exception as error:
+                    errors[remote.name] = error
+
+            if timeout is None:
+                continue
+
+            now = time.monotonic()
+            for future, remote in list(pending.items()):
+                if remote.name in started and now - started[remote.name] >= timeout:
+                    del pending[future]
+                    future.cancel()
+                    durations[remote.name] = now - started[remote.name]
+                    errors[remote.name] = RemoteTimeoutException(remote.name, timeout)
+    finally:
+        # Never block on a hung remote; its worker finishes on its own.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return FanOutResult(results=results, errors=errors, durations=durations)
+
+
+def listInstances(
+    remotes: list[Remote] | None = None,
+    *,
+    filter: str = "",
+    timeout: float | None = None,
+    maxWorkers: int | None = None,
+) -> FanOutResult:
+    validateObjectFormat(filter)
+
+    return fanOut(
+        lambda remote: Instance.listAllProjects(
+            remote=remote,
+            filter=filter,
+            **({"timeout": timeout} if timeout is not None else {}),
+        ),
+        remotes,
+        timeout=timeout,
+        maxWorkers=maxWorkers,
+    )
+
+
+def findInstance(
+    name: str,
+    remotes: list[Remote] | None = None,
+    *,
+    timeout: float | None = None,
+    maxWorkers: int | None = None,
+) -> FanOutResult:
+    validateObjectFormat(name)
+
+    return fanOut(
+        lambda remote: Instance.listAllProjects(
+            remote=remote,
+            filter=f"^{name}$",
+            skipValidation=True,
+            **({"timeout": timeout} if timeout is not None else {}),
+        ),
+        remotes,
+        timeout=timeout,
+        maxWorkers=maxWorkers,
+    )
+
+
+def countInstances(
+    remotes: list[Remote] | None = None,
+    *,
+    status: str | None = None,
+    timeout: float | None = None,
+    maxWorkers: int | None = None,
+) -> FanOutResult:
+    def count(remote: Remote) -> int:
+        grouped = Instance.listAllProjects(
+            remote=remote, **({"timeout": timeout} if timeout is not None else {})
+        )
+
+        return sum(
+            [
+                1
+                for instances in grouped.values()
+                for i in instances
+                if status is None
+                or i.attributes.get("status", "").lower() == status.lower()
+            ]
+        )
+
+    return fanOut(count, remotes, timeout=timeout, maxWorkers=maxWorkers)
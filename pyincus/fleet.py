@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import sys
+import time
+from array import array
+from typing import TYPE_CHECKING, Any, Iterable
+
+from pyincus.exceptions import IncusException, MissingDependencyException
+from pyincus.table import fetchRecords
+
+if TYPE_CHECKING:
+    import numpy
+    import pyarrow
+
+    from pyincus.models.instances import Instance
+    from pyincus.models.projects import Project
+
+METRICS = (
+    "cpuUsage",
+    "memoryUsage",
+    "memoryPeak",
+    "swapUsage",
+    "diskUsage",
+    "processes",
+    "bytesReceived",
+    "bytesSent",
+    "packetsReceived",
+    "packetsSent",
+)
+
+# Metrics that only ever grow while an instance runs, and so have a rate.
+COUNTERS = ("cpuUsage", "bytesReceived", "bytesSent", "packetsReceived", "packetsSent")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise MissingDependencyException(package="numpy", extra="numpy")
+
+    return numpy
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise MissingDependencyException(package="pyarrow", extra="arrow")
+
+    return pyarrow
+
+
+def _view(np, values: array) -> numpy.ndarray:
+    return np.frombuffer(
+        values, dtype=np.int64 if values.typecode == "q" else np.float64
+    )
+
+
+def _metrics(state: dict[str, Any]) -> tuple[int, ...]:
+    cpu = state.get("cpu") or {}
+    memory = state.get("memory") or {}
+    received = sent = packetsReceived = packetsSent = 0
+
+    for name, nic in (state.get("network") or {}).items():
+        if name == "lo":
+            continue
+
+        counters = nic.get("counters") or {}
+        received += counters.get("bytes_received") or 0
+        sent += counters.get("bytes_sent") or 0
+        packetsReceived += counters.get("packets_received") or 0
+        packetsSent += counters.get("packets_sent") or 0
+
+    return (
+        cpu.get("usage") or 0,
+        memory.get("usage") or 0,
+        memory.get("usage_peak") or 0,
+        memory.get("swap_usage") or 0,
+        sum([(d or {}).get("usage") or 0 for d in (state.get("disk") or {}).values()]),
+        state.get("processes") or 0,
+        received,
+        sent,
+        packetsReceived,
+        packetsSent,
+    )
+
+
+class FleetState:
+    __slots__ = ("names", "statuses", "timestamp", "_columns")
+
+    def __init__(
+        self,
+        names: list[str],
+        statuses: list[str],
+        columns: dict[str, array],
+        timestamp: float | None = None,
+    ) -> None:
+        self.names = names
+        self.statuses = statuses
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self._columns = columns
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (instances={len(self)}, metrics={len(self._columns)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def fromRecords(
+        cls, records: Iterable[dict[str, Any]], timestamp: float | None = None
+    ) -> FleetState:
+        names = []
+        statuses = []
+        # Plain int64 arrays, which NumPy wraps without copying.
+        columns = {metric: array("q") for metric in METRICS}
+        appends = [columns[metric].append for metric in METRICS]
+
+        for record in records:
+            names.append(sys.intern(record["name"]))
+            statuses.append(sys.intern(record.get("status") or ""))
+
+            for append, value in zip(appends, _metrics(record.get("state") or {})):
+                append(value)
+
+        return cls(names=names, statuses=statuses, columns=columns, timestamp=timestamp)
+
+    @classmethod
+    def fromInstances(
+        cls, instances: Iterable[Instance], timestamp: float | None = None
+    ) -> FleetState:
+        return cls.fromRecords(
+            [{"name": i.name, **i.attributes} for i in instances], timestamp=timestamp
+        )
+
+    @classmethod
+    def fetch(cls, project: Project, filter: str = "", **kwargs) -> FleetState:
+        timestamp = time.time()
+
+        return cls.fromRecords(
+            fetchRecords(project=project, filter=filter, **kwargs), timestamp=timestamp
+        )
+
+    @property
+    def metrics(self) -> list[str]:
+        return list(self._columns)
+
+    def column(self, metric: str) -> array:
+        if metric not in self._columns:
+            raise IncusException(
+                f'Unknown metric "{metric}", expected one of {", ".join(self._columns)}.'
+            )
+
+        return self._columns[metric]
+
+    def toNumpy(self) -> dict[str, numpy.ndarray]:
+        np = _numpy()
+
+        arrays = {
+            "name": np.array(self.names, dtype=object),
+            "status": np.array(self.statuses, dtype=object),
+        }
+        for metric, values in self._columns.items():
+            arrays[metric] = _view(np, values)
+
+        return arrays
+
+    def toArrow(self) -> pyarrow.Table:
+        pa = _pyarrow()
+
+        columns = {
+            "name": pa.array(self.names, type=pa.string()),
+            "status": pa.array(self.statuses, type=pa.string()).dictionary_encode(),
+        }
+        for metric, values in self._columns.items():
+            columns[metric] = pa.array(
+                values, type=pa.int64() if values.typecode == "q" else pa.float64()
+            )
+
+        return pa.table(columns)
+
+    def aggregate(self) -> dict[str, dict[str, float]]:
+        np = _numpy()
+
+        result = {}
+        for metric, column in self._columns.items():
+            values = _view(np, column)
+
+            if not len(values):
+                result[metric] = {"sum": 0, "mean": 0, "min": 0, "max": 0, "p95": 0}
+                continue
+
+            result[metric] = {
+                "sum": values.sum().item(),
+                "mean": values.mean().item(),
+                "min": values.min().item(),
+                "max": values.max().item(),
+                "p95": np.percentile(values, 95).item(),
+            }
+
+        return result
+
+    def top(self, metric: str, n: int = 10) -> list[tuple[str, float]]:
+        np = _numpy()
+
+        values = _view(np, self.column(metric))
+
+        # argpartition reads -n as n, and n == 0 as every value.
+        if n <= 0:
+            return []
+
+        if n >= len(values):
+            indexes = np.argsort(values)[::-1]
+        else:
+            # Select the n largest in linear time, then sort only those.
+            indexes = np.argpartition(values, -n)[-n:]
+            indexes = indexes[np.argsort(values[indexes])[::-1]]
+
+        return [(self.names[i], values[i].item()) for i in indexes]
+
+    def rates(self, previous: FleetState) -> FleetState:
+        np = _numpy()
+
+        elapsed = self.timestamp - previous.timestamp
+        if elapsed <= 0:
+            raise IncusException("Snapshots must be taken at increasing timestamps.")
+
+        # Only instances present in both snapshots have a rate.
+        before = {name: i for i, name in enumerate(previous.names)}
+        current = np.fromiter(
+            (i for i, name in enumerate(self.names) if name in before), dtype=np.intp
+        )
+        past = np.fromiter(
+            (before[self.names[i]] for i in current), dtype=np.intp, count=len(current)
+        )
+
+        columns = {}
+        for metric in COUNTERS:
+            if metric not in self._columns or metric not in previous._columns:
+                continue
+
+            a = _view(np, self._columns[metric])[current]
+            delta = a - _view(np, previous._columns[metric])[past]
+            # A counter going backwards means the instance restarted.
+            delta = np.where(delta < 0, a, delta)
+            columns[metric] = array("d", (delta / elapsed).astype(np.float64).tobytes())
+
+        return self.__class__(
+            names=[self.names[i] for i in current],
+            statuses=[self.statuses[i] for i in current],
+            columns=columns,
+            timestamp=self.timestamp,
+        )
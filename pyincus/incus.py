@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
-import subprocess
+from __future__ import annotations
 
-from pyincus.exceptions import IncusException, IncusVersionException
+from pyincus.client import DefaultClient, IncusClient
 
 INCUS_VERSION = "6.12"
 
@@ -9,27 +9,21 @@ INCUS_VERSION = "6.12"
 class Incus:
     cwd: str | None = None
     binaryPath: str = "/usr/bin/incus"
+    client: IncusClient
 
     @staticmethod
     def run(cmd: str, **kwargs) -> dict:
-        result = None
-        error = False
-        if Incus.cwd and "cwd" not in kwargs:
-            kwargs["cwd"] = Incus.cwd
-        r = subprocess.run(cmd, shell=True, capture_output=True, text=True, **kwargs)
-        if r.returncode != 0:
-            result = r.stderr.strip()
-            error = True
-        else:
-            result = r.stdout.strip()
-        return {"data": result, "error": error}
+        return Incus.client.run(cmd=cmd, **kwargs)
+
+    @staticmethod
+    def query(path: str, **kwargs) -> dict:
+        return Incus.client.query(path, **kwargs)
 
     @staticmethod
     def check() -> None:
-        result = Incus.run(cmd=f"{Incus.binaryPath} --version")
-        if result["error"]:
-            raise IncusException(f"Unexpected error: {result['error']}")
-        if INCUS_VERSION != result["data"]:
-            raise IncusVersionException(
-                libVersion=INCUS_VERSION, clientVersion=result["data"]
-            )
+        Incus.client.check()
+
+
+# The process-wide client behind the static API and every model that isn't bound
+# to a client of its own.
+Incus.client = DefaultClient()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from pyincus.utils import splitList
+
+if TYPE_CHECKING:
+    from pyincus.models.acls import NetworkACL
+    from pyincus.models.forwards import NetworkForward
+    from pyincus.models.instances import Instance
+    from pyincus.models.networks import Network
+    from pyincus.models.projects import Project
+
+
+def instanceReferences(
+    attributes: dict[str, Any],
+) -> tuple[set[str], set[str], set[str]]:
+    devices = attributes.get("expanded_devices") or attributes.get("devices") or {}
+    networks = set()
+    acls = set()
+    addresses = set()
+
+    for device in devices.values():
+        if device.get("type") != "nic":
+            continue
+
+        if device.get("network"):
+            networks.add(device["network"])
+
+        acls |= set(splitList(device.get("security.acls")))
+
+        for key in ("ipv4.address", "ipv6.address"):
+            if device.get(key):
+                addresses.add(device[key])
+
+    state = attributes.get("state") or {}
+    for name, nic in (state.get("network") or {}).items():
+        if name == "lo":
+            continue
+
+        for address in nic.get("addresses") or []:
+            if address.get("scope") == "global":
+                addresses.add(address["address"])
+
+    return networks, acls, addresses
+
+
+class Inventory:
+    __slots__ = (
+        "_project",
+        "_timestamp",
+        "_instances",
+        "_networks",
+        "_acls",
+        "_forwards",
+        "_byAddress",
+        "_byNetwork",
+    )
+
+    def __init__(
+        self,
+        project: Project,
+        *,
+        instances: list[Instance],
+        networks: list[Network],
+        acls: list[NetworkACL],
+        forwards: dict[str, list[NetworkForward]],
+        timestamp: float | None = None,
+    ) -> None:
+        byAddress: dict[str, Instance] = {}
+        byNetwork: dict[str, list[Instance]] = {}
+
+        for instance in instances:
+            networkNames, _, addresses = instanceReferences(instance.attributes)
+
+            for address in addresses:
+                byAddress[address] = instance
+
+            for network in networkNames:
+                byNetwork.setdefault(network, []).append(instance)
+
+        setAttribute = object.__setattr__
+        setAttribute(self, "_project", project)
+        setAttribute(
+            self, "_timestamp", time.time() if timestamp is None else timestamp
+        )
+        setAttribute(
+            self, "_instances", MappingProxyType({i.name: i for i in instances})
+        )
+        setAttribute(self, "_networks", MappingProxyType({n.name: n for n in networks}))
+        setAttribute(self, "_acls", MappingProxyType({a.name: a for a in acls}))
+        setAttribute(
+            self,
+            "_forwards",
+            MappingProxyType({k: tuple(v) for k, v in forwards.items()}),
+        )
+        setAttribute(self, "_byAddress", MappingProxyType(byAddress))
+        setAttribute(
+            self,
+            "_byNetwork",
+            MappingProxyType({k: tuple(v) for k, v in byNetwork.items()}),
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is read-only.")
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (project={self._project.name}, instances={len(self._instances)}, networks={len(self._networks)}, acls={len(self._acls)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @classmethod
+    def fetch(cls, project: Project, *, maxWorkers: int = 4) -> Inventory:
+        from concurrent.futures import ThreadPoolExecutor
+
+        from pyincus.models.acls import NetworkACL
+        from pyincus.models.forwards import NetworkForward
+        from pyincus.models.instances import Instance
+        from pyincus.models.networks import Network
+        from pyincus.profiler import carry
+
+        timestamp = time.time()
+        forwards: dict[str, list[NetworkForward]] = {}
+
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            instances = executor.submit(carry(Instance.list), project=project)
+            networks = executor.submit(carry(Network.list), project=project)
+            acls = executor.submit(carry(NetworkACL.list), project=project)
+
+            # Forward listings only need the networks, so they start as soon as
+            # the network listing is in, while instances and ACLs still load.
+            pending = {
+                executor.submit(
+                    carry(NetworkForward.list), network=network
+                ): network.name
+                for network in networks.result()
+            }
+
+            for future, name in pending.items():
+                forwards[name] = future.result()
+
+            return cls(
+                project=project,
+                instances=instances.result(),
+                networks=networks.result(),
+                acls=acls.result(),
+                forwards=forwards,
+                timestamp=timestamp,
+            )
+
+    @property
+    def project(self) -> Project:
+        return self._project
+
+    @property
+    def timestamp(self) -> float:
+        return self._timestamp
+
+    @property
+    def age(self) -> float:
+        return time.time() - self._timestamp
+
+    def isFresh(self, maxAge: float) -> bool:
+        return self.age <= maxAge
+
+    @property
+    def instances(self) -> MappingProxyType[str, Instance]:
+        return self._instances
+
+    @property
+    def networks(self) -> MappingProxyType[str, Network]:
+        return self._networks
+
+    @property
+    def acls(self) -> MappingProxyType[str, NetworkACL]:
+        return self._acls
+
+    @property
+    def forwards(self) -> MappingProxyType[str, tuple[NetworkForward, ...]]:
+        return self._forwards
+
+    def instance(self, name: str) -> Instance | None:
+        return self._instances.get(name)
+
+    def network(self, name: str) -> Network | None:
+        return self._networks.get(name)
+
+    def acl(self, name: str) -> NetworkACL | None:
+        return self._acls.get(name)
+
+    def instanceByAddress(self, address: str) -> Instance | None:
+        return self._byAddress.get(address)
+
+    def instancesOnNetwork(self, name: str) -> tuple[Instance, ...]:
+        return self._byNetwork.get(name, ())
+
+    def forwardsOf(self, network: str) -> tuple[NetworkForward, ...]:
+        return self._forwards.get(network, ())
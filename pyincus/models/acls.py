@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import functools
+import ipaddress
 from typing import TYPE_CHECKING, Any
 
-import yaml
-
 from pyincus.exceptions import (
     IncusException,
     InvalidACLGressException,
     InvalidACLRuleActionException,
+    InvalidACLRuleICMPException,
     InvalidACLRuleKeyException,
+    InvalidACLRulePortException,
     InvalidACLRuleProtocolException,
+    InvalidACLRulesException,
     InvalidACLRuleStateException,
+    InvalidACLRuleSubjectException,
     InvalidDescriptionException,
     MissingProtocolException,
     NetworkACLAlreadyExistsException,
@@ -19,14 +23,77 @@ from pyincus.exceptions import (
     NetworkACLInUseException,
     NetworkACLNotFoundException,
 )
-from pyincus.incus import Incus
+from pyincus.usage import UsageIndex
 from pyincus.utils import (
     REGEX_EMPTY_BODY,
+    REGEX_INCUS_OBJECT_NAME,
+    LazyPattern,
+    dumpYaml,
+    loadYaml,
     validateObjectFormat,
 )
 
 if TYPE_CHECKING:
+    from pyincus.client import IncusClient
     from pyincus.models.projects import Project
+    from pyincus.models.remotes import Remote
+
+SUBJECT_SELECTORS = frozenset(["@internal", "@external"])
+
+REGEX_IPV4_CIDR = LazyPattern(
+    r"^(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})(?:/(\d{1,2}))?$"
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _isValidSubject(subject: str) -> bool:
+    if subject.startswith("@"):
+        return subject in SUBJECT_SELECTORS
+
+    if subject.startswith("$"):
+        return bool(REGEX_INCUS_OBJECT_NAME.match(subject[1:]))
+
+    if match := REGEX_IPV4_CIDR.match(subject):
+        *octets, prefix = match.groups()
+        return all([int(o) <= 255 for o in octets]) and (
+            prefix is None or int(prefix) <= 32
+        )
+
+    try:
+        if "-" in subject and ("." in subject or ":" in subject):
+            start, end = [ipaddress.ip_address(ip) for ip in subject.split("-", 1)]
+            return start.version == end.version and start <= end
+
+        ipaddress.ip_network(subject, strict=False)
+        return True
+    except ValueError:
+        return bool(REGEX_INCUS_OBJECT_NAME.match(subject))
+
+
+@functools.lru_cache(maxsize=4096)
+def _isValidPortRange(port: str) -> bool:
+    start, _, end = port.partition("-")
+
+    if not start.isdigit() or (end and not end.isdigit()):
+        return False
+
+    if not end:
+        return int(start) <= 65535
+
+    return int(start) < int(end) <= 65535
+
+
+def _normalizeList(value: Any) -> str | None:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+
+    if not isinstance(value, str):
+        return None
+
+    if " " not in value:
+        return value
+
+    return ",".join([v.strip() for v in value.split(",")])
 
 
 class NetworkACL:
@@ -49,6 +116,11 @@ class NetworkACL:
         "icmp_code",
     ]
 
+    _actions: frozenset[str] = frozenset(possibleActions)
+    _states: frozenset[str] = frozenset(possibleStates)
+    _protocols: frozenset[str] = frozenset(possibleProtocols)
+    _ruleKeys: frozenset[str] = frozenset(possibleRuleKeys)
+
     def __init__(self, project: Project, name: str, **kwargs) -> None:
         self.project = project
         self.name = name
@@ -71,6 +143,10 @@ class NetworkACL:
     def attributes(self, value: dict[str, Any]) -> None:
         self.__attributes = value
 
+    @property
+    def client(self) -> IncusClient:
+        return self.project.remote.client
+
     @property
     def config(self) -> dict:
         return self.get(project=self.project, name=self.name).attributes["config"]
@@ -107,13 +183,17 @@ class NetworkACL:
     def _fetch(
         cls, project: Project, name: str, skipValidation=False, **kwargs
     ) -> NetworkACL | None:
+        client = project.remote.client
+
         if not skipValidation:
             validateObjectFormat(name)
 
-        result = Incus.run(
+        result = client.shared(
+            ("acl", project.remote.name, project.name, "show", name),
+            client.run,
             cmd=(
                 cmd
-                := f"{Incus.binaryPath} --project='{project.name}' network acl show '{project.remote.name}':'{name}'"
+                := f"{client.binaryPath} --project='{project.name}' network acl show '{project.remote.name}':'{name}'"
             ),
             **kwargs,
         )
@@ -127,7 +207,7 @@ class NetworkACL:
             else:
                 return result["data"]
         else:
-            if "project" in (obj := yaml.safe_load(result["data"])):
+            if "project" in (obj := loadYaml(result["data"])):
                 del obj["project"]
 
             return cls(
@@ -136,8 +216,8 @@ class NetworkACL:
             )
 
     @classmethod
-    def get(cls, project: Project, name: str) -> NetworkACL:
-        acl = cls._fetch(project=project, name=name)
+    def get(cls, project: Project, name: str, *, fresh: bool = False) -> NetworkACL:
+        acl = cls._fetch(project=project, name=name, fresh=fresh)
 
         if acl is None:
             raise NetworkACLNotFoundException()
@@ -152,13 +232,20 @@ class NetworkACL:
     def list(
         cls, project: Project, filter: str = "", skipValidation=False, **kwargs
     ) -> list[NetworkACL]:
+        client = project.remote.client
+
         if not skipValidation:
             validateObjectFormat(filter)
 
         objs = []
-        cmd = f"{Incus.binaryPath} --project='{project.name}' network acl list '{project.remote.name}': -fyaml"
+        cmd = f"{client.binaryPath} --project='{project.name}' network acl list '{project.remote.name}': -fyaml"
 
-        result = Incus.run(cmd=cmd, **kwargs)
+        result = client.shared(
+            ("acl", project.remote.name, project.name, "list", None),
+            client.run,
+            cmd=cmd,
+            **kwargs,
+        )
 
         if result["error"]:
             if REGEX_EMPTY_BODY.search(result["data"]):
@@ -172,7 +259,7 @@ class NetworkACL:
             else:
                 raise IncusException(result["data"])
 
-        results = yaml.safe_load(result["data"])
+        results = loadYaml(result["data"])
 
         # If it's a dictionary (e.g. for Remotes), change it to a list like the majority.
         # Example:
@@ -194,6 +281,47 @@ class NetworkACL:
 
         return objs
 
+    @classmethod
+    def listAllProjects(
+        cls, remote: Remote, filter: str = "", skipValidation=False, **kwargs
+    ) -> dict[str, list[NetworkACL]]:
+        from pyincus.models.projects import Project
+
+        client = remote.client
+
+        if not skipValidation:
+            validateObjectFormat(filter)
+
+        objs = {}
+        cmd = f"{client.binaryPath} network acl list '{remote.name}': --all-projects -fyaml"
+
+        result = client.shared(
+            ("acl", remote.name, None, "list", None), client.run, cmd=cmd, **kwargs
+        )
+
+        if result["error"]:
+            if REGEX_EMPTY_BODY.search(result["data"]):
+                print(f'Retrying listing "{cmd}"...')
+                return cls.listAllProjects(
+                    remote=remote,
+                    filter=filter,
+                    skipValidation=skipValidation,
+                    **kwargs,
+                )
+            else:
+                raise IncusException(result["data"])
+
+        for obj in loadYaml(result["data"]) or []:
+            if filter and filter not in obj.get("name", ""):
+                continue
+
+            project = Project.reference(
+                remote=remote, name=obj.pop("project", None) or "default"
+            )
+            objs.setdefault(project.name, []).append(cls(project=project, **obj))
+
+        return objs
+
     @classmethod
     def create(
         cls,
@@ -204,10 +332,12 @@ class NetworkACL:
         egress: list | None = None,
         ingress: list | None = None,
     ) -> NetworkACL:
+        client = project.remote.client
+
         validateObjectFormat(name)
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{project.name}' network acl create '{project.remote.name}':'{name}'"
+        result = client.run(
+            cmd=f"{client.binaryPath} --project='{project.name}' network acl create '{project.remote.name}':'{name}'"
         )
 
         if result["error"]:
@@ -218,6 +348,7 @@ class NetworkACL:
 
         acl = cls(project=project, name=name)
 
+        # save() also adds the new ACL to the usage indexes.
         try:
             acl.save(description=description, egress=egress, ingress=ingress)
         except NetworkACLException as error:
@@ -227,8 +358,8 @@ class NetworkACL:
         return acl
 
     def delete(self) -> None:
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' network acl delete '{self.project.remote.name}':'{self.name}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' network acl delete '{self.project.remote.name}':'{self.name}'"
         )
 
         if result["error"]:
@@ -239,14 +370,18 @@ class NetworkACL:
 
             raise NetworkACLException(result["data"])
 
+        UsageIndex.notifyDeleted(self)
+
     def refresh(self) -> None:
-        self.__attributes = self.get(project=self.project, name=self.name).attributes
+        self.__attributes = self.get(
+            project=self.project, name=self.name, fresh=True
+        ).attributes
 
     def rename(self, name: str) -> None:
         validateObjectFormat(name)
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' network acl rename '{self.project.remote.name}':'{self.name}' '{name}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' network acl rename '{self.project.remote.name}':'{self.name}' '{name}'"
         )
 
         if result["error"]:
@@ -255,7 +390,13 @@ class NetworkACL:
             if "Cannot rename an ACL that is in use" in result["data"]:
                 raise NetworkACLInUseException(name=name)
 
+            raise NetworkACLException(result["data"])
+
+        # Indexes key objects by name, move this one to its new name.
+        UsageIndex.notifyDeleted(self)
+        self.name = name
         self.attributes["name"] = name
+        UsageIndex.notifySaved(self)
 
     def save(
         self,
@@ -277,9 +418,9 @@ class NetworkACL:
         if ingress is not None:
             self.attributes["ingress"] = self.validateGress(gress=ingress)
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' network acl edit '{self.project.remote.name}':'{self.name}'",
-            input=yaml.safe_dump(self.attributes),
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' network acl edit '{self.project.remote.name}':'{self.name}'",
+            input=dumpYaml(self.attributes),
         )
 
         if result["error"]:
@@ -287,65 +428,122 @@ class NetworkACL:
                 raise NetworkACLException("Error: yaml: unmarshal errors:")
             raise NetworkACLException(result["data"])
 
-        self.attributes = self.get(project=self.project, name=self.name).attributes
+        self.attributes = self.get(
+            project=self.project, name=self.name, fresh=True
+        ).attributes
+
+        UsageIndex.notifySaved(self)
 
     @staticmethod
-    def validateGress(gress: list) -> list:
+    def checkGress(gress: list) -> tuple[list[dict], list[tuple[int, Exception]]]:
         if not isinstance(gress, list):
             raise InvalidACLGressException()
 
-        if gress:
-            for g in gress:
-                if not isinstance(g, dict):
-                    raise InvalidACLGressException()
+        rules = []
+        errors = []
 
-                if "action" not in g or not isinstance(g["action"], str):
-                    raise InvalidACLRuleActionException(
-                        allowed=NetworkACL.possibleActions
-                    )
+        for index, g in enumerate(gress):
+            if not isinstance(g, dict):
+                errors.append((index, InvalidACLGressException()))
+                continue
 
-                if g["action"] not in NetworkACL.possibleActions:
-                    raise InvalidACLRuleActionException(
-                        allowed=NetworkACL.possibleActions, action=g["action"]
-                    )
+            rule = {}
+            ruleErrors = []
 
-                if "state" not in g or not isinstance(g["state"], str):
-                    raise InvalidACLRuleStateException(
-                        allowed=NetworkACL.possibleStates
+            for k, v in g.items():
+                if v is None:
+                    continue
+
+                if not isinstance(k, str) or k not in NetworkACL._ruleKeys:
+                    ruleErrors.append(
+                        InvalidACLRuleKeyException(
+                            allowed=NetworkACL.possibleRuleKeys, key=k
+                        )
                     )
+                    continue
+
+                rule[k] = v
 
-                if g["state"] not in NetworkACL.possibleStates:
-                    raise InvalidACLRuleStateException(
-                        allowed=NetworkACL.possibleStates, state=g["state"]
+            action = rule.get("action")
+            if not isinstance(action, str) or action not in NetworkACL._actions:
+                ruleErrors.append(
+                    InvalidACLRuleActionException(
+                        allowed=NetworkACL.possibleActions,
+                        action=action if isinstance(action, str) else None,
                     )
+                )
 
-                if (
-                    "protocol" in g
-                    and g["protocol"] not in NetworkACL.possibleProtocols
-                ):
-                    raise InvalidACLRuleProtocolException(
-                        allowed=NetworkACL.possibleProtocols, protocol=g["protocol"]
+            state = rule.get("state")
+            if not isinstance(state, str) or state not in NetworkACL._states:
+                ruleErrors.append(
+                    InvalidACLRuleStateException(
+                        allowed=NetworkACL.possibleStates,
+                        state=state if isinstance(state, str) else None,
                     )
+                )
 
-                if (
-                    ("source_port" in g and g["source_port"])
-                    or ("destination_port" in g and g["destination_port"])
-                ) and ("protocol" not in g or g["protocol"] is None):
-                    raise MissingProtocolException()
+            protocol = rule.get("protocol")
+            if protocol is not None and (
+                not isinstance(protocol, str) or protocol not in NetworkACL._protocols
+            ):
+                ruleErrors.append(
+                    InvalidACLRuleProtocolException(
+                        allowed=NetworkACL.possibleProtocols,
+                        protocol=protocol if isinstance(protocol, str) else None,
+                    )
+                )
 
-                for k in g.keys():
-                    if g[k] is None:
-                        del g[k]
+            for k in ("source", "destination"):
+                if k in rule:
+                    value = _normalizeList(rule[k])
+                    if value is None:
+                        ruleErrors.append(InvalidACLRuleSubjectException(rule[k]))
                         continue
 
-                    if k not in NetworkACL.possibleRuleKeys:
-                        raise InvalidACLRuleKeyException(
-                            allowed=NetworkACL.possibleRuleKeys
-                        )
+                    for subject in value.split(",") if value else []:
+                        if not _isValidSubject(subject):
+                            ruleErrors.append(InvalidACLRuleSubjectException(subject))
+
+                    rule[k] = value
+
+            for k in ("source_port", "destination_port"):
+                if k in rule:
+                    value = _normalizeList(rule[k])
+                    if protocol is None:
+                        ruleErrors.append(MissingProtocolException())
+                    elif protocol not in ("tcp", "udp") or value is None:
+                        ruleErrors.append(InvalidACLRulePortException(rule[k]))
+                    else:
+                        for port in value.split(",") if value else []:
+                            if not _isValidPortRange(port):
+                                ruleErrors.append(InvalidACLRulePortException(port))
+
+                        rule[k] = value
+
+            for k in ("icmp_type", "icmp_code"):
+                if k in rule:
+                    value = str(rule[k]).strip()
+                    if (
+                        protocol not in ("icmp4", "icmp6")
+                        or not value.isdigit()
+                        or int(value) > 255
+                    ):
+                        ruleErrors.append(InvalidACLRuleICMPException(k, rule[k]))
+                    else:
+                        rule[k] = value
+
+            if ruleErrors:
+                errors.extend([(index, error) for error in ruleErrors])
+            else:
+                rules.append(rule)
 
-                    if not isinstance(k, str):
-                        raise InvalidACLRuleKeyException(
-                            allowed=NetworkACL.possibleRuleKeys, key=k
-                        )
+        return rules, errors
+
+    @staticmethod
+    def validateGress(gress: list) -> list:
+        rules, errors = NetworkACL.checkGress(gress)
+
+        if errors:
+            raise InvalidACLRulesException(errors=errors)
 
-        return gress
+        return rules
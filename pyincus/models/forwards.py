@@ -2,11 +2,8 @@
 from __future__ import annotations
 
 import ipaddress
-import re
 from typing import TYPE_CHECKING, Any
 
-import yaml
-
 from pyincus.exceptions import (
     DuplicatePortException,
     IncusException,
@@ -15,19 +12,28 @@ from pyincus.exceptions import (
     InvalidPortProtocolException,
     InvalidPortRangeException,
     InvalidTargetPortsException,
+    NetworkForwardAlreadyExistsException,
     NetworkForwardException,
     NetworkForwardNotFoundException,
     NetworkForwardPortAlreadyExistsException,
     NetworkForwardPortNotFoundException,
+    NetworkNotFoundException,
     StartLowerThanEndException,
 )
-from pyincus.incus import Incus
-from pyincus.utils import REGEX_EMPTY_BODY, validateObjectFormat
+from pyincus.usage import UsageIndex
+from pyincus.utils import (
+    REGEX_EMPTY_BODY,
+    LazyPattern,
+    dumpYaml,
+    loadYaml,
+    validateObjectFormat,
+)
 
 if TYPE_CHECKING:
+    from pyincus.client import IncusClient
     from pyincus.models.networks import Network
 
-REGEX_LIST_OF_PORTS = re.compile(
+REGEX_LIST_OF_PORTS = LazyPattern(
     r"^[1-9][0-9]{0,4}(([\-][1-9][0-9]{0,4})?([,][1-9][0-9]{0,4}|$))*$"
 )
 
@@ -54,6 +60,10 @@ class NetworkForward:
     def attributes(self, value: dict[str, Any]) -> None:
         self.__attributes = value
 
+    @property
+    def client(self) -> IncusClient:
+        return self.network.project.remote.client
+
     @property
     def listenAddress(self) -> str:
         return self.attributes["listen_address"]
@@ -84,25 +94,45 @@ class NetworkForward:
     def _fetch(
         cls, network: Network, name: str, skipValidation=False, **kwargs
     ) -> NetworkForward | None:
+        client = network.project.remote.client
+
         if not skipValidation:
             validateObjectFormat(name)
 
-        cmd = f"{Incus.binaryPath} --project='{network.project.name}' network forward show '{network.project.remote.name}':'{name}' '{kwargs['listenAddress']}'"
-        del kwargs["listenAddress"]
-        result = Incus.run(cmd=cmd, **kwargs)
+        cmd = f"{client.binaryPath} --project='{network.project.name}' network forward show '{network.project.remote.name}':'{name}' '{kwargs['listenAddress']}'"
+        listenAddress = kwargs.pop("listenAddress")
+        result = client.shared(
+            (
+                "forward",
+                network.project.remote.name,
+                network.project.name,
+                name,
+                listenAddress,
+            ),
+            client.run,
+            cmd=cmd,
+            **kwargs,
+        )
 
         if result["error"]:
             if REGEX_EMPTY_BODY.search(result["data"]):
                 print(f'Retrying fetching "{cmd}"...')
                 return cls._fetch(
-                    network=network, name=name, skipValidation=skipValidation, **kwargs
+                    network=network,
+                    name=name,
+                    skipValidation=skipValidation,
+                    listenAddress=listenAddress,
+                    **kwargs,
                 )
             else:
                 return result["data"]
         else:
+            obj = loadYaml(result["data"])
+
             return cls(
                 network=network,
-                **yaml.safe_load(result["data"]),
+                name=obj["listen_address"],
+                **obj,
             )
 
     @classmethod
@@ -118,7 +148,9 @@ class NetworkForward:
         )
 
     @classmethod
-    def get(cls, network: Network, listenAddress: str) -> NetworkForward:
+    def get(
+        cls, network: Network, listenAddress: str, *, fresh: bool = False
+    ) -> NetworkForward:
         if not isinstance(listenAddress, str):
             raise InvalidIPAddressException(listenAddress)
 
@@ -132,6 +164,7 @@ class NetworkForward:
             name=network.name,
             listenAddress=listenAddress,
             skipValidation=True,
+            fresh=fresh,
         )
 
         if forward is None:
@@ -143,15 +176,28 @@ class NetworkForward:
     def list(
         cls, network: Network, skipValidation=False, **kwargs
     ) -> list[NetworkForward]:
+        client = network.project.remote.client
+
         filter = network.name
 
         if not skipValidation:
             validateObjectFormat(filter)
 
         objs = []
-        cmd = f"{Incus.binaryPath} --project='{network.project.name}' network forward list '{network.project.remote.name}':'{filter}'  -fyaml"
-
-        result = Incus.run(cmd=cmd, **kwargs)
+        cmd = f"{client.binaryPath} --project='{network.project.name}' network forward list '{network.project.remote.name}':'{filter}'  -fyaml"
+
+        result = client.shared(
+            (
+                "forward",
+                network.project.remote.name,
+                network.project.name,
+                filter,
+                None,
+            ),
+            client.run,
+            cmd=cmd,
+            **kwargs,
+        )
 
         if result["error"]:
             if REGEX_EMPTY_BODY.search(result["data"]):
@@ -160,7 +206,7 @@ class NetworkForward:
             else:
                 raise IncusException(result["data"])
 
-        results = yaml.safe_load(result["data"])
+        results = loadYaml(result["data"])
 
         # If it's a dictionary (e.g. for Remotes), change it to a list like the majority.
         # Example:
@@ -176,10 +222,62 @@ class NetworkForward:
             results = tmp
 
         for obj in results:
-            objs.append(cls(network=network, **obj))
+            objs.append(cls(network=network, name=obj["listen_address"], **obj))
 
         return objs
 
+    @classmethod
+    def create(
+        cls, network: Network, listenAddress: str, *, description: str | None = None
+    ) -> NetworkForward:
+        client = network.project.remote.client
+
+        if not isinstance(listenAddress, str):
+            raise InvalidIPAddressException(listenAddress)
+
+        try:
+            ipaddress.ip_address(listenAddress)
+        except Exception:
+            raise InvalidIPAddressException(listenAddress)
+
+        result = client.run(
+            cmd=f"{client.binaryPath} --project='{network.project.name}' network forward create '{network.project.remote.name}':'{network.name}' '{listenAddress}'"
+        )
+
+        if result["error"]:
+            if "already exists" in result["data"]:
+                raise NetworkForwardAlreadyExistsException()
+            if "Network not found" in result["data"]:
+                raise NetworkNotFoundException(name=network.name)
+
+            raise NetworkForwardException(result["data"])
+
+        forward = cls.get(network=network, listenAddress=listenAddress, fresh=True)
+
+        if description is not None:
+            try:
+                forward.save(description=description)
+            except NetworkForwardException as error:
+                forward.delete()
+                raise error
+
+        UsageIndex.notifySaved(forward)
+
+        return forward
+
+    def delete(self) -> None:
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.network.project.name}' network forward delete '{self.network.project.remote.name}':'{self.network.name}' '{self.listenAddress}'"
+        )
+
+        if result["error"]:
+            if "not found" in result["data"]:
+                raise NetworkForwardNotFoundException(name=self.listenAddress)
+
+            raise NetworkForwardException(result["data"])
+
+        UsageIndex.notifyDeleted(self)
+
     @staticmethod
     def validatePortList(ports: str | int) -> list[int]:
         tmpPortRanges = []
@@ -255,8 +353,8 @@ class NetworkForward:
                     listenPorts=listenPorts, targetPorts=targetPorts
                 )
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.network.project.name}' network forward port add '{self.network.project.remote.name}':'{self.network.name}' '{self.listenAddress}' '{protocol}' '{listenPorts}' '{targetAddress}'{f' {chr(39)}{targetPorts}{chr(39)} ' if targetPorts else ''}"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.network.project.name}' network forward port add '{self.network.project.remote.name}':'{self.network.name}' '{self.listenAddress}' '{protocol}' '{listenPorts}' '{targetAddress}'{f' {chr(39)}{targetPorts}{chr(39)} ' if targetPorts else ''}"
         )
 
         if result["error"]:
@@ -274,9 +372,11 @@ class NetworkForward:
                 )
             raise NetworkForwardException(result["data"])
 
+        UsageIndex.notifySaved(self)
+
     def refresh(self) -> None:
         self.attributes = self.get(
-            network=self.network, listenAddress=self.listenAddress
+            network=self.network, listenAddress=self.listenAddress, fresh=True
         ).attributes
 
     def removePort(self, *, protocol: str, listenPorts: str) -> None:
@@ -291,8 +391,8 @@ class NetworkForward:
         if listenPorts is not None:
             NetworkForward.validatePortList(ports=listenPorts)
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.network.project.name}' network forward port remove '{self.network.project.remote.name}':'{self.network.name}' '{self.listenAddress}' '{protocol}' '{listenPorts}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.network.project.name}' network forward port remove '{self.network.project.remote.name}':'{self.network.name}' '{self.listenAddress}' '{protocol}' '{listenPorts}'"
         )
 
         if result["error"]:
@@ -300,6 +400,8 @@ class NetworkForward:
                 raise NetworkForwardPortNotFoundException(ports=listenPorts)
             raise NetworkForwardException(result["data"])
 
+        UsageIndex.notifySaved(self)
+
     def save(self, description: str | None = None) -> None:
         self.refresh()
 
@@ -309,9 +411,9 @@ class NetworkForward:
 
             self.attributes["description"] = description
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.network.project.name}' network forward edit '{self.network.project.remote.name}':'{self.network.name}' '{self.listenAddress}'",
-            input=yaml.safe_dump(self.attributes),
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.network.project.name}' network forward edit '{self.network.project.remote.name}':'{self.network.name}' '{self.listenAddress}'",
+            input=dumpYaml(self.attributes),
         )
 
         if result["error"]:
@@ -320,5 +422,7 @@ class NetworkForward:
             raise NetworkForwardException(result["data"])
 
         self.attributes = self.get(
-            network=self.network, listenAddress=self.listenAddress
+            network=self.network, listenAddress=self.listenAddress, fresh=True
         ).attributes
+
+        UsageIndex.notifySaved(self)
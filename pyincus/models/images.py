@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from pyincus.exceptions import (
+    ImageAliasAlreadyExistsException,
+    ImageException,
+    ImageNotFoundException,
+    IncusException,
+)
+from pyincus.profiler import phase
+from pyincus.utils import (
+    REGEX_EMPTY_BODY,
+    REGEX_FINGERPRINT,
+    REGEX_IMAGE_INFO_FINGERPRINT,
+    loadYaml,
+    parseTimestamp,
+)
+
+if TYPE_CHECKING:
+    from pyincus.client import IncusClient
+    from pyincus.models.projects import Project
+
+
+class AliasIndex:
+    def __init__(self, ttl: float = 300) -> None:
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        self.__entries: dict[tuple[str, str, str], tuple[str, float]] = {}
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__} (aliases={len(self.__entries)}, ttl={self.ttl})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def lookup(self, project: Project, alias: str) -> str | None:
+        with self.__lock:
+            entry = self.__entries.get((project.remote.name, project.name, alias))
+
+        if entry is None or entry[1] < time.monotonic():
+            return None
+
+        return entry[0]
+
+    def set(self, project: Project, alias: str, fingerprint: str) -> None:
+        with self.__lock:
+            self.__entries[(project.remote.name, project.name, alias)] = (
+                fingerprint,
+                time.monotonic() + self.ttl,
+            )
+
+    def resolve(self, project: Project, alias: str) -> str:
+        if len(alias) == 64 and REGEX_FINGERPRINT.match(alias):
+            return alias
+
+        fingerprint = self.lookup(project=project, alias=alias)
+        if fingerprint is not None:
+            return fingerprint
+
+        client = project.remote.client
+
+        # Without the index, every launch from an alias asks the image server.
+        result = client.shared(
+            ("image", project.remote.name, project.name, "info", alias),
+            client.run,
+            cmd=f"{client.binaryPath} --project='{project.name}' image info '{project.remote.name}':'{alias}'",
+        )
+
+        if result["error"]:
+            if "not found" in result["data"].lower():
+                raise ImageNotFoundException(name=alias)
+
+            raise ImageException(result["data"])
+
+        match = REGEX_IMAGE_INFO_FINGERPRINT.search(result["data"])
+        if not match:
+            raise ImageException(f'No fingerprint for image "{alias}".')
+
+        self.set(project=project, alias=alias, fingerprint=match.group("fingerprint"))
+
+        return match.group("fingerprint")
+
+    def invalidate(
+        self,
+        project: Project | None = None,
+        alias: str | None = None,
+        fingerprint: str | None = None,
+    ) -> None:
+        with self.__lock:
+            for key, entry in list(self.__entries.items()):
+                if project is not None and key[:2] != (
+                    project.remote.name,
+                    project.name,
+                ):
+                    continue
+                if alias is not None and key[2] != alias:
+                    continue
+                if fingerprint is not None and entry[0] != fingerprint:
+                    continue
+
+                del self.__entries[key]
+
+
+class ImageUsage:
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__entries: dict[tuple[str, str, str], tuple[int, float]] = {}
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (images={len(self.__entries)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def record(self, image: Image, count: int = 1) -> None:
+        key = (image.project.remote.name, image.project.name, image.fingerprint)
+
+        with self.__lock:
+            uses, _ = self.__entries.get(key, (0, 0.0))
+            self.__entries[key] = (uses + count, time.time())
+
+    def get(self, image: Image) -> tuple[int, float]:
+        with self.__lock:
+            return self.__entries.get(
+                (image.project.remote.name, image.project.name, image.fingerprint),
+                (0, 0.0),
+            )
+
+    def forget(self, image: Image) -> None:
+        with self.__lock:
+            self.__entries.pop(
+                (image.project.remote.name, image.project.name, image.fingerprint),
+                None,
+            )
+
+
+class Image:
+    def __init__(self, project: Project, fingerprint: str, **kwargs) -> None:
+        self.project = project
+        self.fingerprint = fingerprint
+        self.__attributes = kwargs
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (fingerprint={self.fingerprint[:12]})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        return self.__attributes
+
+    @attributes.setter
+    def attributes(self, value: dict[str, Any]) -> None:
+        self.__attributes = value
+
+    @property
+    def client(self) -> IncusClient:
+        return self.project.remote.client
+
+    @property
+    def aliases(self) -> list[str]:
+        return [a["name"] for a in self.__attributes.get("aliases") or []]
+
+    @property
+    def architecture(self) -> str:
+        return self.__attributes.get("architecture", "")
+
+    @property
+    def autoUpdate(self) -> bool:
+        return bool(self.__attributes.get("auto_update"))
+
+    @property
+    def cached(self) -> bool:
+        return bool(self.__attributes.get("cached"))
+
+    @property
+    def createdAt(self) -> str:
+        return self.__attributes.get("created_at")
+
+    @property
+    def description(self) -> str:
+        return self.properties.get("description", "")
+
+    @property
+    def filename(self) -> str:
+        return self.__attributes.get("filename", "")
+
+    @property
+    def lastUsedAt(self) -> str:
+        return self.__attributes.get("last_used_at")
+
+    @property
+    def properties(self) -> dict[str, str]:
+        return self.__attributes.get("properties") or {}
+
+    @property
+    def public(self) -> bool:
+        return bool(self.__attributes.get("public"))
+
+    @property
+    def size(self) -> int:
+        return self.__attributes.get("size", 0)
+
+    @property
+    def type(self) -> str:
+        return self.__attributes.get("type", "")
+
+    @property
+    def uses(self) -> int:
+        return self.usage(client=self.client).get(self)[0]
+
+    @property
+    def lastUsed(self) -> float:
+        # Launches seen by this process, or by the server, whichever is later.
+        # Images never used count from their upload so new ones aren't pruned.
+        return max(
+            self.usage(client=self.client).get(self)[1],
+            parseTimestamp(self.__attributes.get("last_used_at")),
+            parseTimestamp(self.__attributes.get("uploaded_at")),
+        )
+
+    @staticmethod
+    def index(client: IncusClient) -> AliasIndex:
+        if "imageAliases" not in client.cache:
+            client.cache.setdefault("imageAliases", AliasIndex())
+
+        return client.cache["imageAliases"]
+
+    @staticmethod
+    def usage(client: IncusClient) -> ImageUsage:
+        if "imageUsage" not in client.cache:
+            client.cache.setdefault("imageUsage", ImageUsage())
+
+        return client.cache["imageUsage"]
+
+    @classmethod
+    def _fetch(cls, project: Project, fingerprint: str, **kwargs) -> Image | None:
+        for image in cls.list(project=project, filter=fingerprint, **kwargs):
+            if image.fingerprint.startswith(fingerprint):
+                return image
+
+        return None
+
+    @classmethod
+    def exists(cls, project: Project, name: str, **kwargs) -> bool:
+        try:
+            return cls.get(project=project, name=name, **kwargs) is not None
+        except ImageNotFoundException:
+            return False
+
+    @classmethod
+    def get(cls, project: Project, name: str, **kwargs) -> Image:
+        fingerprint = cls.index(project.remote.client).resolve(project, name)
+        image = cls._fetch(project=project, fingerprint=fingerprint, **kwargs)
+
+        if image is None:
+            raise ImageNotFoundException(name=name)
+
+        return image
+
+    @classmethod
+    def list(cls, project: Project, filter: str = "", **kwargs) -> list[Image]:
+        client = project.remote.client
+
+        cmd = f"{client.binaryPath} --project='{project.name}' image list '{project.remote.name}': '{filter}' -fyaml"
+        result = client.shared(
+            ("image", project.remote.name, project.name, "list", filter),
+            client.run,
+            cmd=cmd,
+            **kwargs,
+        )
+
+        if result["error"]:
+            if REGEX_EMPTY_BODY.search(result["data"]):
+                print(f'Retrying listing "{cmd}"...')
+                return cls.list(project=project, filter=filter, **kwargs)
+            else:
+                raise IncusException(result["data"])
+
+        objs = []
+        index = cls.index(client)
+
+        results = loadYaml(result["data"]) or []
+
+        with phase("construct"):
+            for obj in results:
+                obj.pop("project", None)
+                image = cls(project=project, **obj)
+                objs.append(image)
+
+                # Listings are fresh, they keep the index warm for free.
+                for alias in image.aliases:
+                    index.set(
+                        project=project, alias=alias, fingerprint=image.fingerprint
+                    )
+
+        return objs
+
+    @classmethod
+    def copy(
+        cls,
+        project: Project,
+        image: str,
+        *,
+        projectSource: Project,
+        aliases: list[str] | None = None,
+        copyAliases: bool = False,
+        autoUpdate: bool = False,
+        public: bool = False,
+    ) -> Image:
+        client = project.remote.client
+
+        fingerprint = cls.index(client).resolve(projectSource, image)
+        aliasesToString = " ".join([f"--alias='{a}'" for a in aliases or []])
+
+        result = client.run(
+            cmd=f"{client.binaryPath} --project='{projectSource.name}' image copy '{projectSource.remote.name}':'{image}' '{project.remote.name}': --target-project='{project.name}' {aliasesToString} {'--copy-aliases ' if copyAliases else ''}{'--auto-update ' if autoUpdate else ''}{'--public ' if public else ''}--quiet"
+        )
+
+        if result["error"]:
+            if "Alias already exists" in result["data"]:
+                raise ImageAliasAlreadyExistsException()
+            if "not found" in result["data"].lower():
+                raise ImageNotFoundException(name=image)
+            # Copying an image that is already there is as good as copying it.
+            if "already exists" not in result["data"]:
+                raise ImageException(result["data"])
+
+        return cls.get(project=project, name=fingerprint, fresh=True)
+
+    @classmethod
+    def ensureCached(
+        cls,
+        project: Project,
+        image: str,
+        *,
+        projectSource: Project | None = None,
+        autoUpdate: bool = False,
+    ) -> Image:
+        client = project.remote.client
+
+        if projectSource is None or (
+            projectSource.remote.name == project.remote.name
+            and projectSource.name == project.name
+        ):
+            return cls.get(project=project, name=image)
+
+        fingerprint = cls.index(client).resolve(projectSource, image)
+
+        def ensure() -> Image:
+            found = cls._fetch(project=project, fingerprint=fingerprint)
+            if found is not None:
+                return found
+
+            return cls.copy(
+                project=project,
+                image=image,
+                projectSource=projectSource,
+                autoUpdate=autoUpdate,
+            )
+
+        # Concurrent callers for the same image share a single copy.
+        return client.flights.do(
+            ("image", project.remote.name, project.name, "ensure", fingerprint),
+            ensure,
+        )
+
+    @classmethod
+    def prune(
+        cls,
+        project: Project,
+        *,
+        olderThan: float = 7 * 24 * 3600,
+        keep: int = 0,
+        cachedOnly: bool = True,
+        dryRun: bool = False,
+    ) -> list[Image]:
+        now = time.time()
+
+        images = [i for i in cls.list(project=project) if i.cached or not cachedOnly]
+        images.sort(key=lambda i: i.lastUsed, reverse=True)
+
+        pruned = [i for i in images[keep:] if now - i.lastUsed >= olderThan]
+
+        if not dryRun:
+            for image in pruned:
+                image.delete()
+
+        return pruned
+
+    def recordUse(self, count: int = 1) -> None:
+        self.usage(self.client).record(self, count=count)
+
+    def delete(self) -> None:
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' image delete '{self.project.remote.name}':'{self.fingerprint}'"
+        )
+
+        if result["error"]:
+            if "not found" in result["data"].lower():
+                raise ImageNotFoundException(name=self.fingerprint)
+
+            raise ImageException(result["data"])
+
+        self.index(self.client).invalidate(fingerprint=self.fingerprint)
+        self.usage(self.client).forget(self)
+
+    def refresh(self) -> None:
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' image refresh '{self.project.remote.name}':'{self.fingerprint}'"
+        )
+
+        if result["error"]:
+            if "not found" in result["data"].lower():
+                raise ImageNotFoundException(name=self.fingerprint)
+
+            raise ImageException(result["data"])
+
+        # A refresh can replace the image, its aliases then move to the new one.
+        self.index(self.client).invalidate(fingerprint=self.fingerprint)
+
+        image = None
+        for name in [*self.aliases, self.fingerprint]:
+            try:
+                image = self.get(project=self.project, name=name, fresh=True)
+                break
+            except ImageNotFoundException:
+                pass
+
+        if image is None:
+            raise ImageNotFoundException(name=self.fingerprint)
+
+        self.fingerprint = image.fingerprint
+        self.attributes = image.attributes
+
+    def alias(self, name: str, description: str = "") -> None:
+        descriptionToString = f"--description='{description}'" if description else ""
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' image alias create '{self.project.remote.name}':'{name}' '{self.fingerprint}' {descriptionToString}"
+        )
+
+        if result["error"]:
+            if "already exists" in result["data"]:
+                raise ImageAliasAlreadyExistsException(name=name)
+
+            raise ImageException(result["data"])
+
+        self.index(self.client).set(
+            project=self.project, alias=name, fingerprint=self.fingerprint
+        )
+        self.__attributes.setdefault("aliases", []).append(
+            {"name": name, "description": description}
+        )
+
+    def deleteAlias(self, name: str) -> None:
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' image alias delete '{self.project.remote.name}':'{name}'"
+        )
+
+        if result["error"]:
+            if "not found" in result["data"].lower():
+                raise ImageNotFoundException(name=name)
+
+            raise ImageException(result["data"])
+
+        self.index(self.client).invalidate(project=self.project, alias=name)
+        self.__attributes["aliases"] = [
+            a for a in self.__attributes.get("aliases") or [] if a["name"] != name
+        ]
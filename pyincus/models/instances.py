@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import os
+import shlex
 import textwrap
-from typing import TYPE_CHECKING, Any
-
-import yaml
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterable
 
 from pyincus.exceptions import (
     DeviceNotFoundException,
@@ -23,18 +23,91 @@ from pyincus.exceptions import (
     NameAlreadyInUseException,
     NetworkNotFoundException,
 )
-from pyincus.incus import Incus
+from pyincus.profiler import carry, phase
+from pyincus.usage import UsageIndex
 from pyincus.utils import (
     REGEX_DEVICE_NOT_FOUND,
     REGEX_EMPTY_BODY,
+    REGEX_FINGERPRINT,
     REGEX_IMAGE_NAME,
     REGEX_NETWORK_NOT_FOUND_COPY,
+    dumpYaml,
     isTrue,
+    loadYaml,
     validateObjectFormat,
 )
 
 if TYPE_CHECKING:
+    from pyincus.backup import Throttle
+    from pyincus.batch import BatchResult
+    from pyincus.client import IncusClient
+    from pyincus.models.operations import Operation
     from pyincus.models.projects import Project
+    from pyincus.models.remotes import Remote
+    from pyincus.retention import RetentionPlan, RetentionPolicy, RetentionResult
+    from pyincus.table import InstanceTable
+
+
+class InstanceState:
+    def __init__(self, name: str, **kwargs) -> None:
+        self.name = name
+        self.__attributes = kwargs
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (name={self.name}, status={self.status})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        return self.__attributes
+
+    @property
+    def status(self) -> str:
+        return self.__attributes.get("status", "")
+
+    @property
+    def statusCode(self) -> int:
+        return self.__attributes.get("status_code", 0)
+
+    @property
+    def pid(self) -> int:
+        return self.__attributes.get("pid", 0)
+
+    @property
+    def processes(self) -> int:
+        return self.__attributes.get("processes", 0)
+
+    @property
+    def cpuUsage(self) -> int:
+        return (self.__attributes.get("cpu") or {}).get("usage", 0)
+
+    @property
+    def memoryUsage(self) -> int:
+        return (self.__attributes.get("memory") or {}).get("usage", 0)
+
+    @property
+    def memoryPeak(self) -> int:
+        return (self.__attributes.get("memory") or {}).get("usage_peak", 0)
+
+    @property
+    def disk(self) -> dict[str, dict]:
+        return self.__attributes.get("disk") or {}
+
+    @property
+    def network(self) -> dict[str, dict]:
+        return self.__attributes.get("network") or {}
+
+    @property
+    def addresses(self) -> list[str]:
+        return [
+            address["address"]
+            for name, nic in self.network.items()
+            if name != "lo"
+            for address in nic.get("addresses") or []
+            if address.get("scope") == "global"
+        ]
 
 
 class Instance:
@@ -60,6 +133,10 @@ class Instance:
     def attributes(self, value: dict[str, Any]) -> None:
         self.__attributes = value
 
+    @property
+    def client(self) -> IncusClient:
+        return self.project.remote.client
+
     @property
     def architecture(self) -> str:
         return self.get(project=self.project, name=self.name).attributes["architecture"]
@@ -122,11 +199,11 @@ class Instance:
 
     @property
     def status(self) -> str:
-        return self.get(project=self.project, name=self.name).attributes["status"]
+        return self.fetchState().status
 
     @property
     def statusCode(self) -> int:
-        return self.get(project=self.project, name=self.name).attributes["status_code"]
+        return self.fetchState().statusCode
 
     @property
     def lastUsedAt(self) -> str:
@@ -146,7 +223,7 @@ class Instance:
 
     @property
     def state(self) -> dict[str, Any]:
-        return self.get(project=self.project, name=self.name).attributes["state"]
+        return self.fetchState().attributes
 
     @property
     def snapshots(self) -> list:
@@ -158,7 +235,9 @@ class Instance:
 
         validateObjectFormat(name)
 
-        instances = cls.list(project=project, filter=f"^{name}$", skipValidation=True)
+        instances = cls.list(
+            project=project, filter=f"^{name}$", skipValidation=True, **kwargs
+        )
 
         if len(instances) > 0:
             i = instances[0]
@@ -170,8 +249,8 @@ class Instance:
         return isinstance(cls._fetch(project=project, name=name, **kwargs), Instance)
 
     @classmethod
-    def get(cls, project: Project, name: str) -> Instance:
-        instance = cls._fetch(project=project, name=name)
+    def get(cls, project: Project, name: str, *, fresh: bool = False) -> Instance:
+        instance = cls._fetch(project=project, name=name, fresh=fresh)
 
         if instance is None or not isinstance(instance, Instance):
             raise InstanceNotFoundException()
@@ -182,12 +261,19 @@ class Instance:
     def list(
         cls, project: Project, filter: str = "", skipValidation=False, **kwargs
     ) -> list[Instance]:
+        client = project.remote.client
+
         if not skipValidation:
             validateObjectFormat(filter)
 
         objs = []
-        cmd = f"{Incus.binaryPath} --project='{project.name}' list '{project.remote.name}': '{filter}' -fyaml"
-        result = Incus.run(cmd=cmd, **kwargs)
+        cmd = f"{client.binaryPath} --project='{project.name}' list '{project.remote.name}': '{filter}' -fyaml"
+        result = client.shared(
+            ("instance", project.remote.name, project.name, "list", filter),
+            client.run,
+            cmd=cmd,
+            **kwargs,
+        )
 
         if result["error"]:
             if REGEX_EMPTY_BODY.search(result["data"]):
@@ -201,7 +287,7 @@ class Instance:
             else:
                 raise IncusException(result["data"])
 
-        results = yaml.safe_load(result["data"])
+        results = loadYaml(result["data"])
 
         # If it's a dictionary (e.g. for Remotes), change it to a list like the majority.
         # Example:
@@ -216,13 +302,139 @@ class Instance:
 
             results = tmp
 
-        for obj in results:
-            if "project" in obj:
-                del obj["project"]
-            objs.append(cls(project=project, **obj))
+        with phase("construct"):
+            for obj in results:
+                if "project" in obj:
+                    del obj["project"]
+                objs.append(cls(project=project, **obj))
+
+        return objs
+
+    @classmethod
+    def table(
+        cls, project: Project, filter: str = "", skipValidation=False, **kwargs
+    ) -> InstanceTable:
+        from pyincus.table import InstanceTable
+
+        return InstanceTable.fetch(
+            project=project, filter=filter, skipValidation=skipValidation, **kwargs
+        )
+
+    @classmethod
+    def listAllProjects(
+        cls, remote: Remote, filter: str = "", skipValidation=False, **kwargs
+    ) -> dict[str, list[Instance]]:
+        from pyincus.models.projects import Project
+
+        client = remote.client
+
+        if not skipValidation:
+            validateObjectFormat(filter)
+
+        objs = {}
+        cmd = f"{client.binaryPath} list '{remote.name}': '{filter}' --all-projects -fyaml"
+
+        result = client.shared(
+            ("instance", remote.name, None, "list", filter),
+            client.run,
+            cmd=cmd,
+            **kwargs,
+        )
+
+        if result["error"]:
+            if REGEX_EMPTY_BODY.search(result["data"]):
+                print(f'Retrying listing "{cmd}"...')
+                return cls.listAllProjects(
+                    remote=remote,
+                    filter=filter,
+                    skipValidation=skipValidation,
+                    **kwargs,
+                )
+            else:
+                raise IncusException(result["data"])
+
+        results = loadYaml(result["data"]) or []
+
+        with phase("construct"):
+            for obj in results:
+                project = Project.reference(
+                    remote=remote, name=obj.pop("project", None) or "default"
+                )
+                objs.setdefault(project.name, []).append(cls(project=project, **obj))
 
         return objs
 
+    def fetchState(self, **kwargs) -> InstanceState:
+        validateObjectFormat(self.name)
+
+        result = self.client.shared(
+            (
+                "instance",
+                self.project.remote.name,
+                self.project.name,
+                "state",
+                self.name,
+            ),
+            self.client.query,
+            path=f"/1.0/instances/{self.name}/state?project={self.project.name}",
+            remote=self.project.remote.name,
+            **kwargs,
+        )
+
+        if result["error"]:
+            if REGEX_EMPTY_BODY.search(result["data"]):
+                print(f'Retrying fetching state of "{self.name}"...')
+                return self.fetchState(**kwargs)
+            if "Instance not found" in result["data"]:
+                raise InstanceNotFoundException()
+            raise InstanceException(result["data"])
+
+        return InstanceState(name=self.name, **result["data"])
+
+    @classmethod
+    def fetchStates(
+        cls,
+        project: Project,
+        names: Iterable[str] | None = None,
+        *,
+        maxWorkers: int = 8,
+        **kwargs,
+    ) -> dict[str, InstanceState]:
+        client = project.remote.client
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        if names is None:
+            result = client.query(
+                path=f"/1.0/instances?project={project.name}",
+                remote=project.remote.name,
+                **kwargs,
+            )
+
+            if result["error"]:
+                raise IncusException(result["data"])
+
+            # Without recursion the API only returns URLs, the cheapest listing.
+            # Those of other projects end with "?project=<name>".
+            names = [
+                url.split("?", 1)[0].rsplit("/", 1)[-1] for url in result["data"] or []
+            ]
+
+        instances = [cls(project=project, name=name) for name in names]
+        validateObjectFormat(*[i.name for i in instances])
+
+        def fetch(instance: Instance) -> InstanceState | None:
+            try:
+                return instance.fetchState(**kwargs)
+            except InstanceNotFoundException:
+                # Deleted since it was listed.
+                return None
+
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            states = executor.map(carry(fetch), instances)
+
+            return {i.name: s for i, s in zip(instances, states) if s is not None}
+
     @classmethod
     def copy(
         cls,
@@ -242,7 +454,10 @@ class Instance:
         noProfile: bool = False,
         refresh: bool = False,
         stateless: bool = False,
-    ) -> Instance:
+        wait: bool = True,
+    ) -> Instance | Operation:
+        client = project.remote.client
+
         validateObjectFormat(
             source,
             name,
@@ -258,6 +473,10 @@ class Instance:
         if name is None and not refresh:
             raise InstanceException("""if(name is None and not refresh):""")
 
+        # The CLI only refreshes from an instance, never from one of its snapshots.
+        if refresh and snapshotName is not None:
+            raise InstanceException("A refresh can only copy from an instance.")
+
         configToString = None
         deviceToString = None
 
@@ -267,10 +486,13 @@ class Instance:
 
         if device is not None:
             # Expect to receive this format {"eth0":{"key":"value"},"root":{"key":"value"}}
-            for n, values in device.items():
-                deviceToString = " ".join(
-                    [f"-d {n},{k}={v}" for k, v in values.items()]
-                )
+            deviceToString = " ".join(
+                [
+                    f"-d {n},{k}={v}"
+                    for n, values in device.items()
+                    for k, v in values.items()
+                ]
+            )
 
         if mode not in ["pull", "push", "relay"]:
             raise InstanceException("""if(not mode in ["pull", "push", "relay"]):""")
@@ -280,10 +502,63 @@ class Instance:
 
         name = name if name else source
 
-        result = Incus.run(
+        if not wait:
+            overrides = cls._overrides(
+                config=config,
+                device=device,
+                profile=profile,
+                noProfile=noProfile,
+                storage=storage,
+            )
+
+            if overrides is None or projectTarget.remote.name != project.remote.name:
+                return cls._background(
+                    project,
+                    lambda: cls.copy(
+                        project,
+                        source,
+                        name,
+                        snapshotName=snapshotName,
+                        projectTarget=projectTarget,
+                        config=config,
+                        device=device,
+                        profile=profile,
+                        mode=mode,
+                        storage=storage,
+                        allowInconsistent=allowInconsistent,
+                        instanceOnly=instanceOnly,
+                        noProfile=noProfile,
+                        refresh=refresh,
+                        stateless=stateless,
+                    ),
+                )
+
+            return cls._submit(
+                projectTarget,
+                "/1.0/instances",
+                {
+                    "name": name,
+                    "source": {
+                        "type": "copy",
+                        "source": f"{source}/{snapshotName}"
+                        if snapshotName
+                        else source,
+                        "project": project.name,
+                        "instance_only": instanceOnly,
+                        "allow_inconsistent": allowInconsistent,
+                        "refresh": refresh,
+                    },
+                    **overrides,
+                },
+                name=name,
+                resource=Instance(project=projectTarget, name=name),
+                verify=lambda: cls._verify(project=projectTarget, name=name),
+            )
+
+        result = client.run(
             cmd=textwrap.dedent(
                 f"""\
-                    {Incus.binaryPath}  
+                    {client.binaryPath}  
                     {f"--project='{project.name}' " if project else ""} 
                     copy 
                     {f"'{project.remote.name}':" if project.remote else ""}'{source}'{f"/'{snapshotName}'" if snapshotName else ""} 
@@ -297,6 +572,7 @@ class Instance:
                     {"--allow-inconsistent " if allowInconsistent else ""}
                     {"--instance-only " if instanceOnly else ""}
                     {"--no-profile " if noProfile else ""}
+                    {"--refresh " if refresh else ""}
                     {"--stateless " if stateless else ""}
                 """
             ).replace("\n", "")
@@ -308,7 +584,7 @@ class Instance:
                 or "Operation not found" in result["data"]
             ):
                 print('Command "copy" broke, attempt to get the content...')
-                return cls.get(project=project, name=name)
+                return cls._created(project=projectTarget, name=name, fetch=True)
 
             match = REGEX_DEVICE_NOT_FOUND.search(result["data"])
             if match:
@@ -323,7 +599,7 @@ class Instance:
 
             raise InstanceException(result["data"])
 
-        return Instance(project=project, name=name)
+        return cls._created(project=projectTarget, name=name)
 
     def delete(self, *, force: bool = True) -> None:
         if (
@@ -335,8 +611,8 @@ class Instance:
             tmpConfig["security.protection.delete"] = False
             self.config = tmpConfig
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' delete {'--force ' if force else ''}'{self.project.remote.name}':'{self.name}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' delete {'--force ' if force else ''}'{self.project.remote.name}':'{self.name}'"
         )
 
         if result["error"]:
@@ -352,10 +628,12 @@ class Instance:
 
                 raise InstanceException(result["data"])
 
+        UsageIndex.notifyDeleted(self)
+
     def exec(self, cmd: str, input: str | None = None) -> str:
         cmd = cmd.replace("'", "'\"'\"'")
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' exec '{self.project.remote.name}':'{self.name}' -- bash -c '{cmd}'",
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' exec '{self.project.remote.name}':'{self.name}' -- bash -c '{cmd}'",
             input=input,
         )
 
@@ -386,6 +664,130 @@ class Instance:
 
         return result["data"]
 
+    def export(
+        self,
+        target: str | BinaryIO,
+        *,
+        compression: str | None = None,
+        optimizedStorage: bool = False,
+        instanceOnly: bool = False,
+        throttle: Throttle | None = None,
+    ) -> None:
+        from pyincus.backup import validateCompression
+
+        if compression is not None:
+            validateCompression(compression)
+
+        options = f"{f'--compression={compression} ' if compression else ''}{'--optimized-storage ' if optimizedStorage else ''}{'--instance-only ' if instanceOnly else ''}--quiet"
+        cmd = f"{self.client.binaryPath} --project='{self.project.name}' export '{self.project.remote.name}':'{self.name}'"
+
+        # The tarball never passes through Python unless it has to: a path is
+        # written by the CLI itself, a file object or a throttle get a pipe.
+        if isinstance(target, str) and throttle is None:
+            result = self.client.run(cmd=f"{cmd} {shlex.quote(target)} {options}")
+        elif isinstance(target, str):
+            with open(target, "wb") as sink:
+                result = self.client.stream(
+                    cmd=f"{cmd} - {options}", sink=sink, throttle=throttle
+                )
+        else:
+            result = self.client.stream(
+                cmd=f"{cmd} - {options}", sink=target, throttle=throttle
+            )
+
+        if result["error"]:
+            if isinstance(target, str) and os.path.exists(target):
+                os.remove(target)
+
+            if "Instance not found" in result["data"]:
+                raise InstanceNotFoundException(name=self.name)
+
+            raise InstanceException(result["data"])
+
+    @classmethod
+    def exportMany(
+        cls,
+        project: Project,
+        names: Iterable[str],
+        directory: str,
+        *,
+        compression: str = "zstd",
+        optimizedStorage: bool = False,
+        instanceOnly: bool = False,
+        maxWorkers: int = 4,
+        bytesPerSecond: float | None = None,
+    ) -> BatchResult:
+        from pyincus.backup import exportMany
+
+        return exportMany(
+            project=project,
+            names=list(names),
+            directory=directory,
+            compression=compression,
+            optimizedStorage=optimizedStorage,
+            instanceOnly=instanceOnly,
+            maxWorkers=maxWorkers,
+            bytesPerSecond=bytesPerSecond,
+        )
+
+    @classmethod
+    def pruneSnapshots(
+        cls,
+        project: Project,
+        policy: RetentionPolicy,
+        *,
+        policies: dict[str, RetentionPolicy] | None = None,
+        filter: str = "",
+        maxWorkers: int = 8,
+        dryRun: bool = False,
+    ) -> RetentionPlan | RetentionResult:
+        from pyincus.retention import prune
+
+        return prune(
+            project=project,
+            policy=policy,
+            policies=policies,
+            filter=filter,
+            maxWorkers=maxWorkers,
+            dryRun=dryRun,
+        )
+
+    @classmethod
+    def import_(
+        cls,
+        project: Project,
+        source: str | BinaryIO,
+        name: str,
+        *,
+        storage: str | None = None,
+        throttle: Throttle | None = None,
+    ) -> Instance:
+        client = project.remote.client
+
+        validateObjectFormat(name, storage)
+
+        cmd = f"{client.binaryPath} --project='{project.name}' import '{project.remote.name}': {{}} '{name}' {f'--storage={storage} ' if storage else ''}--quiet"
+
+        if isinstance(source, str) and throttle is None:
+            result = client.run(cmd=cmd.format(shlex.quote(source)))
+        elif isinstance(source, str):
+            with open(source, "rb") as reader:
+                result = client.stream(
+                    cmd=cmd.format("-"), source=reader, throttle=throttle
+                )
+        else:
+            result = client.stream(
+                cmd=cmd.format("-"), source=source, throttle=throttle
+            )
+
+        if result["error"]:
+            if "already exists" in result["data"]:
+                raise InstanceAlreadyExistsException(name=name)
+
+            raise InstanceException(result["data"])
+
+        return cls._created(project=project, name=name)
+
     @classmethod
     def init(
         cls,
@@ -402,7 +804,10 @@ class Instance:
         empty: bool = False,
         noProfile: bool = False,
         vm: bool = False,
-    ) -> Instance:
+        wait: bool = True,
+    ) -> Instance | Operation:
+        client = project.remote.client
+
         validateObjectFormat(
             name,
             project.remote.name,
@@ -413,6 +818,23 @@ class Instance:
         )
         cls.validateImageName(image)
 
+        if not wait:
+            return cls._create(
+                project,
+                image,
+                name,
+                start=False,
+                projectSource=projectSource,
+                config=config,
+                device=device,
+                profile=profile,
+                network=network,
+                storage=storage,
+                empty=empty,
+                noProfile=noProfile,
+                vm=vm,
+            )
+
         configToString = None
         deviceToString = None
 
@@ -422,15 +844,18 @@ class Instance:
 
         if device:
             # Expect to receive this format {"eth0":{"key":"value"},"root":{"key":"value"}}
-            for n, values in device.items():
-                deviceToString = " ".join(
-                    [f"-d {n},{k}={v}" for k, v in values.items()]
-                )
-
-        result = Incus.run(
+            deviceToString = " ".join(
+                [
+                    f"-d {n},{k}={v}"
+                    for n, values in device.items()
+                    for k, v in values.items()
+                ]
+            )
+
+        result = client.run(
             cmd=textwrap.dedent(
                 f"""\
-                    {Incus.binaryPath} 
+                    {client.binaryPath} 
                     --project='{project.name}' 
                     init 
                     {f"'{projectSource.remote.name}':" if projectSource else ""}'{image}' 
@@ -453,12 +878,12 @@ class Instance:
                 or "Operation not found" in result["data"]
             ):
                 print('Command "init" broke, attempt to get the content...')
-                return cls.get(project=project, name=name)
+                return cls._created(project=project, name=name, fetch=True)
             if 'This "instances" entry already exists' in result["data"]:
                 raise InstanceAlreadyExistsException(name=name)
             raise InstanceException(result["data"])
 
-        return Instance(project=project, name=name)
+        return cls._created(project=project, name=name)
 
     @classmethod
     def launch(
@@ -476,7 +901,10 @@ class Instance:
         empty: bool = False,
         noProfile: bool = False,
         vm: bool = False,
-    ) -> Instance:
+        wait: bool = True,
+    ) -> Instance | Operation:
+        client = project.remote.client
+
         validateObjectFormat(
             name,
             project.name,
@@ -488,6 +916,23 @@ class Instance:
         )
         cls.validateImageName(image)
 
+        if not wait:
+            return cls._create(
+                project,
+                image,
+                name,
+                start=True,
+                projectSource=projectSource,
+                config=config,
+                device=device,
+                profile=profile,
+                network=network,
+                storage=storage,
+                empty=empty,
+                noProfile=noProfile,
+                vm=vm,
+            )
+
         configToString = None
         deviceToString = None
 
@@ -497,15 +942,18 @@ class Instance:
 
         if device:
             # Expect to receive this format {"eth0":{"key":"value"},"root":{"key":"value"}}
-            for n, values in device.items():
-                deviceToString = " ".join(
-                    [f"-d {n},{k}={v}" for k, v in values.items()]
-                )
-
-        result = Incus.run(
+            deviceToString = " ".join(
+                [
+                    f"-d {n},{k}={v}"
+                    for n, values in device.items()
+                    for k, v in values.items()
+                ]
+            )
+
+        result = client.run(
             cmd=textwrap.dedent(
                 f"""\
-                    {Incus.binaryPath} 
+                    {client.binaryPath} 
                     --project='{project.name}' 
                     launch 
                     {f"'{projectSource.remote.name}':" if projectSource else ""}'{image}' 
@@ -528,12 +976,122 @@ class Instance:
                 or "Operation not found" in result["data"]
             ):
                 print('Command "launch" broke, attempt to get the content...')
-                return cls.get(project=project, name=name)
+                return cls._created(project=project, name=name, fetch=True)
             if 'This "instances" entry already exists' in result["data"]:
                 raise InstanceAlreadyExistsException(name=name)
             raise InstanceException(result["data"])
 
-        return Instance(project=project, name=name)
+        return cls._created(project=project, name=name)
+
+    @classmethod
+    def cloneMany(
+        cls,
+        project: Project,
+        source: str,
+        names: Iterable[str],
+        *,
+        snapshotName: str | None = None,
+        projectTarget: Project | None = None,
+        config: dict | None = None,
+        device: dict[str, dict] | None = None,
+        profile: str | None = None,
+        storage: str | None = None,
+        refresh: bool = False,
+        maxWorkers: int | None = None,
+    ) -> BatchResult:
+        from pyincus.batch import cloneMany
+
+        return cloneMany(
+            project=project,
+            source=source,
+            names=list(names),
+            snapshotName=snapshotName,
+            projectTarget=projectTarget,
+            config=config,
+            device=device,
+            profile=profile,
+            storage=storage,
+            refresh=refresh,
+            maxWorkers=maxWorkers,
+        )
+
+    @classmethod
+    def sync(
+        cls,
+        project: Project,
+        source: str,
+        target: str,
+        *,
+        projectTarget: Project | None = None,
+        storage: str | None = None,
+    ) -> Instance:
+        if projectTarget is None:
+            projectTarget = project
+
+        # Only the differences are transferred, but a running target can't be
+        # refreshed, so it's stopped for the time of the copy.
+        running = False
+        try:
+            running = (
+                Instance(project=projectTarget, name=target).fetchState().status
+                == "Running"
+            )
+        except InstanceNotFoundException:
+            pass
+
+        if running:
+            Instance(project=projectTarget, name=target).stop()
+
+        try:
+            instance = cls.copy(
+                project=project,
+                source=source,
+                name=target,
+                projectTarget=projectTarget,
+                storage=storage,
+                refresh=True,
+            )
+        finally:
+            if running:
+                Instance(project=projectTarget, name=target).start()
+
+        return instance
+
+    @classmethod
+    def launchMany(
+        cls,
+        project: Project,
+        image: str,
+        names: Iterable[str],
+        *,
+        projectSource: Project | None = None,
+        config: dict | None = None,
+        device: dict[str, dict] | None = None,
+        profile: str | None = None,
+        network: str | None = None,
+        storage: str | None = None,
+        noProfile: bool = False,
+        vm: bool = False,
+        maxWorkers: int | None = None,
+        prewarm: bool = True,
+    ) -> BatchResult:
+        from pyincus.batch import launchMany
+
+        return launchMany(
+            project=project,
+            image=image,
+            names=list(names),
+            projectSource=projectSource,
+            config=config,
+            device=device,
+            profile=profile,
+            network=network,
+            storage=storage,
+            noProfile=noProfile,
+            vm=vm,
+            maxWorkers=maxWorkers,
+            prewarm=prewarm,
+        )
 
     def move(
         self,
@@ -553,7 +1111,8 @@ class Instance:
         instanceOnly: bool = False,
         noProfile: bool = False,
         stateless: bool = False,
-    ) -> Instance:
+        wait: bool = True,
+    ) -> Instance | Operation:
         validateObjectFormat(
             source,
             name,
@@ -574,10 +1133,13 @@ class Instance:
 
         if device:
             # Expect to receive this format {"eth0":{"key":"value"},"root":{"key":"value"}}
-            for n, values in device.items():
-                deviceToString = " ".join(
-                    [f"-d {n},{k}={v}" for k, v in values.items()]
-                )
+            deviceToString = " ".join(
+                [
+                    f"-d {n},{k}={v}"
+                    for n, values in device.items()
+                    for k, v in values.items()
+                ]
+            )
 
         if mode not in ["pull", "push", "relay"]:
             raise InstanceException("""if(not mode in ["pull", "push", "relay"]):""")
@@ -602,10 +1164,63 @@ class Instance:
                     f"Name must be set when the source project ({projectSource}) and destination project ({projectDestination}) are not equal."
                 )
 
-        result = Incus.run(
+        if not wait:
+            from pyincus.models.projects import Project
+
+            origin = Project.reference(remote=self.project.remote, name=projectSource)
+            destination = Project.reference(
+                remote=self.project.remote, name=projectDestination
+            )
+
+            # Moves within a remote are one API call, others need the CLI.
+            if (
+                remoteSource != self.project.remote.name
+                or remoteDestination != self.project.remote.name
+                or config
+                or device
+                or profile
+                or noProfile
+            ):
+                return self._background(
+                    self.project,
+                    lambda: self.move(
+                        source,
+                        name=name,
+                        remoteSource=remoteSource,
+                        remoteDestination=remoteDestination,
+                        projectSource=projectSource,
+                        projectDestination=projectDestination,
+                        config=config,
+                        device=device,
+                        profile=profile,
+                        mode=mode,
+                        storage=storage,
+                        allowInconsistent=allowInconsistent,
+                        instanceOnly=instanceOnly,
+                        noProfile=noProfile,
+                        stateless=stateless,
+                    ),
+                )
+
+            body: dict[str, Any] = {"name": name, "instance_only": instanceOnly}
+            if projectDestination != projectSource:
+                body["project"] = projectDestination
+            if storage:
+                body["pool"] = storage
+
+            return self._submit(
+                origin,
+                f"/1.0/instances/{source}",
+                body,
+                name=name,
+                resource=Instance(project=destination, name=name),
+                verify=lambda: self._verify(project=destination, name=name),
+            )
+
+        result = self.client.run(
             cmd=textwrap.dedent(
                 f"""\
-                    {Incus.binaryPath} 
+                    {self.client.binaryPath} 
                     {f"--project='{projectSource}' " if projectSource else ""} 
                     move 
                     {f"'{remoteSource}':" if remoteSource else ""}'{source}' 
@@ -630,7 +1245,7 @@ class Instance:
                 or "Operation not found" in result["data"]
             ):
                 print('Command "copy" broke, attempt to get the content...')
-                return self.get(project=self.project, name=name)
+                return self.get(project=self.project, name=name, fresh=True)
 
             match = REGEX_DEVICE_NOT_FOUND.search(result["data"])
             if match:
@@ -648,8 +1263,8 @@ class Instance:
         return Instance(project=self.project, name=name)
 
     def pause(self, timeout: int | None = None) -> None:
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' pause '{self.project.remote.name}':'{self.name}'",
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' pause '{self.project.remote.name}':'{self.name}'",
             timeout=timeout,
         )
 
@@ -669,8 +1284,8 @@ class Instance:
     def rename(self, name: str) -> None:
         validateObjectFormat(name)
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' rename '{self.project.remote.name}':'{self.name}' '{name}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' rename '{self.project.remote.name}':'{self.name}' '{name}'"
         )
 
         if result["error"]:
@@ -695,11 +1310,17 @@ class Instance:
                 if "Error: Renaming of running instance not allowed" == result["data"]:
                     raise InstanceIsRunningException()
 
+                raise InstanceException(result["data"])
+
+        # Indexes key objects by name, move this one to its new name.
+        UsageIndex.notifyDeleted(self)
+        self.name = name
         self.attributes["name"] = name
+        UsageIndex.notifySaved(self)
 
     def restart(self, *, force: bool = True, timeout: int = -1) -> None:
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' restart {'--force ' if force else ''}--timeout={timeout} '{self.project.remote.name}':'{self.name}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' restart {'--force ' if force else ''}--timeout={timeout} '{self.project.remote.name}':'{self.name}'"
         )
 
         if result["error"]:
@@ -717,11 +1338,22 @@ class Instance:
                     raise InstanceTimeoutExceededException()
                 raise InstanceException(result["data"])
 
-    def restore(self, name: str, *, stateful: bool = False) -> None:
+    def restore(
+        self, name: str, *, stateful: bool = False, wait: bool = True
+    ) -> Operation | None:
         validateObjectFormat(name)
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' snapshot restore {'--stateful ' if stateful else ''}'{self.project.remote.name}':'{self.name}' {name}"
+        if not wait:
+            return self._submit(
+                self.project,
+                f"/1.0/instances/{self.name}",
+                {"restore": name, "stateful": stateful},
+                method="PUT",
+                name=self.name,
+            )
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' snapshot restore {'--stateful ' if stateful else ''}'{self.project.remote.name}':'{self.name}' {name}"
         )
 
         if result["error"]:
@@ -737,8 +1369,8 @@ class Instance:
                 raise InstanceException(result["data"])
 
     def start(self) -> None:
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' start '{self.project.remote.name}':'{self.name}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' start '{self.project.remote.name}':'{self.name}'"
         )
 
         if result["error"]:
@@ -753,8 +1385,8 @@ class Instance:
                 raise InstanceException(result["data"])
 
     def stop(self, *, force: bool = True, timeout: int = -1) -> None:
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' stop {'--force ' if force else ''}--timeout={timeout} '{self.project.remote.name}':'{self.name}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' stop {'--force ' if force else ''}--timeout={timeout} '{self.project.remote.name}':'{self.name}'"
         )
 
         if result["error"]:
@@ -789,14 +1421,32 @@ class Instance:
 
             self.attributes["description"] = description
 
+        if profiles is not None:
+            if not isinstance(profiles, list):
+                raise InstanceException("profiles must be a list containing strings.")
+
+            validateObjectFormat(*profiles)
+
+        # Validated against what the instance will be once saved, expanded from
+        # the cached profiles instead of fetching the instance again per key.
+        if config is not None or devices is not None:
+            expandedConfig, expandedDevices = (
+                self.expanded(profiles=profiles)
+                if profiles is not None
+                else (
+                    self.attributes["expanded_config"],
+                    self.attributes["expanded_devices"],
+                )
+            )
+
         if config is not None:
             if not isinstance(config, dict):
                 raise InstanceException("config must be a dictionary.")
 
-            tmpConfig = self.config
+            tmpConfig = dict(self.attributes["config"])
 
             for k, v in config.items():
-                if k not in self.expandedConfig:
+                if k not in expandedConfig:
                     raise InstanceException(f'config "{k}" not in expanded_config.')
 
                 tmpConfig[k] = v
@@ -810,23 +1460,25 @@ class Instance:
             tmpDevices = {}
 
             for k, v in devices.items():
-                if k not in self.expandedDevices:
+                if k not in expandedDevices:
                     raise InstanceException(f'device "{k}" not in expanded_devices.')
 
-                tmpDevices[k] = self.expandedDevices[k]
+                tmpDevices[k] = dict(expandedDevices[k])
                 tmpDevices[k].update(v)
 
             self.attributes["devices"] = tmpDevices
 
         if profiles is not None:
-            if not isinstance(profiles, list):
-                raise InstanceException("profiles must be a list containing strings.")
+            self.attributes["profiles"] = profiles
 
-            validateObjectFormat(*profiles)
+        self.edit()
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' config edit '{self.project.remote.name}':'{self.name}'",
-            input=yaml.safe_dump(self.attributes),
+    def edit(self) -> None:
+        # Pushes the attributes as they are, keys the instance doesn't have yet
+        # included; save() is the checked way to change them.
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' config edit '{self.project.remote.name}':'{self.name}'",
+            input=dumpYaml(self.attributes),
         )
 
         if result["error"]:
@@ -836,15 +1488,12 @@ class Instance:
             ):
                 if (
                     self.attributes
-                    != self.get(project=self.project, name=self.name).attributes
+                    != self.get(
+                        project=self.project, name=self.name, fresh=True
+                    ).attributes
                 ):
                     print('Command "save" broke, retrying to save...')
-                    self.save(
-                        config=config,
-                        devices=devices,
-                        profiles=profiles,
-                        description=description,
-                    )
+                    self.edit()
             else:
                 if "Error: yaml: unmarshal errors:" in result["data"]:
                     raise InstanceException("Error: yaml: unmarshal errors:")
@@ -852,15 +1501,70 @@ class Instance:
                     raise DeviceNotFoundException()
                 raise InstanceException(result["data"])
 
-        self.attributes = self.get(project=self.project, name=self.name).attributes
+        self.attributes = self.get(
+            project=self.project, name=self.name, fresh=True
+        ).attributes
+
+        UsageIndex.notifySaved(self)
+
+    def expanded(
+        self,
+        profiles: list[str] | None = None,
+        *,
+        config: dict[str, str] | None = None,
+        devices: dict[str, dict] | None = None,
+    ) -> tuple[dict[str, str], dict[str, dict]]:
+        from pyincus.models.profiles import Profile
+
+        if profiles is None:
+            profiles = self.attributes["profiles"]
+
+        validateObjectFormat(*profiles)
+
+        cache = Profile.cache(self.client)
+
+        return Profile.expand(
+            [cache.lookup(project=self.project, name=p) for p in profiles],
+            config=self.attributes["config"] if config is None else config,
+            devices=self.attributes["devices"] if devices is None else devices,
+        )
 
     def snapshot(
-        self, name: str, *, reuse: bool = False, stateful: bool = False
-    ) -> None:
+        self,
+        name: str,
+        *,
+        reuse: bool = False,
+        stateful: bool = False,
+        wait: bool = True,
+    ) -> Operation | None:
         validateObjectFormat(name)
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' snapshot create {'--reuse ' if reuse else ''}{'--stateful ' if stateful else ''}'{self.project.remote.name}':'{self.name}' {name}"
+        if not wait:
+            if reuse:
+                # Replacing an existing snapshot is done client side by the CLI.
+                return self._background(
+                    self.project,
+                    lambda: self.snapshot(name=name, reuse=reuse, stateful=stateful),
+                )
+
+            return self._submit(
+                self.project,
+                f"/1.0/instances/{self.name}/snapshots",
+                {"name": name, "stateful": stateful},
+                name=self.name,
+                verify=lambda: any(
+                    [
+                        s["name"] == name and bool(s.get("stateful")) == stateful
+                        for s in self.get(
+                            project=self.project, name=self.name, fresh=True
+                        ).attributes["snapshots"]
+                        or []
+                    ]
+                ),
+            )
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' snapshot create {'--reuse ' if reuse else ''}{'--stateful ' if stateful else ''}'{self.project.remote.name}':'{self.name}' {name}"
         )
 
         if result["error"]:
@@ -878,10 +1582,217 @@ class Instance:
             else:
                 raise InstanceException(result["data"])
 
+    def deleteSnapshot(self, name: str) -> None:
+        validateObjectFormat(name)
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' snapshot delete '{self.project.remote.name}':'{self.name}' '{name}'"
+        )
+
+        if result["error"]:
+            if (
+                REGEX_EMPTY_BODY.search(result["data"])
+                or "Operation not found" in result["data"]
+            ):
+                if name in [s["name"] for s in self.snapshots or []]:
+                    print('Command "snapshot delete" broke, retrying to delete...')
+                    self.deleteSnapshot(name=name)
+            else:
+                if "Instance not found" in result["data"]:
+                    raise InstanceNotFoundException()
+
+                raise InstanceException(result["data"])
+
+    @staticmethod
+    def _overrides(
+        *,
+        config: dict | None = None,
+        device: dict[str, dict] | None = None,
+        profile: str | None = None,
+        noProfile: bool = False,
+        network: str | None = None,
+        storage: str | None = None,
+    ) -> dict[str, Any] | None:
+        # The CLI merges device options into the devices of the profiles, the
+        # API only takes complete devices; None means only the CLI can do it.
+        if device and any(["type" not in values for values in device.values()]):
+            return None
+
+        devices = {n: dict(values) for n, values in (device or {}).items()}
+        if network:
+            devices.setdefault(
+                "eth0", {"type": "nic", "network": network, "name": "eth0"}
+            )
+        if storage:
+            devices.setdefault("root", {"type": "disk", "path": "/", "pool": storage})
+
+        overrides: dict[str, Any] = {
+            "config": {k: str(v) for k, v in (config or {}).items()},
+            "devices": devices,
+        }
+        if noProfile:
+            overrides["profiles"] = []
+        elif profile:
+            overrides["profiles"] = [profile]
+
+        return overrides
+
+    @staticmethod
+    def _background(project: Project, fn: Callable[[], Any]) -> Operation:
+        from pyincus.models.operations import Operation
+
+        return Operation.background(remote=project.remote, fn=fn, project=project)
+
+    @staticmethod
+    def _submit(
+        project: Project,
+        path: str,
+        data: dict[str, Any],
+        *,
+        method: str = "POST",
+        name: str | None = None,
+        resource: Any = None,
+        verify: Callable[[], bool] | None = None,
+    ) -> Operation:
+        from pyincus.models.operations import SUCCESS, Operation
+
+        client = project.remote.client
+
+        result = client.query(
+            f"{path}?project={project.name}",
+            remote=project.remote.name,
+            method=method,
+            data=data,
+        )
+
+        if result["error"]:
+            if 'This "instances" entry already exists' in result["data"]:
+                raise InstanceAlreadyExistsException(name=name)
+            if "Instance not found" in result["data"]:
+                raise InstanceNotFoundException(name=name)
+
+            raise InstanceException(result["data"])
+
+        operation = result["data"] if isinstance(result["data"], dict) else {}
+        if "id" not in operation:
+            # Answered synchronously, there is nothing left to wait for.
+            operation = {"status": "Success", "status_code": SUCCESS}
+
+        return Operation(
+            remote=project.remote,
+            project=project,
+            resource=resource,
+            verify=verify,
+            **operation,
+        )
+
+    @classmethod
+    def _create(
+        cls,
+        project: Project,
+        image: str,
+        name: str,
+        *,
+        start: bool,
+        projectSource: Project | None = None,
+        config: dict | None = None,
+        device: dict[str, dict] | None = None,
+        profile: str | None = None,
+        network: str | None = None,
+        storage: str | None = None,
+        empty: bool = False,
+        noProfile: bool = False,
+        vm: bool = False,
+    ) -> Operation:
+        overrides = cls._overrides(
+            config=config,
+            device=device,
+            profile=profile,
+            noProfile=noProfile,
+            network=network,
+            storage=storage,
+        )
+
+        if overrides is None:
+            return cls._background(
+                project,
+                lambda: (cls.launch if start else cls.init)(
+                    project,
+                    image,
+                    name,
+                    projectSource=projectSource,
+                    config=config,
+                    device=device,
+                    profile=profile,
+                    network=network,
+                    storage=storage,
+                    empty=empty,
+                    noProfile=noProfile,
+                    vm=vm,
+                ),
+            )
+
+        if empty:
+            source: dict[str, Any] = {"type": "none"}
+        else:
+            source = {
+                "type": "image",
+                "fingerprint" if REGEX_FINGERPRINT.match(image) else "alias": image,
+            }
+
+            if projectSource is not None:
+                if projectSource.remote.name != project.remote.name:
+                    source["server"] = projectSource.remote.addr
+                    source["protocol"] = projectSource.remote.protocol
+                else:
+                    source["project"] = projectSource.name
+
+        return cls._submit(
+            project,
+            "/1.0/instances",
+            {
+                "name": name,
+                "type": "virtual-machine" if vm else "container",
+                "source": source,
+                "start": start,
+                **overrides,
+            },
+            name=name,
+            resource=Instance(project=project, name=name),
+            verify=lambda: cls._verify(
+                project=project, name=name, status="Running" if start else None
+            ),
+        )
+
+    @classmethod
+    def _created(cls, project: Project, name: str, fetch: bool = False) -> Instance:
+        # Only fetched when asked or when a usage index has to learn about it.
+        if not fetch and not UsageIndex.watches(project):
+            return Instance(project=project, name=name)
+
+        instance = cls.get(project=project, name=name, fresh=True)
+        UsageIndex.notifySaved(instance)
+
+        return instance
+
+    @classmethod
+    def _verify(cls, project: Project, name: str, status: str | None = None) -> bool:
+        # For operations the server already forgot: the instance must be there,
+        # not broken, and in the state the operation was meant to leave it in.
+        instance = cls._fetch(project=project, name=name, fresh=True)
+        if instance is None:
+            return False
+
+        actual = instance.attributes.get("status", "")
+
+        return actual != "Error" and (status is None or actual == status)
+
     @staticmethod
     def validateImageName(image: str) -> None:
         if not REGEX_IMAGE_NAME.match(image):
             raise InvalidImageNameFormatException(image)
 
     def refresh(self) -> None:
-        self.__attributes = self.get(project=self.project, name=self.name).attributes
+        self.__attributes = self.get(
+            project=self.project, name=self.name, fresh=True
+        ).attributes
@@ -3,8 +3,6 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
-import yaml
-
 from pyincus.exceptions import (
     IncusException,
     InvalidDescriptionException,
@@ -15,15 +13,16 @@ from pyincus.exceptions import (
     NetworkInUseException,
     NetworkNotFoundException,
 )
-from pyincus.incus import Incus
-from pyincus.utils import (
-    REGEX_EMPTY_BODY,
-    validateObjectFormat,
-)
+from pyincus.models.forwards import NetworkForward
+from pyincus.profiler import phase
+from pyincus.usage import UsageIndex
+from pyincus.utils import REGEX_EMPTY_BODY, dumpYaml, loadYaml, validateObjectFormat
 
 if TYPE_CHECKING:
-    from pyincus.models.forwards import NetworkForward
+    from pyincus.client import IncusClient
+    from pyincus.models.operations import Operation
     from pyincus.models.projects import Project
+    from pyincus.models.remotes import Remote
 
 
 class Network:
@@ -122,6 +121,10 @@ class Network:
     def attributes(self, value: dict[str, Any]) -> None:
         self.__attributes = value
 
+    @property
+    def client(self) -> IncusClient:
+        return self.project.remote.client
+
     @property
     def config(self) -> dict[str, str]:
         return self.get(project=self.project, name=self.name).attributes["config"]
@@ -168,13 +171,17 @@ class Network:
     def _fetch(
         cls, project: Project, name: str, skipValidation=False, **kwargs
     ) -> Network | None:
+        client = project.remote.client
+
         if not skipValidation:
             validateObjectFormat(name)
 
-        result = Incus.run(
+        result = client.shared(
+            ("network", project.remote.name, project.name, "show", name),
+            client.run,
             cmd=(
                 cmd
-                := f"{Incus.binaryPath} --project='{project.name}' network show '{project.remote.name}':'{name}'"
+                := f"{client.binaryPath} --project='{project.name}' network show '{project.remote.name}':'{name}'"
             ),
             **kwargs,
         )
@@ -188,7 +195,7 @@ class Network:
             else:
                 return result["data"]
         else:
-            if "project" in (obj := yaml.safe_load(result["data"])):
+            if "project" in (obj := loadYaml(result["data"])):
                 del obj["project"]
 
             return cls(
@@ -201,8 +208,8 @@ class Network:
         return isinstance(cls._fetch(project=project, name=name, **kwargs), Network)
 
     @classmethod
-    def get(cls, project: Project, name: str) -> Network:
-        network = cls._fetch(project=project, name=name)
+    def get(cls, project: Project, name: str, *, fresh: bool = False) -> Network:
+        network = cls._fetch(project=project, name=name, fresh=fresh)
 
         if network is None:
             raise NetworkNotFoundException()
@@ -213,13 +220,20 @@ class Network:
     def list(
         cls, project: Project, filter: str = "", skipValidation=False, **kwargs
     ) -> list[Network]:
+        client = project.remote.client
+
         if not skipValidation:
             validateObjectFormat(filter)
 
         objs = []
-        cmd = f"{Incus.binaryPath} --project='{project.name}' network list '{project.remote.name}': -fyaml"
+        cmd = f"{client.binaryPath} --project='{project.name}' network list '{project.remote.name}': -fyaml"
 
-        result = Incus.run(cmd=cmd, **kwargs)
+        result = client.shared(
+            ("network", project.remote.name, project.name, "list", None),
+            client.run,
+            cmd=cmd,
+            **kwargs,
+        )
 
         if result["error"]:
             if REGEX_EMPTY_BODY.search(result["data"]):
@@ -233,7 +247,7 @@ class Network:
             else:
                 raise IncusException(result["data"])
 
-        results = yaml.safe_load(result["data"])
+        results = loadYaml(result["data"])
 
         # If it's a dictionary (e.g. for Remotes), change it to a list like the majority.
         # Example:
@@ -248,10 +262,55 @@ class Network:
 
             results = tmp
 
-        for obj in results:
-            if "project" in obj:
-                del obj["project"]
-            objs.append(cls(project=project, **obj))
+        with phase("construct"):
+            for obj in results:
+                if "project" in obj:
+                    del obj["project"]
+                objs.append(cls(project=project, **obj))
+
+        return objs
+
+    @classmethod
+    def listAllProjects(
+        cls, remote: Remote, filter: str = "", skipValidation=False, **kwargs
+    ) -> dict[str, list[Network]]:
+        from pyincus.models.projects import Project
+
+        client = remote.client
+
+        if not skipValidation:
+            validateObjectFormat(filter)
+
+        objs = {}
+        cmd = f"{client.binaryPath} network list '{remote.name}': --all-projects -fyaml"
+
+        result = client.shared(
+            ("network", remote.name, None, "list", None), client.run, cmd=cmd, **kwargs
+        )
+
+        if result["error"]:
+            if REGEX_EMPTY_BODY.search(result["data"]):
+                print(f'Retrying listing "{cmd}"...')
+                return cls.listAllProjects(
+                    remote=remote,
+                    filter=filter,
+                    skipValidation=skipValidation,
+                    **kwargs,
+                )
+            else:
+                raise IncusException(result["data"])
+
+        results = loadYaml(result["data"]) or []
+
+        with phase("construct"):
+            for obj in results:
+                if filter and filter not in obj.get("name", ""):
+                    continue
+
+                project = Project.reference(
+                    remote=remote, name=obj.pop("project", None) or "default"
+                )
+                objs.setdefault(project.name, []).append(cls(project=project, **obj))
 
         return objs
 
@@ -264,7 +323,10 @@ class Network:
         *,
         description: str | None = None,
         config: dict[str, str] | None = None,
-    ) -> Network:
+        wait: bool = True,
+    ) -> Network | Operation:
+        client = project.remote.client
+
         validateObjectFormat(name)
 
         if _type not in cls.possibleNetworkTypes:
@@ -290,8 +352,21 @@ class Network:
 
             configToString = " ".join([f"{k}={v}" for k, v in config.items()])
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{project.name}' network create '{project.remote.name}':'{name}' --type={_type} {configToString if configToString else ''}"
+        if not wait:
+            from pyincus.models.operations import Operation
+
+            # Networks are created synchronously by the server, so there is no
+            # server operation to follow.
+            return Operation.background(
+                remote=project.remote,
+                fn=lambda: cls.create(
+                    project, name, _type, description=description, config=config
+                ),
+                project=project,
+            )
+
+        result = client.run(
+            cmd=f"{client.binaryPath} --project='{project.name}' network create '{project.remote.name}':'{name}' --type={_type} {configToString if configToString else ''}"
         )
 
         if result["error"]:
@@ -302,6 +377,7 @@ class Network:
 
         network = cls(project=project, name=name)
 
+        # save() also adds the new network to the usage indexes.
         try:
             network.save(description=description)
         except NetworkException as error:
@@ -311,8 +387,8 @@ class Network:
         return network
 
     def delete(self) -> None:
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' network delete '{self.project.remote.name}':'{self.name}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' network delete '{self.project.remote.name}':'{self.name}'"
         )
 
         if result["error"]:
@@ -323,14 +399,18 @@ class Network:
 
             raise NetworkException(result["data"])
 
+        UsageIndex.notifyDeleted(self)
+
     def refresh(self) -> None:
-        self.__attributes = self.get(project=self.project, name=self.name).attributes
+        self.__attributes = self.get(
+            project=self.project, name=self.name, fresh=True
+        ).attributes
 
     def rename(self, name: str) -> None:
         validateObjectFormat(name)
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' network rename '{self.project.remote.name}':'{self.name}' '{name}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' network rename '{self.project.remote.name}':'{self.name}' '{name}'"
         )
 
         if result["error"]:
@@ -339,7 +419,13 @@ class Network:
             if "Cannot rename a Network that is in use" in result["data"]:
                 raise NetworkInUseException(name=name)
 
+            raise NetworkException(result["data"])
+
+        # Indexes key objects by name, move this one to its new name.
+        UsageIndex.notifyDeleted(self)
+        self.name = name
         self.attributes["name"] = name
+        UsageIndex.notifySaved(self)
 
     def save(
         self, *, description: str | None = None, config: dict[str, str] | None = None
@@ -376,9 +462,9 @@ class Network:
 
             self.attributes["config"] = config
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} --project='{self.project.name}' network edit '{self.project.remote.name}':'{self.name}'",
-            input=yaml.safe_dump(self.attributes),
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' network edit '{self.project.remote.name}':'{self.name}'",
+            input=dumpYaml(self.attributes),
         )
 
         if result["error"]:
@@ -386,4 +472,8 @@ class Network:
                 raise NetworkException("Error: yaml: unmarshal errors:")
             raise NetworkException(result["data"])
 
-        self.attributes = self.get(project=self.project, name=self.name).attributes
+        self.attributes = self.get(
+            project=self.project, name=self.name, fresh=True
+        ).attributes
+
+        UsageIndex.notifySaved(self)
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+from pyincus.exceptions import (
+    OperationCancelledException,
+    OperationException,
+    OperationFailedException,
+    OperationNotFoundException,
+    OperationTimeoutException,
+)
+from pyincus.profiler import carry
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    from pyincus.client import IncusClient
+    from pyincus.models.projects import Project
+    from pyincus.models.remotes import Remote
+
+# Status codes of the server operations, finished ones are 200 and above.
+SUCCESS = 200
+FAILURE = 400
+CANCELLED = 401
+
+_executor: ThreadPoolExecutor | None = None
+_executorLock = threading.Lock()
+
+
+def _background() -> ThreadPoolExecutor:
+    global _executor
+
+    with _executorLock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            _executor = ThreadPoolExecutor(
+                max_workers=16, thread_name_prefix="pyincus-operation"
+            )
+
+        return _executor
+
+
+class Operation:
+    def __init__(
+        self,
+        remote: Remote,
+        id: str | None = None,
+        *,
+        project: Project | None = None,
+        resource: Any = None,
+        verify: Callable[[], bool] | None = None,
+        future: Future | None = None,
+        **kwargs,
+    ) -> None:
+        self.remote = remote
+        self.id = id
+        self.project = project
+        self.__resource = resource
+        self.__verify = verify
+        self.__future = future
+        self.__error: Exception | None = None
+        self.__attributes = kwargs
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (id={self.id}, status={self.status})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        return self.__attributes
+
+    @property
+    def client(self) -> IncusClient:
+        return self.remote.client
+
+    @property
+    def description(self) -> str:
+        return self.__attributes.get("description", "")
+
+    @property
+    def status(self) -> str:
+        if self.__future is not None:
+            if self.__future.cancelled():
+                return "Cancelled"
+            if not self.__future.done():
+                return "Running" if self.__future.running() else "Pending"
+            return "Failure" if self.__future.exception() else "Success"
+
+        return self.__attributes.get("status", "")
+
+    @property
+    def statusCode(self) -> int:
+        if self.__future is not None:
+            return {
+                "Pending": 105,
+                "Running": 103,
+                "Success": SUCCESS,
+                "Failure": FAILURE,
+                "Cancelled": CANCELLED,
+            }[self.status]
+
+        return self.__attributes.get("status_code", 0)
+
+    @property
+    def done(self) -> bool:
+        return self.statusCode >= SUCCESS
+
+    @property
+    def err(self) -> str:
+        return self.__attributes.get("err", "")
+
+    @property
+    def error(self) -> Exception | None:
+        # What made the last wait() fail before the operation was done.
+        return self.__error
+
+    @property
+    def mayCancel(self) -> bool:
+        if self.__future is not None:
+            return not self.__future.running() and not self.__future.done()
+
+        return bool(self.__attributes.get("may_cancel"))
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        return self.__attributes.get("metadata") or {}
+
+    @property
+    def resources(self) -> dict[str, list[str]]:
+        return self.__attributes.get("resources") or {}
+
+    @property
+    def progress(self) -> dict[str, str]:
+        # The server reports progress as "<stage>_progress" metadata entries,
+        # e.g. {"create_instance_from_image_unpack_progress": "Unpack: 60%"}.
+        return {
+            k.removesuffix("_progress"): v
+            for k, v in self.metadata.items()
+            if k.endswith("_progress") and isinstance(v, str)
+        }
+
+    def _path(self, suffix: str = "") -> str:
+        path = f"/1.0/operations/{self.id}{suffix}"
+
+        return f"{path}?project={self.project.name}" if self.project else path
+
+    def _update(self, result: dict) -> None:
+        if result["error"]:
+            if "operation not found" in result["data"].lower():
+                # Finished operations are only kept by the server for a few
+                # seconds, after that their outcome can only be checked on the
+                # resource itself.
+                if self.__verify is not None and self.__verify():
+                    self.__attributes.update(status="Success", status_code=SUCCESS)
+                    return
+                self._fail("Operation not found")
+                raise OperationNotFoundException(self.id)
+
+            raise OperationException(result["data"])
+
+        self.__attributes = result["data"]
+
+    def _fail(self, err: str) -> None:
+        self.__attributes.update(
+            status="Failure", status_code=FAILURE, err=err.removeprefix("Error: ")
+        )
+
+    def refresh(self) -> None:
+        if self.__future is not None or self.done:
+            return
+
+        self._update(self.client.query(self._path(), remote=self.remote.name))
+
+    def _result(self) -> Any:
+        if self.statusCode == CANCELLED:
+            raise OperationCancelledException(self.id)
+        if self.statusCode >= FAILURE:
+            raise OperationFailedException(self.id, self.err)
+
+        return self.__resource
+
+    def wait(self, timeout: float | None = None) -> Any:
+        if self.__future is not None:
+            from concurrent.futures import CancelledError
+            from concurrent.futures import TimeoutError as FutureTimeoutError
+
+            try:
+                return self.__future.result(timeout=timeout)
+            except FutureTimeoutError:
+                raise OperationTimeoutException(self.id, timeout)
+            except CancelledError:
+                raise OperationCancelledException(self.id)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self.__error = None
+
+        try:
+            while not self.done:
+                remaining = -1 if deadline is None else deadline - time.monotonic()
+                if deadline is not None and remaining <= 0:
+                    raise OperationTimeoutException(self.id, timeout)
+
+                # The server holds the request until the operation is done or the
+                # timeout expires, so waiting costs one call, not a polling loop.
+                result = self.client.query(
+                    f"{self._path('/wait')}{'&' if self.project else '?'}timeout={-1 if remaining < 0 else max(1, int(remaining))}",
+                    remote=self.remote.name,
+                )
+
+                if (
+                    result["error"]
+                    and "operation not found" not in result["data"].lower()
+                ):
+                    if "deadline exceeded" in result["data"]:
+                        continue
+                    # A failed operation is answered with its error instead of itself.
+                    self._fail(result["data"])
+                    break
+
+                self._update(result)
+        except OperationTimeoutException:
+            raise
+        except Exception as error:
+            self.__error = error
+            raise
+
+        return self._result()
+
+    def cancel(self) -> None:
+        if self.__future is not None:
+            if not self.__future.cancel():
+                raise OperationException(
+                    "The operation already started and cannot be cancelled."
+                )
+            return
+
+        if self.done:
+            return
+
+        result = self.client.query(
+            self._path(), remote=self.remote.name, method="DELETE"
+        )
+
+        if result["error"]:
+            if "operation not found" in result["data"].lower():
+                raise OperationNotFoundException(self.id)
+
+            raise OperationException(result["data"])
+
+        self.__attributes.update(status="Cancelled", status_code=CANCELLED)
+
+    @classmethod
+    def background(
+        cls,
+        remote: Remote,
+        fn: Callable[[], Any],
+        *,
+        project: Project | None = None,
+        description: str = "",
+    ) -> Operation:
+        # For work the server does synchronously or the CLI does client side,
+        # there is no server operation to follow; it runs in a worker thread.
+        return cls(
+            remote=remote,
+            project=project,
+            future=_background().submit(carry(fn)),
+            description=description,
+        )
+
+    @classmethod
+    def get(cls, remote: Remote, id: str, project: Project | None = None) -> Operation:
+        operation = cls(remote=remote, id=id, project=project)
+        operation.refresh()
+
+        return operation
+
+    @classmethod
+    def list(cls, project: Project) -> list[Operation]:
+        client = project.remote.client
+
+        result = client.query(
+            f"/1.0/operations?recursion=1&project={project.name}",
+            remote=project.remote.name,
+        )
+
+        if result["error"]:
+            raise OperationException(result["data"])
+
+        return [
+            cls(remote=project.remote, project=project, **obj)
+            for objs in (result["data"] or {}).values()
+            for obj in objs
+        ]
+
+    @staticmethod
+    def asCompleted(
+        operations: Iterable[Operation],
+        timeout: float | None = None,
+        *,
+        maxWorkers: int = 16,
+    ) -> Iterator[Operation]:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+
+        operations = list(operations)
+        if not operations:
+            return
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def wait(operation: Operation) -> Operation:
+            # The outcome is kept on the operation, wait() on it again returns
+            # the result or raises without another call, and error holds what
+            # stopped the wait before the operation was done.
+            try:
+                operation.wait(
+                    None if deadline is None else max(0, deadline - time.monotonic())
+                )
+            except OperationTimeoutException:
+                raise
+            except Exception:
+                pass
+
+            return operation
+
+        # Every operation is waited on at once: the server forgets finished
+        # operations after a few seconds, so waiting on them in turn would
+        # lose the outcome of the fast ones.
+        executor = ThreadPoolExecutor(
+            max_workers=min(maxWorkers, len(operations)),
+            thread_name_prefix="pyincus-wait",
+        )
+        try:
+            futures = [
+                executor.submit(carry(wait), operation) for operation in operations
+            ]
+            try:
+                for future in as_completed(futures, timeout=timeout):
+                    yield future.result()
+            except FutureTimeoutError:
+                raise OperationTimeoutException(None, timeout)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def waitAll(
+        cls,
+        operations: Iterable[Operation],
+        timeout: float | None = None,
+        *,
+        maxWorkers: int = 16,
+        returnExceptions: bool = False,
+    ) -> list[Any]:
+        operations = list(operations)
+
+        for _ in cls.asCompleted(operations, timeout=timeout, maxWorkers=maxWorkers):
+            pass
+
+        results = []
+        for operation in operations:
+            try:
+                # Not done because waiting failed, waiting again would only
+                # report a timeout instead of the error.
+                if not operation.done and operation.error is not None:
+                    raise operation.error
+
+                results.append(operation.wait(0))
+            except Exception as error:
+                if not returnExceptions:
+                    raise
+                results.append(error)
+
+        return results
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from pyincus.exceptions import (
+    IncusException,
+    InvalidDescriptionException,
+    ProfileAlreadyExistsException,
+    ProfileException,
+    ProfileInUseException,
+    ProfileNotFoundException,
+)
+from pyincus.profiler import phase
+from pyincus.utils import REGEX_EMPTY_BODY, dumpYaml, loadYaml, validateObjectFormat
+
+if TYPE_CHECKING:
+    from pyincus.client import IncusClient
+    from pyincus.models.projects import Project
+
+
+class ProfileCache:
+    def __init__(self, ttl: float = 300) -> None:
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        self.__entries: dict[tuple[str, str], tuple[dict[str, Profile], float]] = {}
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (projects={len(self.__entries)}, ttl={self.ttl})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def profiles(self, project: Project, *, reload: bool = False) -> dict[str, Profile]:
+        key = (project.remote.name, project.name)
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+        if reload or entry is None or entry[1] < time.monotonic():
+            # Profile.list stores what it read.
+            Profile.list(project=project)
+
+            with self.__lock:
+                entry = self.__entries[key]
+
+        return entry[0]
+
+    def lookup(self, project: Project, name: str) -> Profile:
+        profile = self.profiles(project=project).get(name)
+
+        # Profiles created elsewhere since the last listing.
+        if profile is None:
+            profile = self.profiles(project=project, reload=True).get(name)
+
+        if profile is None:
+            raise ProfileNotFoundException(name=name)
+
+        return profile
+
+    def store(self, project: Project, profiles: list[Profile]) -> None:
+        with self.__lock:
+            self.__entries[(project.remote.name, project.name)] = (
+                {p.name: p for p in profiles},
+                time.monotonic() + self.ttl,
+            )
+
+    def set(self, profile: Profile) -> None:
+        with self.__lock:
+            entry = self.__entries.get(
+                (profile.project.remote.name, profile.project.name)
+            )
+
+            if entry is not None:
+                entry[0][profile.name] = profile
+
+    def discard(self, project: Project, name: str) -> None:
+        with self.__lock:
+            entry = self.__entries.get((project.remote.name, project.name))
+
+            if entry is not None:
+                entry[0].pop(name, None)
+
+    def invalidate(self, project: Project | None = None) -> None:
+        with self.__lock:
+            if project is None:
+                self.__entries.clear()
+            else:
+                self.__entries.pop((project.remote.name, project.name), None)
+
+
+class Profile:
+    def __init__(self, project: Project, name: str, **kwargs) -> None:
+        self.project = project
+        self.name = name
+        kwargs.pop("name", None)
+        self.__attributes = kwargs
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (name={self.name})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        return self.__attributes
+
+    @attributes.setter
+    def attributes(self, value: dict[str, Any]) -> None:
+        self.__attributes = value
+
+    @property
+    def client(self) -> IncusClient:
+        return self.project.remote.client
+
+    @property
+    def config(self) -> dict[str, str]:
+        return self.__attributes.get("config") or {}
+
+    @config.setter
+    def config(self, value: dict[str, str]) -> None:
+        self.save(config=value)
+
+    @property
+    def description(self) -> str:
+        return self.__attributes.get("description", "")
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self.save(description=value)
+
+    @property
+    def devices(self) -> dict[str, dict]:
+        return self.__attributes.get("devices") or {}
+
+    @devices.setter
+    def devices(self, value: dict[str, dict]) -> None:
+        self.save(devices=value)
+
+    @property
+    def usedBy(self) -> list[str]:
+        return self.__attributes.get("used_by") or []
+
+    @staticmethod
+    def cache(client: IncusClient) -> ProfileCache:
+        if "profiles" not in client.cache:
+            client.cache.setdefault("profiles", ProfileCache())
+
+        return client.cache["profiles"]
+
+    @staticmethod
+    def expand(
+        profiles: list[Profile],
+        config: dict[str, str] | None = None,
+        devices: dict[str, dict] | None = None,
+    ) -> tuple[dict[str, str], dict[str, dict]]:
+        # Same as the server: profiles apply in order, each one overriding the
+        # previous ones, then the instance's own config and devices on top.
+        # Devices are replaced as a whole, never merged key by key.
+        expandedConfig: dict[str, str] = {}
+        expandedDevices: dict[str, dict] = {}
+
+        for profile in profiles:
+            expandedConfig.update(profile.config)
+            expandedDevices.update(copy.deepcopy(profile.devices))
+
+        expandedConfig.update(config or {})
+        expandedDevices.update(copy.deepcopy(devices or {}))
+
+        return expandedConfig, expandedDevices
+
+    @classmethod
+    def _fetch(
+        cls, project: Project, name: str, skipValidation=False, **kwargs
+    ) -> Profile | None:
+        client = project.remote.client
+
+        if not skipValidation:
+            validateObjectFormat(name)
+
+        result = client.shared(
+            ("profile", project.remote.name, project.name, "show", name),
+            client.run,
+            cmd=(
+                cmd
+                := f"{client.binaryPath} --project='{project.name}' profile show '{project.remote.name}':'{name}'"
+            ),
+            **kwargs,
+        )
+
+        if result["error"]:
+            if REGEX_EMPTY_BODY.search(result["data"]):
+                print(f'Retrying fetching "{cmd}"...')
+                return cls._fetch(
+                    project=project, name=name, skipValidation=skipValidation, **kwargs
+                )
+            if "not found" in result["data"].lower():
+                return None
+
+            raise ProfileException(result["data"])
+
+        obj = loadYaml(result["data"]) or {}
+        obj.pop("project", None)
+        obj["name"] = name
+
+        profile = cls(project=project, **obj)
+        cls.cache(client).set(profile)
+
+        return profile
+
+    @classmethod
+    def exists(cls, project: Project, name: str, **kwargs) -> bool:
+        return isinstance(cls._fetch(project=project, name=name, **kwargs), Profile)
+
+    @classmethod
+    def get(
+        cls, project: Project, name: str, *, cached: bool = True, fresh: bool = False
+    ) -> Profile:
+        validateObjectFormat(name)
+
+        if cached and not fresh:
+            return cls.cache(project.remote.client).lookup(project=project, name=name)
+
+        profile = cls._fetch(
+            project=project, name=name, skipValidation=True, fresh=fresh
+        )
+
+        if profile is None:
+            raise ProfileNotFoundException(name=name)
+
+        return profile
+
+    @classmethod
+    def list(
+        cls, project: Project, filter: str = "", skipValidation=False, **kwargs
+    ) -> list[Profile]:
+        client = project.remote.client
+
+        if not skipValidation:
+            validateObjectFormat(filter)
+
+        cmd = f"{client.binaryPath} --project='{project.name}' profile list '{project.remote.name}': -fyaml"
+        result = client.shared(
+            ("profile", project.remote.name, project.name, "list", None),
+            client.run,
+            cmd=cmd,
+            **kwargs,
+        )
+
+        if result["error"]:
+            if REGEX_EMPTY_BODY.search(result["data"]):
+                print(f'Retrying listing "{cmd}"...')
+                return cls.list(
+                    project=project,
+                    filter=filter,
+                    skipValidation=skipValidation,
+                    **kwargs,
+                )
+            else:
+                raise IncusException(result["data"])
+
+        objs = []
+        results = loadYaml(result["data"]) or []
+
+        with phase("construct"):
+            for obj in results:
+                obj.pop("project", None)
+                objs.append(cls(project=project, **obj))
+
+        # Listings carry every profile in full, they refresh the cache for free.
+        cls.cache(client).store(project=project, profiles=objs)
+
+        if filter:
+            objs = [p for p in objs if filter in p.name]
+
+        return objs
+
+    @classmethod
+    def create(
+        cls,
+        project: Project,
+        name: str,
+        *,
+        description: str | None = None,
+        config: dict[str, str] | None = None,
+        devices: dict[str, dict] | None = None,
+    ) -> Profile:
+        client = project.remote.client
+
+        validateObjectFormat(name)
+
+        result = client.run(
+            cmd=f"{client.binaryPath} --project='{project.name}' profile create '{project.remote.name}':'{name}'"
+        )
+
+        if result["error"]:
+            if "already exists" in result["data"]:
+                raise ProfileAlreadyExistsException(name=name)
+
+            raise ProfileException(result["data"])
+
+        profile = cls(project=project, name=name, config={}, devices={})
+
+        try:
+            profile.save(description=description, config=config, devices=devices)
+        except ProfileException as error:
+            profile.delete()
+            raise error
+
+        return profile
+
+    def delete(self) -> None:
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' profile delete '{self.project.remote.name}':'{self.name}'"
+        )
+
+        if result["error"]:
+            if "not found" in result["data"].lower():
+                raise ProfileNotFoundException(name=self.name)
+            if "in use" in result["data"]:
+                raise ProfileInUseException(name=self.name)
+
+            raise ProfileException(result["data"])
+
+        self.cache(self.client).discard(project=self.project, name=self.name)
+
+    def refresh(self) -> None:
+        self.__attributes = self.get(
+            project=self.project, name=self.name, fresh=True
+        ).attributes
+
+    def rename(self, name: str) -> None:
+        validateObjectFormat(name)
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' profile rename '{self.project.remote.name}':'{self.name}' '{name}'"
+        )
+
+        if result["error"]:
+            if "already exists" in result["data"]:
+                raise ProfileAlreadyExistsException(name=name)
+
+            raise ProfileException(result["data"])
+
+        # Instances using it now list the new name, their cached copies are stale.
+        self.cache(self.client).invalidate(project=self.project)
+        self.name = name
+
+    def save(
+        self,
+        *,
+        description: str | None = None,
+        config: dict[str, str] | None = None,
+        devices: dict[str, dict] | None = None,
+    ) -> None:
+        self.refresh()
+
+        if description is not None:
+            if not isinstance(description, str):
+                raise InvalidDescriptionException()
+
+            self.attributes["description"] = description
+
+        if config is not None:
+            if not isinstance(config, dict):
+                raise ProfileException("config must be a dictionary.")
+
+            self.attributes["config"] = config
+
+        if devices is not None:
+            if not isinstance(devices, dict):
+                raise ProfileException("devices must be a dictionary.")
+
+            self.attributes["devices"] = devices
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' profile edit '{self.project.remote.name}':'{self.name}'",
+            input=dumpYaml(
+                {k: v for k, v in self.attributes.items() if k != "used_by"}
+            ),
+        )
+
+        if result["error"]:
+            if "Error: yaml: unmarshal errors:" in result["data"]:
+                raise ProfileException("Error: yaml: unmarshal errors:")
+            raise ProfileException(result["data"])
+
+        self.refresh()
@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import weakref
 from typing import TYPE_CHECKING, Any
 
-import yaml
-
 from pyincus.exceptions import (
     IncusException,
     ProjectAlreadyExistsException,
@@ -13,18 +12,23 @@ from pyincus.exceptions import (
     ProjectIsInUseException,
     ProjectNotFoundException,
 )
-from pyincus.incus import Incus
+from pyincus.inventory import Inventory
 from pyincus.models.acls import NetworkACL
 from pyincus.models.instances import Instance
 from pyincus.models.networks import Network
-from pyincus.utils import (
-    REGEX_EMPTY_BODY,
-    validateObjectFormat,
-)
+from pyincus.models.profiles import Profile
+from pyincus.models.storage import StoragePool
+from pyincus.usage import UsageIndex
+from pyincus.utils import REGEX_EMPTY_BODY, loadYaml, validateObjectFormat
 
 if TYPE_CHECKING:
+    from pyincus.client import IncusClient
     from pyincus.models.remotes import Remote
 
+_references: weakref.WeakKeyDictionary[Remote, dict[str, Project]] = (
+    weakref.WeakKeyDictionary()
+)
+
 
 class Project:
     def __init__(self, remote: Remote, name: str, **kwargs) -> None:
@@ -49,6 +53,10 @@ class Project:
     def attributes(self, value: dict[str, Any]) -> None:
         self.__attributes = value
 
+    @property
+    def client(self) -> IncusClient:
+        return self.remote.client
+
     @property
     def instances(self) -> list[Instance]:
         return Instance.list(project=self)
@@ -57,6 +65,14 @@ class Project:
     def networks(self) -> list[Network]:
         return Network.list(project=self)
 
+    @property
+    def profiles(self) -> list[Profile]:
+        return Profile.list(project=self)
+
+    @property
+    def storagePools(self) -> list[StoragePool]:
+        return StoragePool.list(project=self)
+
     @property
     def acls(self) -> list[NetworkACL]:
         return NetworkACL.list(project=self)
@@ -77,11 +93,15 @@ class Project:
     def _fetch(
         cls, remote: Remote, name: str, skipValidation=False, **kwargs
     ) -> Project | None:
+        client = remote.client
+
         if not skipValidation:
             validateObjectFormat(name)
 
-        result = Incus.run(
-            cmd=(cmd := f"{Incus.binaryPath} project show '{remote.name}':'{name}'"),
+        result = client.shared(
+            ("project", remote.name, None, "show", name),
+            client.run,
+            cmd=(cmd := f"{client.binaryPath} project show '{remote.name}':'{name}'"),
             **kwargs,
         )
 
@@ -96,7 +116,7 @@ class Project:
         else:
             return cls(
                 remote=remote,
-                **yaml.safe_load(result["data"]),
+                **loadYaml(result["data"]),
             )
 
     @classmethod
@@ -104,25 +124,38 @@ class Project:
         return isinstance(cls._fetch(remote=remote, name=name, **kwargs), Project)
 
     @classmethod
-    def get(cls, remote: Remote, name: str) -> Project:
-        project = cls._fetch(remote=remote, name=name)
+    def get(cls, remote: Remote, name: str, *, fresh: bool = False) -> Project:
+        project = cls._fetch(remote=remote, name=name, fresh=fresh)
 
         if project is None:
             raise ProjectNotFoundException()
 
         return project
 
+    @classmethod
+    def reference(cls, remote: Remote, name: str) -> Project:
+        projects = _references.setdefault(remote, {})
+
+        if name not in projects:
+            projects[name] = cls(remote=remote, name=name)
+
+        return projects[name]
+
     @classmethod
     def list(
         cls, remote: Remote, filter: str = "", skipValidation=False, **kwargs
     ) -> list[Project]:
+        client = remote.client
+
         if not skipValidation:
             validateObjectFormat(filter)
 
         objs = []
-        cmd = f"{Incus.binaryPath} project list -fyaml '{remote.name}':"
+        cmd = f"{client.binaryPath} project list -fyaml '{remote.name}':"
 
-        result = Incus.run(cmd=cmd, **kwargs)
+        result = client.shared(
+            ("project", remote.name, None, "list", None), client.run, cmd=cmd, **kwargs
+        )
 
         if result["error"]:
             if REGEX_EMPTY_BODY.search(result["data"]):
@@ -136,7 +169,7 @@ class Project:
             else:
                 raise IncusException(result["data"])
 
-        results = yaml.safe_load(result["data"])
+        results = loadYaml(result["data"])
 
         # If it's a dictionary (e.g. for Remotes), change it to a list like the majority.
         # Example:
@@ -156,14 +189,22 @@ class Project:
 
         return objs
 
+    def inventory(self, *, maxWorkers: int = 4) -> Inventory:
+        return Inventory.fetch(project=self, maxWorkers=maxWorkers)
+
+    def usage(self, inventory: Inventory | None = None) -> UsageIndex:
+        return UsageIndex(project=self, inventory=inventory)
+
     def refresh(self) -> None:
-        self.__attributes = self.get(remote=self.remote, name=self.name).attributes
+        self.__attributes = self.get(
+            remote=self.remote, name=self.name, fresh=True
+        ).attributes
 
     def rename(self, name: str) -> None:
         validateObjectFormat(name)
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} project rename '{self.remote.name}':'{self.name}' '{name}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} project rename '{self.remote.name}':'{self.name}' '{name}'"
         )
 
         if result["error"]:
@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-from typing import Any
-
-import yaml
+import os
+import threading
+from typing import TYPE_CHECKING, Any
 
 from pyincus.exceptions import (
     IncusException,
@@ -13,16 +13,23 @@ from pyincus.exceptions import (
     RemoteNotFoundException,
 )
 from pyincus.incus import Incus
-from pyincus.models.projects import Project
-from pyincus.utils import (
-    REGEX_EMPTY_BODY,
-    validateObjectFormat,
-)
+from pyincus.utils import REGEX_EMPTY_BODY, loadYaml, validateObjectFormat
+
+if TYPE_CHECKING:
+    from pyincus.client import IncusClient
+    from pyincus.models.projects import Project
+
+# Remotes that the client always provides, whatever the configuration file says.
+STATIC_REMOTES = {"local": {"addr": "unix://", "public": False}}
+
+_configCache: dict[str, tuple[tuple[int, int], dict[str, dict]]] = {}
+_configLock = threading.Lock()
 
 
 class Remote:
-    def __init__(self, name: str, **kwargs) -> None:
+    def __init__(self, name: str, client: IncusClient | None = None, **kwargs) -> None:
         self.name = name
+        self.__client = client
         if kwargs:
             if "name" in kwargs:
                 del kwargs["name"]
@@ -42,45 +49,125 @@ class Remote:
     def attributes(self, value: dict[str, Any]) -> None:
         self.__attributes = value
 
+    @property
+    def client(self) -> IncusClient:
+        return self.__client or Incus.client
+
     @property
     def projects(self) -> list[Project]:
+        from pyincus.models.projects import Project
+
         return Project.list(remote=self)
-    
+
     @property
     def addr(self) -> str:
-        return self.get(name=self.name).attributes["addr"]
+        return self.get(name=self.name, client=self.client).attributes["addr"]
 
     @property
     def authType(self) -> str:
-        return self.get(name=self.name).attributes["authType"]
+        return self.get(name=self.name, client=self.client).attributes["authType"]
 
     @property
     def protocol(self) -> str:
-        return self.get(name=self.name).attributes["protocol"]
+        return self.get(name=self.name, client=self.client).attributes["protocol"]
 
     @property
     def public(self) -> bool:
-        return self.get(name=self.name).attributes["public"]
+        return self.get(name=self.name, client=self.client).attributes["public"]
+
+    @staticmethod
+    def configPath(client: IncusClient | None = None) -> str:
+        configDir = None
+        if client is not None:
+            configDir = client.configDir or (client.env or {}).get("INCUS_CONF")
+
+        if configDir:
+            return os.path.join(configDir, "config.yml")
+
+        if os.environ.get("INCUS_CONF"):
+            return os.path.join(os.environ["INCUS_CONF"], "config.yml")
+
+        configHome = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+            os.path.expanduser("~"), ".config"
+        )
+
+        return os.path.join(configHome, "incus", "config.yml")
+
+    @staticmethod
+    def _normalize(obj: dict[str, Any]) -> dict[str, Any]:
+        obj = dict(obj)
+
+        if "auth_type" in obj:
+            obj["authType"] = obj.pop("auth_type")
+
+        obj.setdefault("protocol", "incus")
+        obj.setdefault("public", False)
+
+        if not obj.get("authType"):
+            if obj.get("addr", "").startswith("unix:"):
+                obj["authType"] = "file access"
+            elif obj["protocol"] != "incus":
+                obj["authType"] = "none"
+            else:
+                obj["authType"] = "tls"
+
+        return obj
 
     @classmethod
-    def _fetch(cls, name: str) -> Remote | None:
-        r = None
+    def _loadConfig(cls, client: IncusClient | None = None) -> dict[str, dict] | None:
+        path = cls.configPath(client=client)
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        # The cache is keyed on the file itself, so any change made by the
+        # client (remote add, rename, remove) is picked up on the next lookup.
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        with _configLock:
+            cached = _configCache.get(path)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+            try:
+                with open(path) as f:
+                    config = loadYaml(f) or {}
+            except OSError:
+                return None
+
+            remotes = dict(config.get("remotes") or {})
+            remotes.update(STATIC_REMOTES)
 
-        remotes = cls.list()
-        for remote in remotes:
+            remotes = {name: cls._normalize(obj or {}) for name, obj in remotes.items()}
+            _configCache[path] = (key, remotes)
+
+            return remotes
+
+    @classmethod
+    def _fetch(cls, name: str, client: IncusClient | None = None) -> Remote | None:
+        remotes = cls._loadConfig(client=client)
+
+        if remotes is not None:
+            if name not in remotes:
+                return None
+
+            return cls(name=name, client=client, **remotes[name])
+
+        for remote in cls.list(client=client):
             if name == remote.name:
-                r = remote
-                break
+                return remote
 
-        return r
+        return None
 
     @classmethod
-    def exists(cls, name: str, **kwargs) -> bool:
-        return isinstance(cls._fetch(name=name, **kwargs), Remote)
+    def exists(cls, name: str, client: IncusClient | None = None, **kwargs) -> bool:
+        return isinstance(cls._fetch(name=name, client=client, **kwargs), Remote)
 
     @classmethod
-    def get(cls, name: str) -> Remote:
-        remote = cls._fetch(name=name)
+    def get(cls, name: str, client: IncusClient | None = None) -> Remote:
+        remote = cls._fetch(name=name, client=client)
 
         if remote is None or not isinstance(remote, Remote):
             raise RemoteNotFoundException()
@@ -88,20 +175,29 @@ class Remote:
         return remote
 
     @classmethod
-    def list(cls, **kwargs) -> list[Remote]:
+    def list(cls, client: IncusClient | None = None, **kwargs) -> list[Remote]:
+        remotes = cls._loadConfig(client=client)
+
+        if remotes is not None:
+            return [
+                cls(name=name, client=client, **obj)
+                for name, obj in sorted(remotes.items())
+            ]
+
         objs = []
-        cmd = f"{Incus.binaryPath} remote list -fyaml"
+        runner = client or Incus.client
+        cmd = f"{runner.binaryPath} remote list -fyaml"
 
-        result = Incus.run(cmd=cmd, **kwargs)
+        result = runner.run(cmd=cmd, **kwargs)
 
         if result["error"]:
             if REGEX_EMPTY_BODY.search(result["data"]):
                 print(f'Retrying listing "{cmd}"...')
-                return cls.list(**kwargs)
+                return cls.list(client=client, **kwargs)
             else:
                 raise IncusException(result["data"])
 
-        results = yaml.safe_load(result["data"])
+        results = loadYaml(result["data"])
 
         # If it's a dictionary (e.g. for Remotes), change it to a list like the majority.
         # Example:
@@ -117,18 +213,18 @@ class Remote:
             results = tmp
 
         for obj in results:
-            objs.append(cls(**obj))
+            objs.append(cls(client=client, **cls._normalize(obj)))
 
         return objs
 
     def refresh(self) -> None:
-        self.__attributes = self.get(name=self.name).attributes
+        self.__attributes = self.get(name=self.name, client=self.client).attributes
 
     def rename(self, name: str) -> None:
         validateObjectFormat(name)
 
-        result = Incus.run(
-            cmd=f"{Incus.binaryPath} remote rename '{self.name}' '{name}'"
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} remote rename '{self.name}' '{name}'"
         )
 
         if result["error"]:
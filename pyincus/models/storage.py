@@ -0,0 +1,702 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import shlex
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterable
+
+from pyincus.exceptions import (
+    IncusException,
+    InstanceNotFoundException,
+    InvalidDescriptionException,
+    StorageException,
+    StoragePoolAlreadyExistsException,
+    StoragePoolInUseException,
+    StoragePoolNotFoundException,
+    StorageVolumeAlreadyExistsException,
+    StorageVolumeInUseException,
+    StorageVolumeNotFoundException,
+)
+from pyincus.utils import REGEX_EMPTY_BODY, dumpYaml, loadYaml, validateObjectFormat
+
+if TYPE_CHECKING:
+    from pyincus.backup import Throttle
+    from pyincus.batch import BatchResult
+    from pyincus.client import IncusClient
+    from pyincus.models.instances import Instance
+    from pyincus.models.projects import Project
+
+
+class StoragePool:
+    def __init__(self, project: Project, name: str, **kwargs) -> None:
+        self.project = project
+        self.name = name
+        kwargs.pop("name", None)
+        self.__attributes = kwargs
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (name={self.name})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        return self.__attributes
+
+    @attributes.setter
+    def attributes(self, value: dict[str, Any]) -> None:
+        self.__attributes = value
+
+    @property
+    def client(self) -> IncusClient:
+        return self.project.remote.client
+
+    @property
+    def config(self) -> dict[str, str]:
+        return self.__attributes.get("config") or {}
+
+    @config.setter
+    def config(self, value: dict[str, str]) -> None:
+        self.save(config=value)
+
+    @property
+    def description(self) -> str:
+        return self.__attributes.get("description", "")
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self.save(description=value)
+
+    @property
+    def driver(self) -> str:
+        return self.__attributes.get("driver", "")
+
+    @property
+    def status(self) -> str:
+        return self.__attributes.get("status", "")
+
+    @property
+    def locations(self) -> list[str]:
+        return self.__attributes.get("locations") or []
+
+    @property
+    def usedBy(self) -> list[str]:
+        return self.__attributes.get("used_by") or []
+
+    @property
+    def volumes(self) -> list[StorageVolume]:
+        return StorageVolume.list(pool=self)
+
+    @classmethod
+    def _fetch(
+        cls, project: Project, name: str, skipValidation=False, **kwargs
+    ) -> StoragePool | None:
+        client = project.remote.client
+
+        if not skipValidation:
+            validateObjectFormat(name)
+
+        result = client.shared(
+            ("storage", project.remote.name, "show", name),
+            client.run,
+            cmd=(
+                cmd
+                := f"{client.binaryPath} storage show '{project.remote.name}':'{name}'"
+            ),
+            **kwargs,
+        )
+
+        if result["error"]:
+            if REGEX_EMPTY_BODY.search(result["data"]):
+                print(f'Retrying fetching "{cmd}"...')
+                return cls._fetch(
+                    project=project, name=name, skipValidation=skipValidation, **kwargs
+                )
+            if "not found" in result["data"].lower():
+                return None
+
+            raise StorageException(result["data"])
+
+        obj = loadYaml(result["data"]) or {}
+        obj["name"] = name
+
+        return cls(project=project, **obj)
+
+    @classmethod
+    def exists(cls, project: Project, name: str, **kwargs) -> bool:
+        return isinstance(cls._fetch(project=project, name=name, **kwargs), StoragePool)
+
+    @classmethod
+    def get(cls, project: Project, name: str, *, fresh: bool = False) -> StoragePool:
+        pool = cls._fetch(project=project, name=name, fresh=fresh)
+
+        if pool is None:
+            raise StoragePoolNotFoundException(name=name)
+
+        return pool
+
+    @classmethod
+    def list(
+        cls, project: Project, filter: str = "", skipValidation=False, **kwargs
+    ) -> list[StoragePool]:
+        client = project.remote.client
+
+        if not skipValidation:
+            validateObjectFormat(filter)
+
+        cmd = f"{client.binaryPath} storage list '{project.remote.name}': -fyaml"
+        result = client.shared(
+            ("storage", project.remote.name, "list", None),
+            client.run,
+            cmd=cmd,
+            **kwargs,
+        )
+
+        if result["error"]:
+            if REGEX_EMPTY_BODY.search(result["data"]):
+                print(f'Retrying listing "{cmd}"...')
+                return cls.list(
+                    project=project,
+                    filter=filter,
+                    skipValidation=skipValidation,
+                    **kwargs,
+                )
+            else:
+                raise IncusException(result["data"])
+
+        return [
+            cls(project=project, **obj)
+            for obj in loadYaml(result["data"]) or []
+            if not filter or filter in obj["name"]
+        ]
+
+    @classmethod
+    def create(
+        cls,
+        project: Project,
+        name: str,
+        driver: str,
+        *,
+        description: str | None = None,
+        config: dict[str, str] | None = None,
+    ) -> StoragePool:
+        client = project.remote.client
+
+        validateObjectFormat(name, driver)
+
+        configToString = " ".join([f"'{k}={v}'" for k, v in (config or {}).items()])
+
+        result = client.run(
+            cmd=f"{client.binaryPath} storage create '{project.remote.name}':'{name}' '{driver}' {configToString}"
+        )
+
+        if result["error"]:
+            if "already exists" in result["data"]:
+                raise StoragePoolAlreadyExistsException(name=name)
+
+            raise StorageException(result["data"])
+
+        pool = cls.get(project=project, name=name, fresh=True)
+
+        if description is not None:
+            pool.save(description=description)
+
+        return pool
+
+    def delete(self) -> None:
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} storage delete '{self.project.remote.name}':'{self.name}'"
+        )
+
+        if result["error"]:
+            if "not found" in result["data"].lower():
+                raise StoragePoolNotFoundException(name=self.name)
+            if "in use" in result["data"]:
+                raise StoragePoolInUseException(name=self.name)
+
+            raise StorageException(result["data"])
+
+    def refresh(self) -> None:
+        self.__attributes = self.get(
+            project=self.project, name=self.name, fresh=True
+        ).attributes
+
+    def save(
+        self, *, description: str | None = None, config: dict[str, str] | None = None
+    ) -> None:
+        self.refresh()
+
+        if description is not None:
+            if not isinstance(description, str):
+                raise InvalidDescriptionException()
+
+            self.attributes["description"] = description
+
+        if config is not None:
+            if not isinstance(config, dict):
+                raise StorageException("config must be a dictionary.")
+
+            self.attributes["config"] = config
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} storage edit '{self.project.remote.name}':'{self.name}'",
+            input=dumpYaml(
+                {
+                    "config": self.config,
+                    "description": self.description,
+                }
+            ),
+        )
+
+        if result["error"]:
+            if "Error: yaml: unmarshal errors:" in result["data"]:
+                raise StorageException("Error: yaml: unmarshal errors:")
+            raise StorageException(result["data"])
+
+        self.refresh()
+
+
+class StorageVolume:
+    possibleContentTypes: list[str] = ["filesystem", "block"]
+
+    def __init__(
+        self, pool: StoragePool, name: str, type: str = "custom", **kwargs
+    ) -> None:
+        self.pool = pool
+        self.name = name
+        self.type = type
+        kwargs.pop("name", None)
+        kwargs.pop("project", None)
+        self.__attributes = kwargs
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__} (name={self.pool.name}/{self.type}/{self.name})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        return self.__attributes
+
+    @attributes.setter
+    def attributes(self, value: dict[str, Any]) -> None:
+        self.__attributes = value
+
+    @property
+    def project(self) -> Project:
+        return self.pool.project
+
+    @property
+    def client(self) -> IncusClient:
+        return self.pool.client
+
+    @property
+    def config(self) -> dict[str, str]:
+        return self.__attributes.get("config") or {}
+
+    @config.setter
+    def config(self, value: dict[str, str]) -> None:
+        self.save(config=value)
+
+    @property
+    def contentType(self) -> str:
+        return self.__attributes.get("content_type", "")
+
+    @property
+    def description(self) -> str:
+        return self.__attributes.get("description", "")
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self.save(description=value)
+
+    @property
+    def location(self) -> str:
+        return self.__attributes.get("location", "")
+
+    @property
+    def usedBy(self) -> list[str]:
+        return self.__attributes.get("used_by") or []
+
+    @property
+    def snapshots(self) -> list[dict[str, Any]]:
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' storage volume snapshot list {self._target()} -fyaml"
+        )
+
+        if result["error"]:
+            self._raise(result["data"])
+
+        return loadYaml(result["data"]) or []
+
+    def _target(self) -> str:
+        return (
+            f"'{self.project.remote.name}':'{self.pool.name}' '{self.type}/{self.name}'"
+        )
+
+    def _raise(self, error: str) -> None:
+        if "not found" in error.lower():
+            if "Instance not found" in error:
+                raise InstanceNotFoundException()
+
+            raise StorageVolumeNotFoundException(name=self.name)
+        if "already exists" in error:
+            raise StorageVolumeAlreadyExistsException(name=self.name)
+        if "in use" in error:
+            raise StorageVolumeInUseException(name=self.name)
+
+        raise StorageException(error)
+
+    @classmethod
+    def _fetch(
+        cls, pool: StoragePool, name: str, skipValidation=False, **kwargs
+    ) -> StorageVolume | None:
+        client = pool.client
+        project = pool.project
+
+        if not skipValidation:
+            validateObjectFormat(name)
+
+        result = client.shared(
+            ("volume", project.remote.name, project.name, pool.name, "show", name),
+            client.run,
+            cmd=(
+                cmd
+                := f"{client.binaryPath} --project='{project.name}' storage volume show '{project.remote.name}':'{pool.name}' 'custom/{name}'"
+            ),
+            **kwargs,
+        )
+
+        if result["error"]:
+            if REGEX_EMPTY_BODY.search(result["data"]):
+                print(f'Retrying fetching "{cmd}"...')
+                return cls._fetch(
+                    pool=pool, name=name, skipValidation=skipValidation, **kwargs
+                )
+            if "not found" in result["data"].lower():
+                return None
+
+            raise StorageException(result["data"])
+
+        obj = loadYaml(result["data"]) or {}
+        obj["name"] = name
+
+        return cls(pool=pool, **obj)
+
+    @classmethod
+    def exists(cls, pool: StoragePool, name: str, **kwargs) -> bool:
+        return isinstance(cls._fetch(pool=pool, name=name, **kwargs), StorageVolume)
+
+    @classmethod
+    def get(cls, pool: StoragePool, name: str, *, fresh: bool = False) -> StorageVolume:
+        volume = cls._fetch(pool=pool, name=name, fresh=fresh)
+
+        if volume is None:
+            raise StorageVolumeNotFoundException(name=name)
+
+        return volume
+
+    @classmethod
+    def list(
+        cls,
+        pool: StoragePool,
+        filter: str = "",
+        skipValidation=False,
+        *,
+        type: str | None = "custom",
+        **kwargs,
+    ) -> list[StorageVolume]:
+        client = pool.client
+        project = pool.project
+
+        if not skipValidation:
+            validateObjectFormat(filter)
+
+        cmd = f"{client.binaryPath} --project='{project.name}' storage volume list '{project.remote.name}':'{pool.name}' -fyaml"
+        result = client.shared(
+            ("volume", project.remote.name, project.name, pool.name, "list", None),
+            client.run,
+            cmd=cmd,
+            **kwargs,
+        )
+
+        if result["error"]:
+            if REGEX_EMPTY_BODY.search(result["data"]):
+                print(f'Retrying listing "{cmd}"...')
+                return cls.list(
+                    pool=pool,
+                    filter=filter,
+                    skipValidation=skipValidation,
+                    type=type,
+                    **kwargs,
+                )
+            else:
+                raise IncusException(result["data"])
+
+        # Listings also carry the volumes of instances and images, which are
+        # managed through them; only custom volumes are returned by default.
+        return [
+            cls(pool=pool, **obj)
+            for obj in loadYaml(result["data"]) or []
+            if (type is None or obj.get("type") == type)
+            and (not filter or filter in obj["name"])
+        ]
+
+    @classmethod
+    def create(
+        cls,
+        pool: StoragePool,
+        name: str,
+        *,
+        contentType: str = "filesystem",
+        description: str | None = None,
+        config: dict[str, str] | None = None,
+    ) -> StorageVolume:
+        client = pool.client
+        project = pool.project
+
+        validateObjectFormat(name)
+
+        if contentType not in cls.possibleContentTypes:
+            raise StorageException(
+                f'Unknown content type "{contentType}", expected one of {", ".join(cls.possibleContentTypes)}.'
+            )
+
+        configToString = " ".join([f"'{k}={v}'" for k, v in (config or {}).items()])
+
+        result = client.run(
+            cmd=f"{client.binaryPath} --project='{project.name}' storage volume create '{project.remote.name}':'{pool.name}' '{name}' {configToString} --type={contentType}"
+        )
+
+        if result["error"]:
+            if "already exists" in result["data"]:
+                raise StorageVolumeAlreadyExistsException(name=name)
+
+            raise StorageException(result["data"])
+
+        volume = cls.get(pool=pool, name=name, fresh=True)
+
+        if description is not None:
+            volume.save(description=description)
+
+        return volume
+
+    def delete(self) -> None:
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' storage volume delete {self._target()}"
+        )
+
+        if result["error"]:
+            self._raise(result["data"])
+
+    def refresh(self) -> None:
+        self.__attributes = self.get(
+            pool=self.pool, name=self.name, fresh=True
+        ).attributes
+
+    def save(
+        self, *, description: str | None = None, config: dict[str, str] | None = None
+    ) -> None:
+        self.refresh()
+
+        if description is not None:
+            if not isinstance(description, str):
+                raise InvalidDescriptionException()
+
+            self.attributes["description"] = description
+
+        if config is not None:
+            if not isinstance(config, dict):
+                raise StorageException("config must be a dictionary.")
+
+            self.attributes["config"] = config
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' storage volume edit {self._target()}",
+            input=dumpYaml({"config": self.config, "description": self.description}),
+        )
+
+        if result["error"]:
+            if "Error: yaml: unmarshal errors:" in result["data"]:
+                raise StorageException("Error: yaml: unmarshal errors:")
+            self._raise(result["data"])
+
+        self.refresh()
+
+    def snapshot(self, name: str, *, reuse: bool = False) -> None:
+        validateObjectFormat(name)
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' storage volume snapshot create {self._target()} '{name}'{' --reuse' if reuse else ''}"
+        )
+
+        if result["error"]:
+            self._raise(result["data"])
+
+    def deleteSnapshot(self, name: str) -> None:
+        validateObjectFormat(name)
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' storage volume snapshot delete {self._target()} '{name}'"
+        )
+
+        if result["error"]:
+            self._raise(result["data"])
+
+    def copy(
+        self,
+        name: str,
+        *,
+        pool: StoragePool | None = None,
+        snapshotName: str | None = None,
+        volumeOnly: bool = False,
+        refresh: bool = False,
+    ) -> StorageVolume:
+        validateObjectFormat(name, snapshotName)
+
+        if pool is None:
+            pool = self.pool
+
+        source = (
+            f"{self.pool.name}/{self.name}{f'/{snapshotName}' if snapshotName else ''}"
+        )
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' storage volume copy '{self.project.remote.name}':'{source}' '{pool.project.remote.name}':'{pool.name}/{name}' --target-project='{pool.project.name}' {'--volume-only ' if volumeOnly else ''}{'--refresh ' if refresh else ''}"
+        )
+
+        if result["error"]:
+            if "already exists" in result["data"]:
+                raise StorageVolumeAlreadyExistsException(name=name)
+
+            self._raise(result["data"])
+
+        return StorageVolume(pool=pool, name=name)
+
+    def attach(
+        self,
+        instance: Instance | str,
+        *,
+        path: str | None = None,
+        device: str | None = None,
+    ) -> None:
+        name = instance if isinstance(instance, str) else instance.name
+
+        validateObjectFormat(name, device)
+
+        # Filesystem volumes need a mount path, block ones are exposed as disks.
+        mount = shlex.quote(path) if path else ""
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' storage volume attach '{self.project.remote.name}':'{self.pool.name}' '{self.name}' '{name}' '{device or self.name}' {mount}"
+        )
+
+        if result["error"]:
+            self._raise(result["data"])
+
+    def detach(self, instance: Instance | str, *, device: str | None = None) -> None:
+        name = instance if isinstance(instance, str) else instance.name
+
+        validateObjectFormat(name, device)
+
+        result = self.client.run(
+            cmd=f"{self.client.binaryPath} --project='{self.project.name}' storage volume detach '{self.project.remote.name}':'{self.pool.name}' '{self.name}' '{name}' {device or ''}"
+        )
+
+        if result["error"]:
+            self._raise(result["data"])
+
+    def attachMany(
+        self,
+        instances: Iterable[Instance | str],
+        *,
+        path: str | None = None,
+        device: str | None = None,
+        maxWorkers: int = 8,
+    ) -> BatchResult:
+        from pyincus.batch import attachMany
+
+        return attachMany(
+            volume=self,
+            instances=[i if isinstance(i, str) else i.name for i in instances],
+            path=path,
+            device=device,
+            maxWorkers=maxWorkers,
+        )
+
+    def export(
+        self,
+        target: str | BinaryIO,
+        *,
+        compression: str | None = None,
+        optimizedStorage: bool = False,
+        volumeOnly: bool = False,
+        throttle: Throttle | None = None,
+    ) -> None:
+        from pyincus.backup import validateCompression
+
+        if compression is not None:
+            validateCompression(compression)
+
+        options = f"{f'--compression={compression} ' if compression else ''}{'--optimized-storage ' if optimizedStorage else ''}{'--volume-only ' if volumeOnly else ''}--quiet"
+        cmd = f"{self.client.binaryPath} --project='{self.project.name}' storage volume export '{self.project.remote.name}':'{self.pool.name}' '{self.name}'"
+
+        # Same as instances: a path is written by the CLI, a file object or a
+        # throttle go through a pipe one chunk at a time.
+        if isinstance(target, str) and throttle is None:
+            result = self.client.run(cmd=f"{cmd} {shlex.quote(target)} {options}")
+        elif isinstance(target, str):
+            with open(target, "wb") as sink:
+                result = self.client.stream(
+                    cmd=f"{cmd} - {options}", sink=sink, throttle=throttle
+                )
+        else:
+            result = self.client.stream(
+                cmd=f"{cmd} - {options}", sink=target, throttle=throttle
+            )
+
+        if result["error"]:
+            if isinstance(target, str) and os.path.exists(target):
+                os.remove(target)
+
+            self._raise(result["data"])
+
+    @classmethod
+    def import_(
+        cls,
+        pool: StoragePool,
+        source: str | BinaryIO,
+        name: str,
+        *,
+        throttle: Throttle | None = None,
+    ) -> StorageVolume:
+        client = pool.client
+        project = pool.project
+
+        validateObjectFormat(name)
+
+        cmd = f"{client.binaryPath} --project='{project.name}' storage volume import '{project.remote.name}':'{pool.name}' {{}} '{name}' --type=backup --quiet"
+
+        if isinstance(source, str) and throttle is None:
+            result = client.run(cmd=cmd.format(shlex.quote(source)))
+        elif isinstance(source, str):
+            with open(source, "rb") as reader:
+                result = client.stream(
+                    cmd=cmd.format("-"), source=reader, throttle=throttle
+                )
+        else:
+            result = client.stream(
+                cmd=cmd.format("-"), source=source, throttle=throttle
+            )
+
+        if result["error"]:
+            if "already exists" in result["data"]:
+                raise StorageVolumeAlreadyExistsException(name=name)
+
+            raise StorageException(result["data"])
+
+        return cls(pool=pool, name=name)
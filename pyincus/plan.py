@@ -0,0 +1,681 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from pyincus.exceptions import (
+    IncusException,
+    InvalidACLRulesException,
+    NetworkException,
+)
+from pyincus.models.acls import NetworkACL
+from pyincus.models.forwards import NetworkForward
+from pyincus.models.instances import Instance
+from pyincus.models.networks import Network
+from pyincus.scheduler import SUCCEEDED, Scheduler
+from pyincus.utils import loadYaml, validateObjectFormat
+
+if TYPE_CHECKING:
+    from pyincus.models.projects import Project
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+ACTION_SYMBOLS = {CREATE: "+", UPDATE: "~", DELETE: "-"}
+
+# Creates and updates run in this order, deletes in the reverse one.
+KIND_ORDER = ["acl", "network", "forward", "instance"]
+
+
+def _configValue(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+
+    return str(value)
+
+
+def _cleanRules(rules: list | None) -> list[dict]:
+    return [{k: v for k, v in r.items() if v not in (None, "")} for r in rules or []]
+
+
+def _portKey(port: dict) -> tuple[str, str, str, str]:
+    return (
+        str(port.get("protocol") or ""),
+        str(port.get("listen_port") or ""),
+        str(port.get("target_address") or ""),
+        str(port.get("target_port") or ""),
+    )
+
+
+class Change:
+    def __init__(
+        self,
+        action: str,
+        kind: str,
+        name: str,
+        *,
+        parent: str | None = None,
+        fields: dict[str, tuple[Any, Any]] | None = None,
+        desired: dict | None = None,
+        current: Any = None,
+    ) -> None:
+        self.action = action
+        self.kind = kind
+        self.name = name
+        self.parent = parent
+        self.fields = fields or {}
+        self.desired = desired or {}
+        self.current = current
+
+    def __str__(self) -> str:
+        name = f"{self.parent}/{self.name}" if self.parent else self.name
+        lines = [f"{ACTION_SYMBOLS[self.action]} {self.kind} {name}"]
+
+        for field, (old, new) in self.fields.items():
+            lines.append(f"    {field}: {old!r} -> {new!r}")
+
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__} (action={self.action}, kind={self.kind}, name={self.name})"
+
+
+class Plan:
+    def __init__(self, project: Project, changes: list[Change]) -> None:
+        self.project = project
+        self.changes = changes
+
+    def __str__(self) -> str:
+        if not self.changes:
+            return "No changes."
+
+        counts = {action: 0 for action in ACTION_SYMBOLS}
+        for change in self.changes:
+            counts[change.action] += 1
+
+        return "\n".join(
+            [str(change) for change in self.changes]
+            + [
+                f"Plan: {counts[CREATE]} to create, {counts[UPDATE]} to update, {counts[DELETE]} to delete."
+            ]
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__} (project={self.project.name}, changes={len(self.changes)})"
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    @property
+    def empty(self) -> bool:
+        return not self.changes
+
+    @classmethod
+    def fromDocument(
+        cls, project: Project, document: dict | str, *, prune: bool = False
+    ) -> Plan:
+        if isinstance(document, str):
+            document = loadYaml(document) or {}
+
+        if not isinstance(document, dict):
+            raise IncusException("The desired state must be a dictionary.")
+
+        acls = document.get("acls") or {}
+        networks = document.get("networks") or {}
+        instances = document.get("instances") or {}
+
+        validateObjectFormat(*acls.keys(), *networks.keys(), *instances.keys())
+
+        currentACLs = (
+            {a.name: a for a in NetworkACL.list(project=project)}
+            if "acls" in document
+            else {}
+        )
+        currentNetworks = (
+            {n.name: n for n in Network.list(project=project)}
+            if "networks" in document
+            else {}
+        )
+        currentInstances = (
+            {i.name: i for i in Instance.list(project=project)}
+            if "instances" in document
+            else {}
+        )
+        currentForwards = {
+            name: {
+                f.name: f for f in NetworkForward.list(network=currentNetworks[name])
+            }
+            for name, desired in networks.items()
+            if name in currentNetworks and "forwards" in (desired or {})
+        }
+
+        changes = []
+
+        for name, desired in acls.items():
+            changes.extend(cls._diffACL(name, desired or {}, currentACLs.get(name)))
+
+        for name, desired in networks.items():
+            changes.extend(
+                cls._diffNetwork(
+                    name,
+                    desired or {},
+                    currentNetworks.get(name),
+                    currentForwards.get(name, {}),
+                    prune=prune,
+                )
+            )
+
+        for name, desired in instances.items():
+            changes.extend(
+                cls._diffInstance(name, desired or {}, currentInstances.get(name))
+            )
+
+        if prune:
+            for kind, current, desired in [
+                ("acl", currentACLs, acls),
+                ("network", currentNetworks, networks),
+                ("instance", currentInstances, instances),
+            ]:
+                for name in sorted(set(current) - set(desired)):
+                    changes.append(Change(DELETE, kind, name, current=current[name]))
+
+        creates = [c for c in changes if c.action != DELETE]
+        deletes = [c for c in changes if c.action == DELETE]
+        creates.sort(key=lambda c: KIND_ORDER.index(c.kind))
+        deletes.sort(key=lambda c: KIND_ORDER.index(c.kind), reverse=True)
+
+        return cls(project=project, changes=creates + deletes)
+
+    @staticmethod
+    def _diffACL(name: str, desired: dict, current: NetworkACL | None) -> list[Change]:
+        rules = {}
+        for k in ("egress", "ingress"):
+            if k in desired:
+                try:
+                    rules[k] = NetworkACL.validateGress(gress=desired[k] or [])
+                except InvalidACLRulesException as error:
+                    raise InvalidACLRulesException(
+                        errors=[(f"{name}.{k}[{i}]", e) for i, e in error.errors]
+                    )
+
+        if current is None:
+            return [Change(CREATE, "acl", name, desired={**desired, **rules})]
+
+        fields = {}
+        attributes = current.attributes
+
+        if "description" in desired and desired["description"] != attributes.get(
+            "description"
+        ):
+            fields["description"] = (
+                attributes.get("description"),
+                desired["description"],
+            )
+
+        for k, value in rules.items():
+            if _cleanRules(value) != _cleanRules(attributes.get(k)):
+                fields[k] = (attributes.get(k), value)
+
+        if not fields:
+            return []
+
+        return [
+            Change(UPDATE, "acl", name, fields=fields, desired=desired, current=current)
+        ]
+
+    @staticmethod
+    def _diffNetwork(
+        name: str,
+        desired: dict,
+        current: Network | None,
+        currentForwards: dict[str, NetworkForward],
+        *,
+        prune: bool,
+    ) -> list[Change]:
+        changes = []
+        config = {k: _configValue(v) for k, v in (desired.get("config") or {}).items()}
+
+        if current is None:
+            changes.append(
+                Change(CREATE, "network", name, desired={**desired, "config": config})
+            )
+        else:
+            attributes = current.attributes
+            fields = {}
+
+            if "type" in desired and desired["type"] != attributes.get("type"):
+                raise NetworkException(
+                    f'Network "{name}" type cannot be changed from "{attributes.get("type")}" to "{desired["type"]}".'
+                )
+
+            if "description" in desired and desired["description"] != attributes.get(
+                "description"
+            ):
+                fields["description"] = (
+                    attributes.get("description"),
+                    desired["description"],
+                )
+
+            currentConfig = attributes.get("config") or {}
+            for k, v in config.items():
+                if currentConfig.get(k) != v:
+                    fields[f"config.{k}"] = (currentConfig.get(k), v)
+
+            if fields:
+                changes.append(
+                    Change(
+                        UPDATE,
+                        "network",
+                        name,
+                        fields=fields,
+                        desired={**desired, "config": config},
+                        current=current,
+                    )
+                )
+
+        forwards = desired.get("forwards") or {}
+
+        for address, forward in forwards.items():
+            changes.extend(
+                Plan._diffForward(
+                    name, address, forward or {}, currentForwards.get(address)
+                )
+            )
+
+        if prune and "forwards" in desired:
+            for address in sorted(set(currentForwards) - set(forwards)):
+                changes.append(
+                    Change(
+                        DELETE,
+                        "forward",
+                        address,
+                        parent=name,
+                        current=currentForwards[address],
+                    )
+                )
+
+        return changes
+
+    @staticmethod
+    def _diffForward(
+        network: str, address: str, desired: dict, current: NetworkForward | None
+    ) -> list[Change]:
+        ports = {_portKey(p): p for p in desired.get("ports") or []}
+
+        if current is None:
+            return [
+                Change(
+                    CREATE,
+                    "forward",
+                    address,
+                    parent=network,
+                    fields={"ports": (None, sorted(ports))} if ports else {},
+                    desired=desired,
+                )
+            ]
+
+        attributes = current.attributes
+        fields = {}
+
+        if "description" in desired and desired["description"] != attributes.get(
+            "description"
+        ):
+            fields["description"] = (
+                attributes.get("description"),
+                desired["description"],
+            )
+
+        if "ports" in desired:
+            currentPorts = {_portKey(p) for p in attributes.get("ports") or []}
+            if currentPorts != set(ports):
+                fields["ports"] = (sorted(currentPorts), sorted(ports))
+
+        if not fields:
+            return []
+
+        return [
+            Change(
+                UPDATE,
+                "forward",
+                address,
+                parent=network,
+                fields=fields,
+                desired=desired,
+                current=current,
+            )
+        ]
+
+    @staticmethod
+    def _diffInstance(
+        name: str, desired: dict, current: Instance | None
+    ) -> list[Change]:
+        config = {k: _configValue(v) for k, v in (desired.get("config") or {}).items()}
+        devices = {
+            n: {k: _configValue(v) for k, v in (d or {}).items()}
+            for n, d in (desired.get("devices") or {}).items()
+        }
+
+        if current is None:
+            if not desired.get("image"):
+                raise IncusException(
+                    f'Instance "{name}" does not exist and has no image to be created from.'
+                )
+
+            return [
+                Change(
+                    CREATE,
+                    "instance",
+                    name,
+                    desired={**desired, "config": config, "devices": devices},
+                )
+            ]
+
+        attributes = current.attributes
+        fields = {}
+
+        if "description" in desired and desired["description"] != attributes.get(
+            "description"
+        ):
+            fields["description"] = (
+                attributes.get("description"),
+                desired["description"],
+            )
+
+        currentConfig = attributes.get("config") or {}
+        for k, v in config.items():
+            if currentConfig.get(k) != v:
+                fields[f"config.{k}"] = (currentConfig.get(k), v)
+
+        currentDevices = attributes.get("devices") or {}
+        for n, device in devices.items():
+            if currentDevices.get(n) != device:
+                fields[f"devices.{n}"] = (currentDevices.get(n), device)
+
+        if "profiles" in desired and list(desired["profiles"] or []) != list(
+            attributes.get("profiles") or []
+        ):
+            fields["profiles"] = (attributes.get("profiles"), desired["profiles"])
+
+        if not fields:
+            return []
+
+        return [
+            Change(
+                UPDATE,
+                "instance",
+                name,
+                fields=fields,
+                desired={**desired, "config": config, "devices": devices},
+                current=current,
+            )
+        ]
+
+    def apply(self, maxWorkers: int = 1) -> list[Change]:
+        applied = []
+        changes = self.changes
+
+        if maxWorkers > 1:
+            scheduler = Scheduler(maxWorkers=maxWorkers)
+
+            for change in [c for c in changes if c.action != DELETE]:
+                scheduler.add(
+                    self._key(change),
+                    self._applyChange,
+                    change,
+                    requires=self._requirements(change),
+                )
+
+            tasks = scheduler.run()
+            applied = [t.args[0] for t in tasks.values() if t.status == SUCCEEDED]
+
+            if scheduler.failed:
+                raise IncusException(
+                    f"{len(scheduler.failed)} change(s) failed and {len(scheduler.cancelled)} were cancelled: "
+                    + "; ".join([f"{t.key}: {t.error}" for t in scheduler.failed])
+                ) from scheduler.failed[0].error
+
+            changes = [c for c in changes if c.action == DELETE]
+
+        for change in changes:
+            self._applyChange(change)
+            applied.append(change)
+
+        return applied
+
+    @staticmethod
+    def _key(change: Change) -> tuple:
+        if change.parent:
+            return (change.kind, change.parent, change.name)
+
+        return (change.kind, change.name)
+
+    @staticmethod
+    def _requirements(change: Change) -> set[tuple]:
+        desired = change.desired
+        requires = set()
+
+        if change.kind == "network":
+            for acl in (
+                (desired.get("config") or {}).get("security.acls", "").split(",")
+            ):
+                if acl.strip():
+                    requires.add(("acl", acl.strip()))
+        elif change.kind == "forward":
+            requires.add(("network", change.parent))
+        elif change.kind == "instance":
+            for device in (desired.get("devices") or {}).values():
+                if device.get("network"):
+                    requires.add(("network", device["network"]))
+
+                for acl in device.get("security.acls", "").split(","):
+                    if acl.strip():
+                        requires.add(("acl", acl.strip()))
+
+        return requires
+
+    def _applyChange(self, change: Change) -> None:
+        getattr(self, f"_{change.action}{change.kind.capitalize()}")(change)
+
+    def _network(self, name: str) -> Network:
+        return Network(project=self.project, name=name)
+
+    def _createAcl(self, change: Change) -> None:
+        NetworkACL.create(
+            project=self.project,
+            name=change.name,
+            description=change.desired.get("description"),
+            egress=change.desired.get("egress"),
+            ingress=change.desired.get("ingress"),
+        )
+
+    def _updateAcl(self, change: Change) -> None:
+        change.current.save(
+            description=change.desired.get("description")
+            if "description" in change.fields
+            else None,
+            egress=change.desired.get("egress") if "egress" in change.fields else None,
+            ingress=change.desired.get("ingress")
+            if "ingress" in change.fields
+            else None,
+        )
+
+    def _deleteAcl(self, change: Change) -> None:
+        change.current.delete()
+
+    def _createNetwork(self, change: Change) -> None:
+        Network.create(
+            project=self.project,
+            name=change.name,
+            _type=change.desired.get("type", "bridge"),
+            description=change.desired.get("description"),
+            config=change.desired.get("config") or None,
+        )
+
+    def _updateNetwork(self, change: Change) -> None:
+        config = {
+            k: v
+            for k, v in (change.current.attributes.get("config") or {}).items()
+            if not k.startswith("volatile")
+        }
+        config.update(change.desired.get("config") or {})
+
+        change.current.save(
+            description=change.desired.get("description")
+            if "description" in change.fields
+            else None,
+            config=config
+            if any([f.startswith("config.") for f in change.fields])
+            else None,
+        )
+
+    def _deleteNetwork(self, change: Change) -> None:
+        change.current.delete()
+
+    def _syncPorts(self, forward: NetworkForward, change: Change) -> None:
+        old, new = change.fields.get("ports", (None, None))
+        if new is None:
+            return
+
+        for protocol, listenPort, _, _ in sorted(set(old or []) - set(new)):
+            forward.removePort(protocol=protocol, listenPorts=listenPort)
+
+        for protocol, listenPort, targetAddress, targetPort in sorted(
+            set(new) - set(old or [])
+        ):
+            forward.addPort(
+                protocol=protocol,
+                listenPorts=listenPort,
+                targetAddress=targetAddress,
+                targetPorts=targetPort or None,
+            )
+
+    def _createForward(self, change: Change) -> None:
+        forward = NetworkForward.create(
+            network=self._network(change.parent),
+            listenAddress=change.name,
+            description=change.desired.get("description"),
+        )
+        self._syncPorts(forward, change)
+
+    def _updateForward(self, change: Change) -> None:
+        if "description" in change.fields:
+            change.current.save(description=change.desired["description"])
+
+        self._syncPorts(change.current, change)
+
+    def _deleteForward(self, change: Change) -> None:
+        change.current.delete()
+
+    def _instanceDevices(
+        self, name: str, devices: dict[str, dict], profiles: list[str] | None
+    ) -> dict[str, dict]:
+        from pyincus.models.profiles import Profile
+
+        if all(["type" in device for device in devices.values()]):
+            return devices
+
+        # The API only takes complete devices, options for a device of the
+        # profiles are merged into it the way the CLI does.
+        _, inherited = Profile.expand(
+            [
+                Profile.get(project=self.project, name=p)
+                for p in (["default"] if profiles is None else profiles)
+            ]
+        )
+
+        complete = {}
+        for n, device in devices.items():
+            if "type" not in device:
+                if n not in inherited:
+                    raise IncusException(
+                        f'Device "{n}" of instance "{name}" has no type and is not defined by its profiles.'
+                    )
+                device = {**inherited[n], **device}
+
+            complete[n] = device
+
+        return complete
+
+    def _createInstance(self, change: Change) -> None:
+        from pyincus.models.projects import Project
+        from pyincus.models.remotes import Remote
+
+        desired = change.desired
+        source, _, image = desired["image"].rpartition(":")
+        profiles = desired.get("profiles")
+
+        # Created through the API: "-d" of the CLI only overrides devices that
+        # come from a profile, new ones have to be in the request body.
+        instance = Instance.launch(
+            project=self.project,
+            image=image,
+            name=change.name,
+            projectSource=Project(
+                remote=Remote(name=source, client=self.project.remote.client),
+                name="default",
+            )
+            if source
+            else None,
+            config=desired.get("config") or None,
+            device=self._instanceDevices(
+                change.name, desired.get("devices") or {}, profiles
+            )
+            or None,
+            profile=profiles[0] if profiles else None,
+            noProfile=profiles == [],
+            vm=desired.get("type") == "virtual-machine",
+            wait=False,
+        ).wait()
+
+        if desired.get("description") is not None or (profiles and len(profiles) > 1):
+            instance.save(
+                description=desired.get("description"),
+                profiles=profiles if profiles and len(profiles) > 1 else None,
+            )
+
+    def _updateInstance(self, change: Change) -> None:
+        desired = change.desired
+        instance = change.current
+        instance.refresh()
+        attributes = instance.attributes
+
+        # Edited as a whole: save() only changes keys the instance already has,
+        # while reconciling mostly adds new ones.
+        attributes["config"] = {
+            **(attributes.get("config") or {}),
+            **{
+                k: v
+                for k, v in desired["config"].items()
+                if f"config.{k}" in change.fields
+            },
+        }
+        if "profiles" in change.fields:
+            attributes["profiles"] = desired.get("profiles") or []
+
+        attributes["devices"] = {
+            **(attributes.get("devices") or {}),
+            **self._instanceDevices(
+                change.name,
+                {
+                    n: d
+                    for n, d in desired["devices"].items()
+                    if f"devices.{n}" in change.fields
+                },
+                attributes.get("profiles") or [],
+            ),
+        }
+        if "description" in change.fields:
+            attributes["description"] = desired.get("description")
+
+        instance.edit()
+
+    def _deleteInstance(self, change: Change) -> None:
+        change.current.delete()
+
+
+def plan(project: Project, document: dict | str, *, prune: bool = False) -> Plan:
+    return Plan.fromDocument(project=project, document=document, prune=prune)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import math
+import os
+import sys
+import threading
+import time
+from typing import IO, Any, Callable
+
+from pyincus.exceptions import IncusException
+
+# Where the time of a pyincus call goes: starting the CLI process, waiting for
+# the CLI and the server to answer, parsing the answer, building the objects.
+PHASES = ("spawn", "server", "parse", "construct")
+
+_PACKAGE = os.path.dirname(os.path.abspath(__file__))
+_STDLIB = os.path.dirname(os.path.abspath(contextlib.__file__))
+_NULL = contextlib.nullcontext()
+
+_active: list[Profiler] = []
+_activeLock = threading.Lock()
+
+# The user code that handed work to a pool, for the calls made from the pool.
+_site: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "pyincus_site", default=None
+)
+
+
+def _isStdlib(filename: str) -> bool:
+    return filename.startswith(_STDLIB) and "site-packages" not in filename
+
+
+def _caller(frame: Any) -> tuple[str, str]:
+    # The method is the outermost pyincus frame called from outside, the call
+    # site is the first frame of user code above it, skipping the thread pools.
+    method = None
+    while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE):
+        if frame.f_code is not _carried.__code__:
+            method = frame
+        frame = frame.f_back
+
+    while frame is not None and _isStdlib(frame.f_code.co_filename):
+        frame = frame.f_back
+
+    name = "?"
+    if method is not None:
+        name = getattr(method.f_code, "co_qualname", method.f_code.co_name)
+
+    if frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(os.getcwd()):
+            filename = os.path.relpath(filename)
+        site = f"{filename}:{frame.f_lineno}"
+    elif (site := _site.get()) is None:
+        # Work handed to a pool without carry() is named after its thread.
+        thread = threading.current_thread().name
+        label, _, worker = thread.rpartition("_")
+        site = f"<{label if worker.isdigit() else thread}>"
+
+    return name, site
+
+
+def carry(fn: Callable) -> Callable:
+    # Costs a list check when no profiler runs.
+    if not _active:
+        return fn
+
+    # Work handed to a pool, e.g. by launchMany, keeps the call site of the
+    # user code that called the batch.
+    context = contextvars.copy_context()
+    if context.get(_site) is None:
+        context.run(_site.set, _caller(sys._getframe(1))[1])
+
+    return functools.partial(_carried, context, fn)
+
+
+def _carried(context: contextvars.Context, fn: Callable, *args, **kwargs) -> Any:
+    # A context can't be entered by two threads at once, one copy per call.
+    return context.copy().run(fn, *args, **kwargs)
+
+
+class _Phase:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *args) -> None:
+        duration = time.perf_counter() - self.start
+        method, site = _caller(sys._getframe(1))
+
+        for profiler in list(_active):
+            profiler.add(method, site, self.name, duration)
+
+
+def phase(name: str) -> contextlib.AbstractContextManager:
+    # Costs a list check when no profiler runs.
+    if not _active:
+        return _NULL
+
+    return _Phase(name)
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+
+    # Nearest rank, values must be sorted.
+    return values[max(0, min(len(values), math.ceil(p / 100 * len(values))) - 1)]
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__samples: dict[tuple[str, str, str], list[float]] = {}
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (samples={sum([len(s) for s in self.__samples.values()])}, active={self.active})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __enter__(self) -> Profiler:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def active(self) -> bool:
+        return self in _active
+
+    def start(self) -> None:
+        with _activeLock:
+            if self not in _active:
+                _active.append(self)
+
+    def stop(self) -> None:
+        with _activeLock:
+            if self in _active:
+                _active.remove(self)
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__samples = {}
+
+    def add(self, method: str, site: str, phase: str, duration: float) -> None:
+        with self.__lock:
+            self.__samples.setdefault((method, site, phase), []).append(duration)
+
+    def report(self, by: str = "method") -> list[dict[str, Any]]:
+        if by not in ("method", "site"):
+            raise IncusException('Reports are grouped by "method" or "site".')
+
+        with self.__lock:
+            samples = {k: list(v) for k, v in self.__samples.items()}
+
+        groups: dict[tuple[str, str], list[float]] = {}
+        for (method, site, phase), durations in samples.items():
+            groups.setdefault((method if by == "method" else site, phase), []).extend(
+                durations
+            )
+
+        rows = []
+        for (name, phase), durations in groups.items():
+            durations.sort()
+            rows.append(
+                {
+                    by: name,
+                    "phase": phase,
+                    "count": len(durations),
+                    "total": sum(durations),
+                    "p50": percentile(durations, 50),
+                    "p95": percentile(durations, 95),
+                    "p99": percentile(durations, 99),
+                }
+            )
+
+        return sorted(rows, key=lambda r: r["total"], reverse=True)
+
+    def format(self, by: str = "method", limit: int | None = None) -> str:
+        rows = self.report(by=by)[:limit]
+        width = max([len(by), *[len(r[by]) for r in rows]])
+
+        lines = [
+            f"{by:<{width}}  {'phase':<9} {'count':>7} {'total':>10} {'p50':>10} {'p95':>10} {'p99':>10}"
+        ]
+        for r in rows:
+            lines.append(
+                f"{r[by]:<{width}}  {r['phase']:<9} {r['count']:>7} "
+                + " ".join(
+                    [f"{r[k] * 1000:>8.2f}ms" for k in ("total", "p50", "p95", "p99")]
+                )
+            )
+
+        return "\n".join(lines)
+
+    def print(
+        self, by: str = "method", limit: int | None = None, file: IO | None = None
+    ) -> None:
+        print(self.format(by=by, limit=limit), file=file or sys.stderr)
+
+    def dump(self, target: str = "-") -> None:
+        report = f"{self.format(by='method')}\n\n{self.format(by='site')}\n"
+
+        if target == "-":
+            sys.stderr.write(report)
+        else:
+            with open(target, "w") as writer:
+                writer.write(report)
+
+
+def _fromEnvironment() -> Profiler | None:
+    # PYINCUS_PROFILE=1 prints the report on exit, any other value is the path
+    # of a file to write it to.
+    target = os.environ.get("PYINCUS_PROFILE", "")
+
+    if target.lower() in ("", "0", "false", "no", "off"):
+        return None
+
+    import atexit
+
+    profiler = Profiler()
+    profiler.start()
+    atexit.register(
+        profiler.dump, "-" if target.lower() in ("1", "true", "yes", "on") else target
+    )
+
+    return profiler
+
+
+# The profiler started by PYINCUS_PROFILE, if any.
+default = _fromEnvironment()
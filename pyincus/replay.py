@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import IO, Any
+
+from pyincus.client import SubprocessTransport, toResult
+from pyincus.exceptions import ReplayException, ReplayMissException
+from pyincus.profiler import phase
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    # Recordings compress well, a ".gz" suffix is enough to get it.
+    if path.endswith(".gz"):
+        import gzip
+
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+
+    return open(path, mode, encoding="utf-8")
+
+
+def argv(cmd: str) -> list[str]:
+    import shlex
+
+    # Keyed without the binary path, so a recording replays on another machine.
+    words = shlex.split(cmd)
+    if words:
+        words[0] = os.path.basename(words[0])
+
+    return words
+
+
+class RecordingTransport:
+    def __init__(
+        self, path: str, transport: Any = None, *, append: bool = False
+    ) -> None:
+        self.path = path
+        self.transport = SubprocessTransport() if transport is None else transport
+        self.__lock = threading.Lock()
+        self.__file = _open(path, "a" if append else "w")
+        self.__count = 0
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (path={self.path}, records={self.__count})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __enter__(self) -> RecordingTransport:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def run(self, cmd: str, **kwargs) -> dict:
+        start = time.perf_counter()
+
+        # The full outcome when the transport gives it, else what run() keeps.
+        if hasattr(self.transport, "execute"):
+            returncode, stdout, stderr = self.transport.execute(cmd, **kwargs)
+        else:
+            result = self.transport.run(cmd, **kwargs)
+            returncode = int(result["error"])
+            stdout, stderr = (
+                ("", result["data"]) if result["error"] else (result["data"], "")
+            )
+
+        latency = time.perf_counter() - start
+
+        line = json.dumps(
+            {
+                "argv": argv(cmd),
+                "stdin": kwargs.get("input"),
+                "rc": returncode,
+                "out": stdout,
+                "err": stderr,
+                "t": round(latency, 6),
+                "at": round(time.time(), 6),
+            },
+            separators=(",", ":"),
+        )
+
+        with self.__lock:
+            if self.__file.closed:
+                raise ReplayException(f'Recording "{self.path}" is closed.')
+
+            self.__file.write(line + "\n")
+            self.__file.flush()
+            self.__count += 1
+
+        return toResult(returncode, stdout, stderr)
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__file.close()
+
+
+class ReplayTransport:
+    def __init__(
+        self, path: str, *, latencyScale: float = 1.0, strict: bool = True
+    ) -> None:
+        if latencyScale < 0:
+            raise ReplayException("The latency scale can't be negative.")
+
+        self.path = path
+        self.latencyScale = latencyScale
+        self.strict = strict
+        self.__lock = threading.Lock()
+        self.__responses: dict[tuple[str, ...], list[dict]] = {}
+        self.__served: dict[tuple[str, ...], int] = {}
+        self.misses: list[str] = []
+
+        with _open(path, "r") as reader:
+            for line in reader:
+                if not line.strip():
+                    continue
+
+                record = json.loads(line)
+                self.__responses.setdefault(self._key(record), []).append(record)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (path={self.path}, commands={len(self.__responses)}, latencyScale={self.latencyScale})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return sum([len(r) for r in self.__responses.values()])
+
+    @staticmethod
+    def _key(record: dict) -> tuple[str, ...]:
+        return (*record["argv"], "\0", record.get("stdin") or "")
+
+    def execute(self, cmd: str, **kwargs) -> tuple[int, str, str]:
+        key = self._key({"argv": argv(cmd), "stdin": kwargs.get("input")})
+
+        with self.__lock:
+            responses = self.__responses.get(key)
+
+            if not responses:
+                self.misses.append(cmd)
+                record = None
+            else:
+                # The same command is answered in the order it was recorded, the
+                # last answer repeats for polling loops that run longer.
+                served = self.__served.get(key, 0)
+                record = responses[min(served, len(responses) - 1)]
+                self.__served[key] = served + 1
+
+        if record is None:
+            if self.strict:
+                raise ReplayMissException(cmd)
+
+            return 1, "", f"Error: No recorded response for {cmd}"
+
+        if self.latencyScale and record.get("t"):
+            with phase("server"):
+                time.sleep(record["t"] * self.latencyScale)
+
+        return record["rc"], record.get("out") or "", record.get("err") or ""
+
+    def run(self, cmd: str, **kwargs) -> dict:
+        return toResult(*self.execute(cmd, **kwargs))
+
+    def rewind(self) -> None:
+        with self.__lock:
+            self.__served = {}
+            self.misses = []
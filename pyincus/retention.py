@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from pyincus.batch import BatchResult
+from pyincus.exceptions import InstanceException
+from pyincus.profiler import carry
+from pyincus.table import fetchRecords
+from pyincus.utils import parseTimestamp
+
+if TYPE_CHECKING:
+    from pyincus.models.projects import Project
+
+# How a snapshot date is bucketed by each periodic rule, in UTC.
+_BUCKETS: dict[str, Callable[[time.struct_time], tuple]] = {
+    "keepHourly": lambda t: (t.tm_year, t.tm_yday, t.tm_hour),
+    "keepDaily": lambda t: (t.tm_year, t.tm_yday),
+    "keepWeekly": lambda t: _isoWeek(t),
+    "keepMonthly": lambda t: (t.tm_year, t.tm_mon),
+}
+
+
+def _isoWeek(t: time.struct_time) -> tuple[int, int]:
+    import datetime
+
+    return datetime.date(t.tm_year, t.tm_mon, t.tm_mday).isocalendar()[:2]
+
+
+class Snapshot:
+    __slots__ = ("instance", "name", "createdAt", "size", "stateful")
+
+    def __init__(
+        self,
+        instance: str,
+        name: str,
+        createdAt: float,
+        size: int = 0,
+        stateful: bool = False,
+    ) -> None:
+        self.instance = instance
+        self.name = name
+        self.createdAt = createdAt
+        self.size = size
+        self.stateful = stateful
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (name={self.instance}/{self.name})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @classmethod
+    def fromRecord(cls, instance: str, record: dict[str, Any]) -> Snapshot:
+        return cls(
+            instance=instance,
+            # Listings name snapshots "<instance>/<snapshot>" or just "<snapshot>".
+            name=record["name"].rpartition("/")[2],
+            createdAt=parseTimestamp(record.get("created_at")),
+            # Sizes are -1 when the storage driver can't tell.
+            size=max(0, record.get("size") or 0),
+            stateful=bool(record.get("stateful")),
+        )
+
+
+class RetentionPolicy:
+    def __init__(
+        self,
+        *,
+        keepLast: int = 0,
+        keepHourly: int = 0,
+        keepDaily: int = 0,
+        keepWeekly: int = 0,
+        keepMonthly: int = 0,
+        keepWithin: float = 0,
+        prefix: str = "",
+    ) -> None:
+        if min(keepLast, keepHourly, keepDaily, keepWeekly, keepMonthly) < 0:
+            raise InstanceException("Retention counts can't be negative.")
+
+        # A policy keeping nothing would delete every snapshot it manages.
+        if not any(
+            [keepLast, keepHourly, keepDaily, keepWeekly, keepMonthly, keepWithin]
+        ):
+            raise InstanceException("A retention policy needs at least one keep rule.")
+
+        self.keepLast = keepLast
+        self.keepHourly = keepHourly
+        self.keepDaily = keepDaily
+        self.keepWeekly = keepWeekly
+        self.keepMonthly = keepMonthly
+        self.keepWithin = keepWithin
+        self.prefix = prefix
+
+    def __str__(self) -> str:
+        rules = ", ".join(
+            [
+                f"{rule}={getattr(self, rule)}"
+                for rule in ("keepLast", *_BUCKETS, "keepWithin")
+                if getattr(self, rule)
+            ]
+        )
+
+        return f"{self.__class__.__name__} ({rules})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def select(
+        self, snapshots: list[Snapshot], now: float | None = None
+    ) -> tuple[list[Snapshot], list[Snapshot]]:
+        now = time.time() if now is None else now
+
+        # Only snapshots the policy manages can be deleted, e.g. the automatic
+        # ones matching a prefix; the others are always kept.
+        managed = sorted(
+            [s for s in snapshots if s.name.startswith(self.prefix)],
+            key=lambda s: s.createdAt,
+            reverse=True,
+        )
+
+        keep = set()
+        for i, snapshot in enumerate(managed):
+            if i < self.keepLast or now - snapshot.createdAt < self.keepWithin:
+                keep.add(i)
+
+        # Each periodic rule keeps the newest snapshot of its most recent buckets.
+        for rule, bucketOf in _BUCKETS.items():
+            remaining = getattr(self, rule)
+            last = None
+
+            for i, snapshot in enumerate(managed):
+                if not remaining:
+                    break
+
+                bucket = bucketOf(time.gmtime(snapshot.createdAt))
+                if bucket != last:
+                    keep.add(i)
+                    remaining -= 1
+                    last = bucket
+
+        kept = [s for s in snapshots if not s.name.startswith(self.prefix)]
+        kept += [s for i, s in enumerate(managed) if i in keep]
+
+        return kept, [s for i, s in enumerate(managed) if i not in keep]
+
+
+class RetentionPlan:
+    def __init__(
+        self, project: Project, keep: list[Snapshot], delete: list[Snapshot]
+    ) -> None:
+        self.project = project
+        self.keep = keep
+        self.delete = delete
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (keep={len(self.keep)}, delete={len(self.delete)}, bytes={self.bytesReclaimed})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self.delete)
+
+    @property
+    def bytesReclaimed(self) -> int:
+        return sum([s.size for s in self.delete])
+
+    def byInstance(self) -> dict[str, list[Snapshot]]:
+        instances: dict[str, list[Snapshot]] = {}
+        for snapshot in self.delete:
+            instances.setdefault(snapshot.instance, []).append(snapshot)
+
+        return instances
+
+
+class RetentionResult(BatchResult):
+    @property
+    def bytesReclaimed(self) -> int:
+        return sum(self.results.values())
+
+
+def fetchSnapshots(project: Project, filter: str = "") -> dict[str, list[Snapshot]]:
+    # A single listing of the project carries the snapshots of every instance.
+    return {
+        record["name"]: [
+            Snapshot.fromRecord(instance=record["name"], record=snapshot)
+            for snapshot in record.get("snapshots") or []
+        ]
+        for record in fetchRecords(project=project, filter=filter)
+    }
+
+
+def plan(
+    project: Project,
+    policy: RetentionPolicy,
+    *,
+    policies: dict[str, RetentionPolicy] | None = None,
+    filter: str = "",
+    now: float | None = None,
+) -> RetentionPlan:
+    now = time.time() if now is None else now
+    keep: list[Snapshot] = []
+    delete: list[Snapshot] = []
+
+    for instance, snapshots in fetchSnapshots(project=project, filter=filter).items():
+        kept, deleted = (policies or {}).get(instance, policy).select(snapshots, now)
+        keep += kept
+        delete += deleted
+
+    return RetentionPlan(project=project, keep=keep, delete=delete)
+
+
+def apply(retentionPlan: RetentionPlan, *, maxWorkers: int = 8) -> RetentionResult:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pyincus.models.instances import Instance
+
+    start = time.perf_counter()
+    results: dict[str, int] = {}
+    errors: dict[str, BaseException] = {}
+    durations: dict[str, float] = {}
+
+    def prune(instance: str, snapshots: list[Snapshot]) -> None:
+        # Snapshots of one instance are deleted in turn, the server locks the
+        # instance for each deletion; different instances go in parallel.
+        target = Instance(project=retentionPlan.project, name=instance)
+
+        for snapshot in snapshots:
+            key = f"{instance}/{snapshot.name}"
+            began = time.perf_counter()
+            try:
+                target.deleteSnapshot(name=snapshot.name)
+                results[key] = snapshot.size
+            except Exception as error:
+                errors[key] = error
+            finally:
+                durations[key] = time.perf_counter() - began
+
+    byInstance = retentionPlan.byInstance()
+    workers = max(1, min(maxWorkers, len(byInstance) or 1))
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="pyincus-retention"
+    ) as executor:
+        list(executor.map(carry(lambda item: prune(*item)), byInstance.items()))
+
+    return RetentionResult(
+        names=[f"{s.instance}/{s.name}" for s in retentionPlan.delete],
+        results=results,
+        errors=errors,
+        durations=durations,
+        concurrency=workers,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def prune(
+    project: Project,
+    policy: RetentionPolicy,
+    *,
+    policies: dict[str, RetentionPolicy] | None = None,
+    filter: str = "",
+    maxWorkers: int = 8,
+    dryRun: bool = False,
+) -> RetentionPlan | RetentionResult:
+    retentionPlan = plan(
+        project=project, policy=policy, policies=policies, filter=filter
+    )
+
+    if dryRun:
+        return retentionPlan
+
+    return apply(retentionPlan, maxWorkers=maxWorkers)
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Iterable
+
+from pyincus.exceptions import IncusException
+from pyincus.fleet import METRICS, FleetState
+from pyincus.table import fetchRecords, fetchRemoteRecords
+
+if TYPE_CHECKING:
+    from pyincus.models.projects import Project
+    from pyincus.models.remotes import Remote
+
+# Each ring buffer row is the sample timestamp followed by every fleet metric.
+WIDTH = 1 + len(METRICS)
+_INDEX = {metric: i + 1 for i, metric in enumerate(METRICS)}
+
+# Prometheus name, type, help and source metric of every exported counter/gauge.
+_EXPORTED = (
+    ("incus_instance_cpu_seconds_total", "counter", "CPU time used.", "cpuUsage"),
+    ("incus_instance_memory_usage_bytes", "gauge", "Memory usage.", "memoryUsage"),
+    ("incus_instance_memory_peak_bytes", "gauge", "Peak memory usage.", "memoryPeak"),
+    ("incus_instance_swap_usage_bytes", "gauge", "Swap usage.", "swapUsage"),
+    ("incus_instance_disk_usage_bytes", "gauge", "Disk usage.", "diskUsage"),
+    ("incus_instance_processes", "gauge", "Number of processes.", "processes"),
+    (
+        "incus_instance_network_receive_bytes_total",
+        "counter",
+        "Bytes received on all NICs.",
+        "bytesReceived",
+    ),
+    (
+        "incus_instance_network_transmit_bytes_total",
+        "counter",
+        "Bytes sent on all NICs.",
+        "bytesSent",
+    ),
+)
+_RATES = (
+    ("incus_instance_cpu_percent", "CPU usage in percent of one core.", "cpuPercent"),
+    (
+        "incus_instance_network_receive_bytes_per_second",
+        "Receive rate over the last interval.",
+        "bytesReceivedRate",
+    ),
+    (
+        "incus_instance_network_transmit_bytes_per_second",
+        "Transmit rate over the last interval.",
+        "bytesSentRate",
+    ),
+)
+
+
+class RingBuffer:
+    __slots__ = ("capacity", "width", "_data", "_next", "_count")
+
+    def __init__(self, capacity: int, width: int = WIDTH) -> None:
+        if capacity < 2:
+            raise IncusException("A ring buffer needs a capacity of at least 2.")
+
+        self.capacity = capacity
+        self.width = width
+        self._data = array("d", bytes(8 * capacity * width))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, row: Iterable[float]) -> None:
+        start = self._next * self.width
+        self._data[start : start + self.width] = array("d", row)
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def row(self, age: int = 0) -> array:
+        if age >= self._count:
+            raise IndexError("ring buffer index out of range")
+
+        start = ((self._next - 1 - age) % self.capacity) * self.width
+
+        return self._data[start : start + self.width]
+
+    def rows(self) -> list[array]:
+        return [self.row(age) for age in range(self._count - 1, -1, -1)]
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(key: tuple[str, str, str]) -> str:
+    remote, project, name = (v.replace("\\", "\\\\").replace('"', '\\"') for v in key)
+
+    return f'remote="{remote}",project="{project}",name="{name}"'
+
+
+class MetricsSampler:
+    def __init__(
+        self,
+        sources: Iterable[Project | Remote],
+        *,
+        interval: float = 15,
+        capacity: int = 40,
+    ) -> None:
+        self.sources = list(sources)
+        self.interval = interval
+        self.capacity = capacity
+        self.buffers: dict[tuple[str, str, str], RingBuffer] = {}
+        self.ticks = 0
+        self.lastTick: float | None = None
+        self.lastDuration: float | None = None
+        self.lastError: BaseException | None = None
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread | None = None
+        self.__server: ThreadingHTTPServer | None = None
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (sources={len(self.sources)}, instances={len(self.buffers)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _fetch(self) -> list[tuple[str, str, FleetState]]:
+        from pyincus.models.remotes import Remote
+
+        states = []
+        for source in self.sources:
+            timestamp = time.time()
+
+            if isinstance(source, Remote):
+                # One listing for every project of the remote.
+                byProject = {}
+                for record in fetchRemoteRecords(remote=source):
+                    byProject.setdefault(record.get("project") or "default", []).append(
+                        record
+                    )
+
+                for project, records in byProject.items():
+                    states.append(
+                        (
+                            source.name,
+                            project,
+                            FleetState.fromRecords(records, timestamp=timestamp),
+                        )
+                    )
+            else:
+                states.append(
+                    (
+                        source.remote.name,
+                        source.name,
+                        FleetState.fromRecords(
+                            fetchRecords(project=source), timestamp=timestamp
+                        ),
+                    )
+                )
+
+        return states
+
+    def tick(self) -> None:
+        start = time.perf_counter()
+        states = self._fetch()
+        seen = set()
+
+        with self.__lock:
+            for remote, project, state in states:
+                columns = [state.column(metric) for metric in METRICS]
+
+                for i, name in enumerate(state.names):
+                    key = (remote, project, name)
+                    seen.add(key)
+
+                    if key not in self.buffers:
+                        self.buffers[key] = RingBuffer(self.capacity)
+
+                    self.buffers[key].append(
+                        [state.timestamp, *[column[i] for column in columns]]
+                    )
+
+            # Deleted instances stop being exported instead of going stale.
+            for key in self.buffers.keys() - seen:
+                del self.buffers[key]
+
+            self.ticks += 1
+            self.lastTick = time.time()
+            self.lastDuration = time.perf_counter() - start
+
+    @staticmethod
+    def _rates(buffer: RingBuffer) -> dict[str, float]:
+        if len(buffer) < 2:
+            return {}
+
+        current = buffer.row(0)
+        previous = buffer.row(1)
+        elapsed = current[0] - previous[0]
+        if elapsed <= 0:
+            return {}
+
+        def delta(metric: str) -> float:
+            value = current[_INDEX[metric]] - previous[_INDEX[metric]]
+            # A counter going backwards means the instance restarted.
+            return current[_INDEX[metric]] if value < 0 else value
+
+        return {
+            "cpuPercent": delta("cpuUsage") / 1e9 / elapsed * 100,
+            "bytesReceivedRate": delta("bytesReceived") / elapsed,
+            "bytesSentRate": delta("bytesSent") / elapsed,
+            "packetsReceivedRate": delta("packetsReceived") / elapsed,
+            "packetsSentRate": delta("packetsSent") / elapsed,
+        }
+
+    def snapshot(self) -> dict[tuple[str, str, str], dict[str, float]]:
+        result = {}
+
+        with self.__lock:
+            for key, buffer in self.buffers.items():
+                if not len(buffer):
+                    continue
+
+                row = buffer.row(0)
+                result[key] = {
+                    "timestamp": row[0],
+                    **{metric: row[i] for metric, i in _INDEX.items()},
+                    **self._rates(buffer),
+                }
+
+        return result
+
+    def history(self, remote: str, project: str, name: str) -> list[dict[str, float]]:
+        with self.__lock:
+            buffer = self.buffers.get((remote, project, name))
+            if buffer is None:
+                return []
+
+            return [
+                {"timestamp": row[0], **{m: row[i] for m, i in _INDEX.items()}}
+                for row in buffer.rows()
+            ]
+
+    def render(self) -> str:
+        snapshot = self.snapshot()
+        lines = []
+
+        for name, kind, description, metric in _EXPORTED:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            # CPU time is sampled in nanoseconds but exported in seconds.
+            scale = 1e-9 if metric == "cpuUsage" else 1
+            for key, values in snapshot.items():
+                lines.append(
+                    f"{name}{{{_labels(key)}}} {_number(values[metric] * scale)}"
+                )
+
+        for name, description, metric in _RATES:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} gauge")
+            for key, values in snapshot.items():
+                if metric in values:
+                    lines.append(f"{name}{{{_labels(key)}}} {_number(values[metric])}")
+
+        lines.append("# HELP incus_sampler_instances Number of sampled instances.")
+        lines.append("# TYPE incus_sampler_instances gauge")
+        lines.append(f"incus_sampler_instances {len(snapshot)}")
+        lines.append(
+            "# HELP incus_sampler_tick_duration_seconds Duration of the last tick."
+        )
+        lines.append("# TYPE incus_sampler_tick_duration_seconds gauge")
+        lines.append(
+            f"incus_sampler_tick_duration_seconds {_number(self.lastDuration or 0)}"
+        )
+        lines.append("# HELP incus_sampler_up Whether the last tick succeeded.")
+        lines.append("# TYPE incus_sampler_up gauge")
+        lines.append(f"incus_sampler_up {0 if self.lastError else 1}")
+
+        return "\n".join(lines) + "\n"
+
+    def _loop(self) -> None:
+        while not self.__stop.is_set():
+            start = time.monotonic()
+
+            try:
+                self.tick()
+                self.lastError = None
+            except Exception as error:
+                # Keep sampling; a remote that is down now may be back next tick.
+                self.lastError = error
+
+            self.__stop.wait(max(0, self.interval - (time.monotonic() - start)))
+
+    def start(self) -> None:
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(
+            target=self._loop, name="pyincus-sampler", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stop.set()
+
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+    def serve(
+        self, port: int = 9100, address: str = "127.0.0.1"
+    ) -> ThreadingHTTPServer:
+        sampler = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = sampler.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self.__server = ThreadingHTTPServer((address, port), Handler)
+        threading.Thread(
+            target=self.__server.serve_forever, name="pyincus-exporter", daemon=True
+        ).start()
+
+        return self.__server
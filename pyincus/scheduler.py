@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable
+
+from pyincus.exceptions import IncusException
+from pyincus.models.acls import NetworkACL
+from pyincus.models.forwards import NetworkForward
+from pyincus.models.instances import Instance
+from pyincus.models.networks import Network
+from pyincus.profiler import carry
+from pyincus.utils import splitList
+
+if TYPE_CHECKING:
+    from pyincus.models.projects import Project
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+def _deviceRequirements(devices: dict[str, dict] | None) -> set[tuple]:
+    requires = set()
+
+    for device in (devices or {}).values():
+        if device.get("network"):
+            requires.add(("network", device["network"]))
+
+        for acl in splitList(device.get("security.acls")):
+            requires.add(("acl", acl))
+
+    return requires
+
+
+class Task:
+    def __init__(
+        self,
+        key: Hashable,
+        fn: Callable,
+        args: tuple = (),
+        kwargs: dict | None = None,
+        *,
+        provides: Iterable[tuple] = (),
+        requires: Iterable[tuple] = (),
+        dependsOn: Iterable[Hashable] = (),
+    ) -> None:
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.provides = set(provides) | {key}
+        self.requires = set(requires)
+        self.dependsOn = set(dependsOn)
+        self.status = PENDING
+        self.result = None
+        self.error: BaseException | None = None
+        self.duration: float | None = None
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (key={self.key}, status={self.status})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _run(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return self.fn(*self.args, **self.kwargs)
+        finally:
+            self.duration = time.perf_counter() - start
+
+
+class Scheduler:
+    def __init__(self, maxWorkers: int = 4) -> None:
+        if maxWorkers < 1:
+            raise IncusException("maxWorkers must be at least 1.")
+
+        self.maxWorkers = maxWorkers
+        self.tasks: dict[Hashable, Task] = {}
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (tasks={len(self.tasks)}, maxWorkers={self.maxWorkers})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def add(
+        self,
+        key: Hashable,
+        fn: Callable,
+        *args,
+        provides: Iterable[tuple] = (),
+        requires: Iterable[tuple] = (),
+        dependsOn: Iterable[Hashable] = (),
+        **kwargs,
+    ) -> Task:
+        if key in self.tasks:
+            raise IncusException(f'Task "{key}" is already scheduled.')
+
+        task = Task(
+            key,
+            fn,
+            args,
+            kwargs,
+            provides=provides,
+            requires=requires,
+            dependsOn=dependsOn,
+        )
+        self.tasks[key] = task
+
+        return task
+
+    def createACL(self, project: Project, name: str, **kwargs) -> Task:
+        return self.add(
+            ("acl", name), NetworkACL.create, project=project, name=name, **kwargs
+        )
+
+    def createNetwork(
+        self,
+        project: Project,
+        name: str,
+        _type: str,
+        *,
+        config: dict[str, str] | None = None,
+        **kwargs,
+    ) -> Task:
+        return self.add(
+            ("network", name),
+            Network.create,
+            project=project,
+            name=name,
+            _type=_type,
+            config=config,
+            requires={
+                ("acl", acl) for acl in splitList((config or {}).get("security.acls"))
+            },
+            **kwargs,
+        )
+
+    def launchInstance(
+        self,
+        project: Project,
+        image: str,
+        name: str,
+        *,
+        device: dict[str, dict] | None = None,
+        network: str | None = None,
+        **kwargs,
+    ) -> Task:
+        requires = _deviceRequirements(device)
+        if network:
+            requires.add(("network", network))
+
+        provides = {
+            ("address", d[k])
+            for d in (device or {}).values()
+            for k in ("ipv4.address", "ipv6.address")
+            if d.get(k)
+        }
+
+        return self.add(
+            ("instance", name),
+            Instance.launch,
+            project=project,
+            image=image,
+            name=name,
+            device=device,
+            network=network,
+            provides=provides,
+            requires=requires,
+            **kwargs,
+        )
+
+    def createForward(self, network: Network, listenAddress: str, **kwargs) -> Task:
+        return self.add(
+            ("forward", network.name, listenAddress),
+            NetworkForward.create,
+            network=network,
+            listenAddress=listenAddress,
+            requires={("network", network.name)},
+            **kwargs,
+        )
+
+    def addForwardPort(
+        self,
+        network: Network,
+        listenAddress: str,
+        *,
+        protocol: str,
+        listenPorts: str,
+        targetAddress: str,
+        targetPorts: str | None = None,
+        targetInstance: str | None = None,
+    ) -> Task:
+        requires = {
+            ("network", network.name),
+            ("forward", network.name, listenAddress),
+            ("address", targetAddress),
+        }
+        if targetInstance:
+            requires.add(("instance", targetInstance))
+
+        def addPort() -> None:
+            NetworkForward.get(network=network, listenAddress=listenAddress).addPort(
+                protocol=protocol,
+                listenPorts=listenPorts,
+                targetAddress=targetAddress,
+                targetPorts=targetPorts,
+            )
+
+        return self.add(
+            ("forward-port", network.name, listenAddress, protocol, str(listenPorts)),
+            addPort,
+            requires=requires,
+        )
+
+    def dependencies(self) -> dict[Hashable, set[Hashable]]:
+        providers = {}
+        for task in self.tasks.values():
+            for resource in task.provides:
+                providers[resource] = task.key
+
+        edges = {}
+        for task in self.tasks.values():
+            edges[task.key] = {
+                providers[r] for r in task.requires if r in providers
+            } | task.dependsOn
+            edges[task.key].discard(task.key)
+
+            for key in edges[task.key]:
+                if key not in self.tasks:
+                    raise IncusException(
+                        f'Task "{task.key}" depends on unknown task "{key}".'
+                    )
+
+        # Kahn's algorithm, only to reject cycles before anything runs.
+        remaining = {key: len(deps) for key, deps in edges.items()}
+        dependents = {key: [] for key in edges}
+        for key, deps in edges.items():
+            for dep in deps:
+                dependents[dep].append(key)
+
+        ready = [key for key, count in remaining.items() if count == 0]
+        seen = 0
+        while ready:
+            key = ready.pop()
+            seen += 1
+            for dependent in dependents[key]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if seen != len(edges):
+            raise IncusException(
+                f"Dependency cycle between tasks: {[k for k, c in remaining.items() if c]}"
+            )
+
+        return edges
+
+    def run(self) -> dict[Hashable, Task]:
+        edges = self.dependencies()
+        dependents: dict[Hashable, list[Hashable]] = {key: [] for key in edges}
+        for key, deps in edges.items():
+            for dep in deps:
+                dependents[dep].append(key)
+
+        waiting = {key: set(deps) for key, deps in edges.items()}
+        running: dict[Future, Task] = {}
+
+        def cancel(key: Hashable) -> None:
+            stack = list(dependents[key])
+            while stack:
+                task = self.tasks[stack.pop()]
+                if task.status == PENDING:
+                    task.status = CANCELLED
+                    stack.extend(dependents[task.key])
+
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+            while True:
+                for key, deps in waiting.items():
+                    task = self.tasks[key]
+                    if task.status == PENDING and not deps:
+                        task.status = RUNNING
+                        running[executor.submit(carry(task._run))] = task
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        task.result = future.result()
+                        task.status = SUCCEEDED
+                    except Exception as error:
+                        task.error = error
+                        task.status = FAILED
+                        cancel(task.key)
+                        continue
+
+                    for dependent in dependents[task.key]:
+                        waiting[dependent].discard(task.key)
+
+        return self.tasks
+
+    @property
+    def failed(self) -> list[Task]:
+        return [t for t in self.tasks.values() if t.status == FAILED]
+
+    @property
+    def cancelled(self) -> list[Task]:
+        return [t for t in self.tasks.values() if t.status == CANCELLED]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import copy
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self.enabled = True
+        self.__lock = threading.Lock()
+        self.__calls: dict[Hashable, _Call] = {}
+        self.__stats: dict[str, dict[str, int]] = {}
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (inFlight={len(self.__calls)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __count(self, kind: str, counter: str) -> None:
+        stats = self.__stats.setdefault(
+            kind, {"calls": 0, "executed": 0, "coalesced": 0, "errors": 0}
+        )
+        stats[counter] += 1
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return fn()
+
+        kind = str(key[0]) if isinstance(key, tuple) and key else str(key)
+
+        with self.__lock:
+            self.__count(kind, "calls")
+            call = self.__calls.get(key)
+
+            if call is not None:
+                call.waiters += 1
+                self.__count(kind, "coalesced")
+                leader = False
+            else:
+                call = self.__calls[key] = _Call()
+                self.__count(kind, "executed")
+                leader = True
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as error:
+                call.error = error
+            finally:
+                # Removed before waking followers, so a call made after this one
+                # finished always starts a new flight and never sees stale data.
+                with self.__lock:
+                    del self.__calls[key]
+                    if call.error is not None:
+                        self.__count(kind, "errors")
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+
+        return call.result
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self.__lock:
+            totals = {"calls": 0, "executed": 0, "coalesced": 0, "errors": 0}
+            for stats in self.__stats.values():
+                for counter, value in stats.items():
+                    totals[counter] += value
+
+            return {
+                "total": totals,
+                "inFlight": {"calls": len(self.__calls)},
+                **{kind: dict(stats) for kind, stats in self.__stats.items()},
+            }
+
+    def resetStats(self) -> None:
+        with self.__lock:
+            self.__stats = {}
+
+
+flights = SingleFlight()
+
+
+def shared(
+    key: tuple,
+    fn: Callable[..., dict],
+    group: SingleFlight | None = None,
+    *,
+    fresh: bool = False,
+    **kwargs,
+) -> dict:
+    # A read-back after a write must not join a read started before it.
+    if fresh:
+        return fn(**kwargs)
+
+    try:
+        key = (*key, tuple(sorted(kwargs.items())))
+        hash(key)
+    except TypeError:
+        # Unhashable arguments (e.g. an input buffer) can't be matched safely.
+        return fn(**kwargs)
+
+    # Each caller gets its own deep copy, so one of them editing the result
+    # can't leak into what the others received.
+    return copy.deepcopy((group or flights).do(key, lambda: fn(**kwargs)))
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import copy
+import sys
+from array import array
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+from pyincus.exceptions import IncusException
+from pyincus.utils import REGEX_EMPTY_BODY, validateObjectFormat
+
+if TYPE_CHECKING:
+    from pyincus.models.instances import Instance
+    from pyincus.models.projects import Project
+    from pyincus.models.remotes import Remote
+
+# Columns whose values repeat across rows, stored as indexes into a level list.
+CATEGORICAL = ("status", "type", "location")
+COLUMNS = ("name", "status", "type", "location", "addresses", "createdAt")
+
+
+def fetchRecords(
+    project: Project, filter: str = "", skipValidation=False, **kwargs
+) -> list[dict[str, Any]]:
+    client = project.remote.client
+
+    import json
+
+    if not skipValidation:
+        validateObjectFormat(filter)
+
+    cmd = f"{client.binaryPath} --project='{project.name}' list '{project.remote.name}': '{filter}' -fjson"
+    result = client.shared(
+        ("instance", project.remote.name, project.name, "records", filter),
+        client.run,
+        cmd=cmd,
+        **kwargs,
+    )
+
+    if result["error"]:
+        if REGEX_EMPTY_BODY.search(result["data"]):
+            print(f'Retrying listing "{cmd}"...')
+            return fetchRecords(
+                project=project,
+                filter=filter,
+                skipValidation=skipValidation,
+                **kwargs,
+            )
+        else:
+            raise IncusException(result["data"])
+
+    # JSON is parsed far faster than YAML.
+    return json.loads(result["data"]) or []
+
+
+def fetchRemoteRecords(
+    remote: Remote, filter: str = "", skipValidation=False, **kwargs
+) -> list[dict[str, Any]]:
+    client = remote.client
+
+    import json
+
+    if not skipValidation:
+        validateObjectFormat(filter)
+
+    cmd = f"{client.binaryPath} list '{remote.name}': '{filter}' --all-projects -fjson"
+    result = client.shared(
+        ("instance", remote.name, None, "records", filter),
+        client.run,
+        cmd=cmd,
+        **kwargs,
+    )
+
+    if result["error"]:
+        if REGEX_EMPTY_BODY.search(result["data"]):
+            print(f'Retrying listing "{cmd}"...')
+            return fetchRemoteRecords(
+                remote=remote,
+                filter=filter,
+                skipValidation=skipValidation,
+                **kwargs,
+            )
+        else:
+            raise IncusException(result["data"])
+
+    return json.loads(result["data"]) or []
+
+
+class _Columns:
+    __slots__ = (
+        "names",
+        "createdAt",
+        "codes",
+        "levels",
+        "lookup",
+        "addresses",
+        "offsets",
+        "positions",
+        "records",
+    )
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.createdAt: list[str] = []
+        self.codes = {c: array("H") for c in CATEGORICAL}
+        self.levels: dict[str, list[str]] = {c: [] for c in CATEGORICAL}
+        self.lookup: dict[str, dict[str, int]] = {c: {} for c in CATEGORICAL}
+        self.addresses: list[str] = []
+        self.offsets = array("I", [0])
+        self.positions: dict[str, int] = {}
+        self.records: list[dict[str, Any]] = []
+
+    def code(self, column: str, value: str) -> int:
+        lookup = self.lookup[column]
+
+        if value not in lookup:
+            lookup[value] = len(self.levels[column])
+            self.levels[column].append(sys.intern(value))
+
+        return lookup[value]
+
+    def append(self, record: dict[str, Any]) -> None:
+        self.positions[record["name"]] = len(self.names)
+        self.names.append(sys.intern(record["name"]))
+        self.createdAt.append(sys.intern(record.get("created_at") or ""))
+
+        for column in CATEGORICAL:
+            self.codes[column].append(self.code(column, record.get(column) or ""))
+
+        state = record.get("state") or {}
+        for name, nic in (state.get("network") or {}).items():
+            if name == "lo":
+                continue
+
+            for address in nic.get("addresses") or []:
+                if address.get("scope") == "global":
+                    self.addresses.append(sys.intern(address["address"]))
+
+        self.offsets.append(len(self.addresses))
+        self.records.append(record)
+
+    def instance(self, project: Project, position: int) -> Instance:
+        from pyincus.models.instances import Instance
+
+        # A copy, so editing the instance leaves the table as it was fetched.
+        record = copy.deepcopy(self.records[position])
+        record.pop("project", None)
+
+        return Instance(project=project, **record)
+
+
+class InstanceTable:
+    __slots__ = ("project", "_columns", "_rows", "_members")
+
+    def __init__(
+        self, project: Project, columns: _Columns, rows: array | None = None
+    ) -> None:
+        self.project = project
+        self._columns = columns
+        self._rows = array("I", range(len(columns.names))) if rows is None else rows
+        self._members: frozenset[int] | None = None
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__} (project={self.project.name}, rows={len(self)})"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Instance]:
+        for i in range(len(self._rows)):
+            yield self[i]
+
+    def __contains__(self, name: str) -> bool:
+        position = self._columns.positions.get(name)
+
+        if position is None:
+            return False
+
+        # Rows are never repeated, a table as long as its columns holds them all.
+        if len(self._rows) == len(self._columns.names):
+            return True
+
+        if self._members is None:
+            self._members = frozenset(self._rows)
+
+        return position in self._members
+
+    def __getitem__(self, index: int | slice) -> Instance | InstanceTable:
+        if isinstance(index, slice):
+            return self.__class__(
+                project=self.project, columns=self._columns, rows=self._rows[index]
+            )
+
+        return self._columns.instance(self.project, self._rows[index])
+
+    @classmethod
+    def fromRecords(
+        cls, project: Project, records: Iterable[dict[str, Any]]
+    ) -> InstanceTable:
+        columns = _Columns()
+
+        for record in records:
+            columns.append(record)
+
+        return cls(project=project, columns=columns)
+
+    @classmethod
+    def fetch(
+        cls, project: Project, filter: str = "", skipValidation=False, **kwargs
+    ) -> InstanceTable:
+        return cls.fromRecords(
+            project=project,
+            records=fetchRecords(
+                project=project, filter=filter, skipValidation=skipValidation, **kwargs
+            ),
+        )
+
+    def _value(self, column: str, position: int) -> Any:
+        c = self._columns
+
+        if column == "name":
+            return c.names[position]
+        if column == "createdAt":
+            return c.createdAt[position]
+        if column == "addresses":
+            return tuple(c.addresses[c.offsets[position] : c.offsets[position + 1]])
+        if column in c.codes:
+            return c.levels[column][c.codes[column][position]]
+
+        raise IncusException(
+            f'Unknown column "{column}", expected one of {", ".join(COLUMNS)}.'
+        )
+
+    def column(self, name: str) -> list[Any]:
+        return [self._value(name, position) for position in self._rows]
+
+    @property
+    def names(self) -> list[str]:
+        return self.column("name")
+
+    def row(self, index: int) -> dict[str, Any]:
+        position = self._rows[index]
+
+        return {column: self._value(column, position) for column in COLUMNS}
+
+    def instance(self, name: str) -> Instance:
+        if name not in self:
+            raise IncusException(f'Instance "{name}" is not part of this table.')
+
+        return self._columns.instance(self.project, self._columns.positions[name])
+
+    def where(self, **conditions: str | Iterable[str]) -> InstanceTable:
+        rows = self._rows
+        c = self._columns
+
+        for column, expected in conditions.items():
+            values = {expected} if isinstance(expected, str) else set(expected)
+
+            if column in c.codes:
+                # Compare level codes, never the strings of every row.
+                wanted = {c.lookup[column][v] for v in values if v in c.lookup[column]}
+                codes = c.codes[column]
+                rows = array("I", [p for p in rows if codes[p] in wanted])
+            elif column == "name":
+                positions = {c.positions[v] for v in values if v in c.positions}
+                rows = array("I", [p for p in rows if p in positions])
+            elif column == "addresses":
+                rows = array(
+                    "I",
+                    [
+                        p
+                        for p in rows
+                        if not values.isdisjoint(
+                            c.addresses[c.offsets[p] : c.offsets[p + 1]]
+                        )
+                    ],
+                )
+            else:
+                rows = array("I", [p for p in rows if self._value(column, p) in values])
+
+        return self.__class__(project=self.project, columns=c, rows=rows)
+
+    def filter(self, column: str, predicate: Callable[[Any], bool]) -> InstanceTable:
+        c = self._columns
+
+        if column in c.codes:
+            # The predicate runs once per distinct value rather than once per row.
+            wanted = {i for i, v in enumerate(c.levels[column]) if predicate(v)}
+            codes = c.codes[column]
+            rows = array("I", [p for p in self._rows if codes[p] in wanted])
+        else:
+            rows = array(
+                "I", [p for p in self._rows if predicate(self._value(column, p))]
+            )
+
+        return self.__class__(project=self.project, columns=c, rows=rows)
+
+    def sortBy(self, *columns: str, reverse: bool = False) -> InstanceTable:
+        c = self._columns
+
+        def key(position: int) -> tuple:
+            return tuple(
+                c.levels[column][c.codes[column][position]]
+                if column in c.codes
+                else self._value(column, position)
+                for column in columns
+            )
+
+        return self.__class__(
+            project=self.project,
+            columns=c,
+            rows=array("I", sorted(self._rows, key=key, reverse=reverse)),
+        )
+
+    def counts(self, column: str) -> dict[str, int]:
+        c = self._columns
+
+        if column not in c.codes:
+            raise IncusException(
+                f'Column "{column}" is not categorical, expected one of {", ".join(CATEGORICAL)}.'
+            )
+
+        totals = [0] * len(c.levels[column])
+        codes = c.codes[column]
+        for position in self._rows:
+            totals[codes[position]] += 1
+
+        return {c.levels[column][i]: n for i, n in enumerate(totals) if n}
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import TYPE_CHECKING
+
+from pyincus.inventory import Inventory, instanceReferences
+from pyincus.utils import splitList
+
+if TYPE_CHECKING:
+    from pyincus.models.acls import NetworkACL
+    from pyincus.models.forwards import NetworkForward
+    from pyincus.models.instances import Instance
+    from pyincus.models.networks import Network
+    from pyincus.models.projects import Project
+
+_indexes: weakref.WeakSet[UsageIndex] = weakref.WeakSet()
+
+
+class UsageIndex:
+    def __init__(self, project: Project, inventory: Inventory | None = None) -> None:
+        self.project = project
+        self.__lock = threading.RLock()
+        self.rebuild(inventory=inventory)
+        _indexes.add(self)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} (project={self.project.name})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def rebuild(self, inventory: Inventory | None = None) -> None:
+        if inventory is None:
+            inventory = Inventory.fetch(project=self.project)
+
+        with self.__lock:
+            self.__instances: dict[str, Instance] = {}
+            self.__networks: dict[str, Network] = {}
+            self.__acls: dict[str, NetworkACL] = dict(inventory.acls)
+            self.__forwards: dict[tuple[str, str], NetworkForward] = {}
+
+            # Forward edges, each one paired with its reverse so updates are O(degree).
+            self.__networkACLs: dict[str, set[str]] = {}
+            self.__aclNetworks: dict[str, set[str]] = {}
+            self.__instanceNetworks: dict[str, set[str]] = {}
+            self.__networkInstances: dict[str, set[str]] = {}
+            self.__instanceACLs: dict[str, set[str]] = {}
+            self.__aclInstances: dict[str, set[str]] = {}
+            self.__instanceAddresses: dict[str, set[str]] = {}
+            self.__addressInstances: dict[str, set[str]] = {}
+            self.__forwardAddresses: dict[tuple[str, str], set[str]] = {}
+
+            for network in inventory.networks.values():
+                self.__indexNetwork(network)
+
+            for instance in inventory.instances.values():
+                self.__indexInstance(instance)
+
+            for forwards in inventory.forwards.values():
+                for forward in forwards:
+                    self.__indexForward(forward)
+
+    @staticmethod
+    def _link(forward: dict, reverse: dict, key: str | tuple, values: set[str]) -> None:
+        for value in forward.pop(key, set()):
+            reverse.get(value, set()).discard(key)
+
+        if values:
+            forward[key] = values
+
+        for value in values:
+            reverse.setdefault(value, set()).add(key)
+
+    def __indexNetwork(self, network: Network) -> None:
+        self.__networks[network.name] = network
+        self._link(
+            self.__networkACLs,
+            self.__aclNetworks,
+            network.name,
+            set(splitList(network.attributes.get("config", {}).get("security.acls"))),
+        )
+
+    def __unindexNetwork(self, name: str) -> None:
+        self.__networks.pop(name, None)
+        self._link(self.__networkACLs, self.__aclNetworks, name, set())
+
+    def __indexInstance(self, instance: Instance) -> None:
+        networks, acls, addresses = instanceReferences(instance.attributes)
+
+        self.__instances[instance.name] = instance
+        self._link(
+            self.__instanceNetworks, self.__networkInstances, instance.name, networks
+        )
+        self._link(self.__instanceACLs, self.__aclInstances, instance.name, acls)
+        self._link(
+            self.__instanceAddresses,
+            self.__addressInstances,
+            instance.name,
+            addresses,
+        )
+
+    def __unindexInstance(self, name: str) -> None:
+        self.__instances.pop(name, None)
+        self._link(self.__instanceNetworks, self.__networkInstances, name, set())
+        self._link(self.__instanceACLs, self.__aclInstances, name, set())
+        self._link(self.__instanceAddresses, self.__addressInstances, name, set())
+
+    def __indexForward(self, forward: NetworkForward) -> None:
+        key = (forward.network.name, forward.name)
+        attributes = forward.attributes
+        addresses = set()
+
+        if (attributes.get("config") or {}).get("target_address"):
+            addresses.add(attributes["config"]["target_address"])
+
+        for port in attributes.get("ports") or []:
+            if port.get("target_address"):
+                addresses.add(port["target_address"])
+
+        self.__forwards[key] = forward
+        self.__forwardAddresses[key] = addresses
+
+    def __unindexForward(self, key: tuple[str, str]) -> None:
+        self.__forwards.pop(key, None)
+        self.__forwardAddresses.pop(key, None)
+
+    def __isFor(self, project: Project) -> bool:
+        return (
+            project.name == self.project.name
+            and project.remote.name == self.project.remote.name
+        )
+
+    def update(self, obj: Instance | Network | NetworkACL | NetworkForward) -> None:
+        from pyincus.models.acls import NetworkACL
+        from pyincus.models.forwards import NetworkForward
+        from pyincus.models.instances import Instance
+        from pyincus.models.networks import Network
+
+        if isinstance(obj, NetworkForward):
+            if self.__isFor(obj.network.project):
+                with self.__lock:
+                    self.__indexForward(obj)
+            return
+
+        if not self.__isFor(obj.project):
+            return
+
+        with self.__lock:
+            if isinstance(obj, Instance):
+                self.__indexInstance(obj)
+            elif isinstance(obj, Network):
+                self.__indexNetwork(obj)
+            elif isinstance(obj, NetworkACL):
+                self.__acls[obj.name] = obj
+
+    def discard(self, obj: Instance | Network | NetworkACL | NetworkForward) -> None:
+        from pyincus.models.acls import NetworkACL
+        from pyincus.models.forwards import NetworkForward
+        from pyincus.models.instances import Instance
+        from pyincus.models.networks import Network
+
+        if isinstance(obj, NetworkForward):
+            if self.__isFor(obj.network.project):
+                with self.__lock:
+                    self.__unindexForward((obj.network.name, obj.name))
+            return
+
+        if not self.__isFor(obj.project):
+            return
+
+        with self.__lock:
+            if isinstance(obj, Instance):
+                self.__unindexInstance(obj.name)
+            elif isinstance(obj, Network):
+                self.__unindexNetwork(obj.name)
+            elif isinstance(obj, NetworkACL):
+                self.__acls.pop(obj.name, None)
+
+    @staticmethod
+    def watches(project: Project) -> bool:
+        return any([index.__isFor(project) for index in list(_indexes)])
+
+    @staticmethod
+    def notifySaved(obj: Instance | Network | NetworkACL | NetworkForward) -> None:
+        for index in list(_indexes):
+            index.update(obj)
+
+    @staticmethod
+    def notifyDeleted(obj: Instance | Network | NetworkACL | NetworkForward) -> None:
+        for index in list(_indexes):
+            index.discard(obj)
+
+    def networksUsingACL(self, name: str) -> list[Network]:
+        with self.__lock:
+            return [
+                self.__networks[n]
+                for n in sorted(self.__aclNetworks.get(name, set()))
+                if n in self.__networks
+            ]
+
+    def instancesOnNetwork(self, name: str) -> list[Instance]:
+        with self.__lock:
+            return [
+                self.__instances[i]
+                for i in sorted(self.__networkInstances.get(name, set()))
+            ]
+
+    def instancesUsingACL(self, name: str) -> list[Instance]:
+        with self.__lock:
+            names = set(self.__aclInstances.get(name, set()))
+
+            for network in self.__aclNetworks.get(name, set()):
+                names |= self.__networkInstances.get(network, set())
+
+            return [self.__instances[i] for i in sorted(names)]
+
+    def aclsForInstance(self, name: str) -> list[NetworkACL]:
+        with self.__lock:
+            acls = set(self.__instanceACLs.get(name, set()))
+
+            for network in self.__instanceNetworks.get(name, set()):
+                acls |= self.__networkACLs.get(network, set())
+
+            return [self.__acls[a] for a in sorted(acls) if a in self.__acls]
+
+    def forwardsForInstance(self, name: str) -> list[NetworkForward]:
+        with self.__lock:
+            addresses = self.__instanceAddresses.get(name, set())
+
+            return [
+                self.__forwards[key]
+                for key in sorted(self.__forwards)
+                if self.__forwardAddresses[key] & addresses
+            ]
+
+    def instancesForForward(self, network: str, listenAddress: str) -> list[Instance]:
+        with self.__lock:
+            names = set()
+
+            for address in self.__forwardAddresses.get((network, listenAddress), set()):
+                names |= self.__addressInstances.get(address, set())
+
+            return [self.__instances[i] for i in sorted(names)]
+
+    def unusedACLs(self) -> list[NetworkACL]:
+        with self.__lock:
+            return [
+                acl
+                for name, acl in sorted(self.__acls.items())
+                if not self.__aclNetworks.get(name)
+                and not self.__aclInstances.get(name)
+            ]
@@ -1,26 +1,101 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import re
+from typing import TYPE_CHECKING, Any
 
 from pyincus.exceptions import InvalidIncusObjectNameFormatException
+from pyincus.profiler import phase
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+
+class LazyPattern:
+    __slots__ = ("pattern", "flags", "_compiled")
+
+    def __init__(self, pattern: str, flags: int = 0) -> None:
+        self.pattern = pattern
+        self.flags = flags
+        self._compiled: re.Pattern[str] | None = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__} (pattern={self.pattern!r})"
+
+    def compile(self) -> re.Pattern[str]:
+        if self._compiled is None:
+            self._compiled = re.compile(self.pattern, self.flags)
+
+        return self._compiled
+
+    def match(self, string: str, *args) -> re.Match[str] | None:
+        return self.compile().match(string, *args)
+
+    def search(self, string: str, *args) -> re.Match[str] | None:
+        return self.compile().search(string, *args)
+
+    def fullmatch(self, string: str, *args) -> re.Match[str] | None:
+        return self.compile().fullmatch(string, *args)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.compile(), name)
+
+
+def parseTimestamp(value: datetime | str | None) -> float:
+    from datetime import datetime, timezone
+
+    if not value:
+        return 0.0
+
+    if isinstance(value, str):
+        # The server answers in nanoseconds, Python only parses microseconds.
+        value = datetime.fromisoformat(
+            REGEX_FRACTION.sub(lambda m: m.group(0)[:7], value.replace("Z", "+00:00"))
+        )
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    # Dates never set are 0001-01-01.
+    return max(0.0, value.timestamp())
+
+
+def loadYaml(data: Any) -> Any:
+    import yaml
+
+    with phase("parse"):
+        return yaml.safe_load(data)
+
+
+def dumpYaml(data: Any, **kwargs) -> str:
+    import yaml
+
+    return yaml.safe_dump(data, **kwargs)
+
 
 INCUS_OBJECT_NAME = "[a-zA-Z][a-zA-Z0-9\\-]{0,61}[a-zA-Z0-9]"
 
-REGEX_INCUS_OBJECT_NAME = re.compile(rf"^{INCUS_OBJECT_NAME}$")
-REGEX_IMAGE_NAME = re.compile(
+REGEX_INCUS_OBJECT_NAME = LazyPattern(rf"^{INCUS_OBJECT_NAME}$")
+REGEX_IMAGE_NAME = LazyPattern(
     r"^([a-fA-F0-9]{64}|[a-fA-F0-9]{12}|[a-zA-Z0-9/\-\.]{1,64})$"
 )
-REGEX_DEVICE_NOT_FOUND = re.compile(
+REGEX_FINGERPRINT = LazyPattern(r"^([a-fA-F0-9]{64}|[a-fA-F0-9]{12})$")
+REGEX_IMAGE_INFO_FINGERPRINT = LazyPattern(
+    r"^Fingerprint:\s*(?P<fingerprint>[a-fA-F0-9]{64})\s*$", re.MULTILINE
+)
+REGEX_DEVICE_NOT_FOUND = LazyPattern(
     rf"No (?P<device>{INCUS_OBJECT_NAME}) device could be found"
 )
-REGEX_NETWORK_NOT_FOUND_COPY = re.compile(
+REGEX_NETWORK_NOT_FOUND_COPY = LazyPattern(
     rf'Failed to load network "(?P<network>{INCUS_OBJECT_NAME})" for project "{INCUS_OBJECT_NAME}": Network not found'
 )
-REGEX_EMPTY_BODY = re.compile(
+REGEX_EMPTY_BODY = LazyPattern(
     r'Error:\s*[a-zA-Z]+\s*"[^"]+":\s*http:\s*ContentLength=\d+\s*with\s*Body\s*length\s*\d+'
 )
-REGEX_IS_TRUE = re.compile(r"^(true|yes|1|on)$", re.IGNORECASE)
-REGEX_IS_FALSE = re.compile(r"^(false|no|0|off)$", re.IGNORECASE)
-REGEX_IS_NONE = re.compile(r"^(none|null|undefined)$", re.IGNORECASE)
+REGEX_FRACTION = LazyPattern(r"\.\d+")
+REGEX_IS_TRUE = LazyPattern(r"^(true|yes|1|on)$", re.IGNORECASE)
+REGEX_IS_FALSE = LazyPattern(r"^(false|no|0|off)$", re.IGNORECASE)
+REGEX_IS_NONE = LazyPattern(r"^(none|null|undefined)$", re.IGNORECASE)
 
 
 def isTrue(value: str | int | None) -> re.Match[str] | None:
@@ -54,3 +129,7 @@ def validateObjectFormat(*args) -> None:
     for arg in args:
         if arg and (not isinstance(arg, str) or not REGEX_INCUS_OBJECT_NAME.match(arg)):
             raise InvalidIncusObjectNameFormatException(arg)
+
+
+def splitList(value: str | None) -> list[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
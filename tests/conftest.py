@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import copy
+import json
+import re
+import shlex
+
+import pytest
+import yaml
+
+from pyincus.client import IncusClient, toResult
+from pyincus.models.projects import Project
+from pyincus.models.remotes import Remote
+
+PROFILES = {
+    "default": {
+        "config": {},
+        "devices": {
+            "root": {"type": "disk", "path": "/", "pool": "default"},
+            "eth0": {"type": "nic", "network": "incusbr0", "name": "eth0"},
+        },
+        "description": "",
+    }
+}
+
+
+class FakeIncus:
+    def __init__(self) -> None:
+        self.instances: dict[str, dict] = {}
+        self.profiles = copy.deepcopy(PROFILES)
+        self.pools = {"default": {"name": "default", "driver": "dir", "config": {}}}
+        self.commands: list[list[str]] = []
+
+    def add(self, name: str, **attributes) -> dict:
+        instance = {
+            "name": name,
+            "status": "Running",
+            "type": "container",
+            "description": "",
+            "config": {},
+            "devices": {},
+            "profiles": ["default"],
+            "snapshots": [],
+            **attributes,
+        }
+        self.instances[name] = instance
+        self._expand(instance)
+
+        return instance
+
+    def _expand(self, instance: dict) -> None:
+        config, devices = {}, {}
+        for profile in instance["profiles"]:
+            config.update(self.profiles[profile]["config"])
+            devices.update(copy.deepcopy(self.profiles[profile]["devices"]))
+
+        instance["expanded_config"] = {**config, **instance["config"]}
+        instance["expanded_devices"] = {**devices, **instance["devices"]}
+
+    def run(self, cmd: str, **kwargs) -> dict:
+        words = [w for w in shlex.split(cmd)[1:] if not w.startswith("--project=")]
+        self.commands.append(words)
+
+        try:
+            return toResult(0, self._run(words, kwargs.get("input")), "")
+        except LookupError as error:
+            return toResult(1, "", f"Error: {error.args[0]}")
+
+    def _run(self, words: list[str], input: str | None) -> str:
+        args = [w.split(":", 1)[1] if ":" in w else w for w in words]
+
+        if words[0] == "list":
+            found = [
+                i for n, i in self.instances.items() if re.search(args[2] or "", n)
+            ]
+            if "-fjson" in words:
+                return json.dumps(found)
+            return yaml.safe_dump(found)
+
+        if words[:2] == ["config", "edit"]:
+            instance = self.instances[args[2]]
+            edited = yaml.safe_load(input)
+            for device in edited.get("devices", {}).values():
+                if "type" not in device:
+                    raise LookupError("Missing device type in config")
+            for k in ("config", "devices", "profiles", "description"):
+                instance[k] = edited.get(k) or ([] if k == "profiles" else {})
+            self._expand(instance)
+            return ""
+
+        if words[0] == "query":
+            method, path = words[2], args[3]
+            body = json.loads(words[5]) if "--data" in words else {}
+            if method == "POST" and path.startswith("/1.0/instances?"):
+                if body["name"] in self.instances:
+                    raise LookupError('This "instances" entry already exists')
+                for device in body.get("devices", {}).values():
+                    if "type" not in device:
+                        raise LookupError("Missing device type in config")
+                self.add(
+                    body["name"],
+                    status="Running" if body.get("start") else "Stopped",
+                    config=body.get("config") or {},
+                    devices=body.get("devices") or {},
+                    profiles=body.get("profiles", ["default"]),
+                )
+                return "{}"
+            raise LookupError(f"Unsupported query {method} {path}")
+
+        if words[:2] == ["profile", "list"]:
+            return yaml.safe_dump([{"name": n, **p} for n, p in self.profiles.items()])
+
+        if words[:2] == ["profile", "show"]:
+            if args[2] not in self.profiles:
+                raise LookupError("Profile not found")
+            return yaml.safe_dump({"name": args[2], **self.profiles[args[2]]})
+
+        if words[:2] == ["storage", "show"]:
+            if args[2] not in self.pools:
+                raise LookupError("Storage pool not found")
+            return yaml.safe_dump(self.pools[args[2]])
+
+        if words[:2] == ["snapshot", "create"]:
+            self.instances[args[-2]]["snapshots"].append({"name": args[-1]})
+            return ""
+
+        if words[:2] == ["snapshot", "delete"]:
+            snapshots = self.instances[args[2]]["snapshots"]
+            snapshots.remove({"name": args[3]})
+            return ""
+
+        if words[0] == "copy":
+            source, _, snapshot = args[1].partition("/")
+            template = self.instances[source]
+            if snapshot and {"name": snapshot} not in template["snapshots"]:
+                raise LookupError("Instance snapshot not found")
+            if args[2] in self.instances:
+                raise LookupError('This "instances" entry already exists')
+            self.add(
+                args[2],
+                status="Stopped",
+                config=dict(template["config"]),
+                devices=copy.deepcopy(template["devices"]),
+                profiles=list(template["profiles"]),
+            )
+            return ""
+
+        raise LookupError(f"Unsupported command {' '.join(words)}")
+
+
+@pytest.fixture
+def incus() -> FakeIncus:
+    return FakeIncus()
+
+
+@pytest.fixture
+def client(incus: FakeIncus, tmp_path) -> IncusClient:
+    (tmp_path / "config.yml").write_text(
+        yaml.safe_dump(
+            {
+                "remotes": {
+                    "images": {
+                        "addr": "https://images.linuxcontainers.org",
+                        "protocol": "simplestreams",
+                        "public": True,
+                    }
+                }
+            }
+        )
+    )
+
+    return IncusClient(binaryPath="incus", configDir=str(tmp_path), transport=incus)
+
+
+@pytest.fixture
+def project(client: IncusClient) -> Project:
+    return Project(remote=Remote(name="local", client=client), name="default")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+from pyincus.plan import CREATE, UPDATE, plan
+
+
+def test_update_adds_config_key_and_device(incus, project):
+    incus.add("web")
+
+    changes = plan(
+        project,
+        {
+            "instances": {
+                "web": {
+                    "config": {"limits.cpu": 2},
+                    "devices": {
+                        "data": {"type": "disk", "path": "/srv", "source": "/data"}
+                    },
+                }
+            }
+        },
+    )
+    assert [c.action for c in changes] == [UPDATE]
+
+    changes.apply()
+
+    web = incus.instances["web"]
+    assert web["config"] == {"limits.cpu": "2"}
+    assert web["devices"]["data"] == {
+        "type": "disk",
+        "path": "/srv",
+        "source": "/data",
+    }
+    assert plan(project, {"instances": {"web": {"config": {"limits.cpu": 2}}}}).empty
+
+
+def test_update_completes_profile_device_overrides(incus, project):
+    incus.add("web")
+
+    plan(
+        project, {"instances": {"web": {"devices": {"root": {"size": "20GiB"}}}}}
+    ).apply()
+
+    assert incus.instances["web"]["devices"]["root"] == {
+        "type": "disk",
+        "path": "/",
+        "pool": "default",
+        "size": "20GiB",
+    }
+
+
+def test_create_with_new_device(incus, project):
+    changes = plan(
+        project,
+        {
+            "instances": {
+                "db": {
+                    "image": "images:debian/12",
+                    "config": {"limits.memory": "1GiB"},
+                    "devices": {
+                        "data": {"type": "disk", "path": "/srv", "source": "/data"},
+                        "root": {"size": "20GiB"},
+                    },
+                }
+            }
+        },
+    )
+    assert [c.action for c in changes] == [CREATE]
+
+    changes.apply()
+
+    db = incus.instances["db"]
+    assert db["status"] == "Running"
+    assert db["config"] == {"limits.memory": "1GiB"}
+    assert db["devices"]["data"]["source"] == "/data"
+    assert db["devices"]["root"]["size"] == "20GiB"
+    assert db["devices"]["root"]["type"] == "disk"
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+from pyincus.batch import cloneMany
+from pyincus.client import IncusClient
+from pyincus.models.projects import Project
+from pyincus.models.remotes import Remote
+from pyincus.replay import RecordingTransport, ReplayTransport
+
+
+def test_replay_clone_many(incus, tmp_path):
+    incus.add("tpl")
+    path = str(tmp_path / "clone.jsonl")
+
+    def run(transport) -> list[str]:
+        client = IncusClient(
+            binaryPath="incus", configDir=str(tmp_path), transport=transport
+        )
+        project = Project(remote=Remote(name="local", client=client), name="default")
+        result = cloneMany(project, "tpl", ["c1", "c2", "c3"], maxWorkers=2)
+        assert not result.errors
+
+        return sorted(result.results)
+
+    with RecordingTransport(path, transport=incus) as recording:
+        recorded = run(recording)
+    assert incus.instances["tpl"]["snapshots"] == []
+
+    replay = ReplayTransport(path, latencyScale=0)
+    assert run(replay) == recorded == ["c1", "c2", "c3"]
+    assert replay.misses == []
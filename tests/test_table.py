@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+from pyincus.models.instances import Instance
+
+
+def test_rows_are_full_instances(incus, project):
+    incus.add("web", config={"limits.cpu": "2"}, project="default")
+    incus.add("db", status="Stopped")
+
+    table = Instance.table(project)
+    listed = {i.name: i for i in Instance.list(project)}
+
+    for instance in (table[0], table[1], table.instance("db")):
+        assert instance.attributes == listed[instance.name].attributes
+    assert table.instance("web").config == {"limits.cpu": "2"}
+    assert table.instance("db").attributes["status"] == "Stopped"
+
+
+def test_rows_are_copies(incus, project):
+    incus.add("web", config={"limits.cpu": "2"})
+
+    table = Instance.table(project)
+    table[0].config["limits.cpu"] = "4"
+
+    assert table[0].config == {"limits.cpu": "2"}